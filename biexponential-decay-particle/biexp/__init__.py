@@ -0,0 +1,23 @@
+"""
+biexp, a library for generating and fitting bi-exponential particle decays.
+
+Importing the package only loads numpy. scipy.integrate, iminuit and matplotlib are imported the first
+time a normalisation, minimisation or plot actually needs them.
+
+Modules:
+* pdf           -   MyPDF, the decay time and angle event generator
+* models        -   NLL models of the decay time (part2) and decay time and angle (part3) fits,
+                    unbinned or binned
+* fitter        -   Minuit classes for minimisation and parameter error finding
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+from .pdf import MyPDF, PDFError
+from .models import BinnedNLL, TimeAngleNLL, TimeNLL
+from .fitter import Minuit, TimeMinuit, MinuitError
+
+__all__ = ['MyPDF', 'PDFError', 'BinnedNLL', 'TimeAngleNLL', 'TimeNLL', 'Minuit', 'TimeMinuit', 'MinuitError']
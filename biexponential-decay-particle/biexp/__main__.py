@@ -0,0 +1,540 @@
+"""
+biexp command line, run as `python -m biexp <command>` from the biexponential-decay-particle directory.
+
+Commands:
+* importtime     -   measure the import time of the core fit path against a budget
+* bootstrap      -   bootstrap percentile intervals of the fraction, tau1 and tau2
+* generate       -   generate a reproducible sharded sample in parallel straight to disk
+* plot           -   plot the decay time and angle histograms of a generated sample or a data file
+* serve          -   run the asyncio fit server on a Unix socket or TCP port
+* multistart     -   parallel multi start minimisation with early pruning
+* batchfit       -   vectorized single lifetime fit of many decay time files at once
+* pipeline       -   generate a sample and fit it in one process pair, without intermediate files
+* coarsefit      -   fit a large file on growing random subsamples before the full sample
+* autotune       -   benchmark the NLL evaluation configurations and save the fastest in the machine profile
+* windowscan     -   repeat the fit over a grid of decay time windows of one sorted dataset
+* validate       -   check every accelerated NLL, error finder and sampler against the reference implementations
+* jointfit       -   simultaneous fit of several files sharing tau1 and tau2
+* sweep          -   generate and fit a grid of generator settings and fit variants, reusing cached artifacts
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import argparse
+import os
+import subprocess
+import sys
+import numpy as np
+
+# Modules that must not be loaded by importing the core fit path
+HEAVY_MODULES = ['matplotlib', 'scipy.integrate', 'iminuit']
+
+#=====================================IMPORT TIME BUDGET=====================================
+
+def importTime(budget, repeat):
+    probe = ('import sys, time\n'
+             't0 = time.perf_counter()\n'
+             'import biexp\n'
+             'from biexp import Minuit, TimeAngleNLL, TimeNLL, MyPDF\n'
+             'print(time.perf_counter() - t0)\n'
+             'print(",".join(m for m in {} if m in sys.modules))\n').format(HEAVY_MODULES)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for i in range(repeat):
+        out = subprocess.run([sys.executable, '-c', probe], cwd=root, check=True,
+                             capture_output=True, text=True).stdout.split('\n')
+        times.append(float(out[0]))
+        loaded = out[1]
+    best = min(times)
+    print('Core fit path import time (best of {})  :   {:0.1f} ms (budget {:0.1f} ms)'.format(repeat, best*1e3, budget*1e3))
+    if loaded:
+        print('Heavy modules loaded at import          :   {}'.format(loaded))
+    return best <= budget and not loaded
+
+#=======================================FIT HELPERS==========================================
+
+def loadFit(filename, model, resolution=None):
+    # Time only fits accept one or two column files, time and angle fits need both columns. With a resolution the
+    # events are snapped to it and collapsed into distinct values weighted by their multiplicities (0 only collapses
+    # exact duplicates)
+    from biexp import Minuit, TimeMinuit, TimeAngleNLL, TimeNLL
+    data = np.loadtxt(filename, ndmin=2)
+    if model == 'time':
+        fitter = TimeMinuit.default()
+        if resolution is None:
+            return TimeNLL(data[:, 0]), fitter
+        return TimeNLL.collapse(data[:, 0], resolution[0]), fitter
+    fitter = Minuit.default()
+    if resolution is None:
+        return TimeAngleNLL(data[:, 0], data[:, 1]), fitter
+    return TimeAngleNLL.collapse(data[:, 0], data[:, 1], *resolution), fitter
+
+def eventCount(nll):
+    # A collapsed NLL stands for the sum of the multiplicities of its distinct events
+    return len(nll.t) if nll.weights is None else int(round(np.sum(nll.weights)))
+
+def nominalFit(nll, fitter, x=(0.5, 1.0, 2.0)):
+    m = fitter.minimise(nll, np.array(x))
+    return m, fitter.values(m)
+
+#=========================================BOOTSTRAP==========================================
+
+def bootstrap(args):
+    from biexp.bootstrap import Bootstrap
+    nll, fitter = loadFit(args.filename, args.model, args.resolution)
+    m, x = nominalFit(nll, fitter)
+    boot = Bootstrap(nll, fitter, x, args.nboot, args.seed, args.processes, args.mode)
+    checkpoint = None
+    if args.checkpoint:
+        from biexp.checkpoint import Checkpoint
+        checkpoint = Checkpoint(args.checkpoint, 'bootstrap')
+    boot.run(checkpoint)
+    lo, hi = boot.interval(args.level)
+    errors = boot.errors()
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(eventCount(nll)))
+    if nll.weights is not None:
+        print('Distinct events                              :   {}'.format(len(nll.t)))
+    print('Number of Resamples                          :   {}'.format(args.nboot))
+    print('Throughput                                   :   {0:0.2f} resamples/s'.format(boot.rate))
+    print('-------------------------------------------------------------------------------')
+    for i, name in enumerate(['fraction', 'tau1', 'tau2']):
+        print('{0:<8} {1:0.4f}  MINUIT +- {2:0.4f}  bootstrap +- {3:0.4f}  {4:0.1f}% interval [{5:0.4f}, {6:0.4f}]'.format(
+              name, x[i], m.errors[name], errors[i], 100*args.level, lo[i], hi[i]))
+    print('-------------------------------------------------------------------------------')
+    return True
+
+#=========================================GENERATE===========================================
+
+def generate(args):
+    from biexp.generate import generate
+    manifest = generate(args.outdir, args.nevents, args.shards, args.seed, args.tau1, args.tau2, args.fraction,
+                        chunk=args.chunk, bins=args.bins, processes=args.processes)
+    busy = sum(entry['seconds'] for entry in manifest['segments'])
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(manifest['nevents']))
+    print('Shards / processes                           :   {} / {}'.format(manifest['shards'], manifest['processes']))
+    print('Wall time                                    :   {0:0.2f} s'.format(manifest['seconds']))
+    print('Events per second (total)                    :   {0:0.0f}'.format(manifest['nevents'] / manifest['seconds']))
+    print('Events per second per core                   :   {0:0.0f}'.format(manifest['nevents'] / busy if busy else 0))
+    print('-------------------------------------------------------------------------------')
+    return True
+
+#===========================================PLOT=============================================
+
+def plot(args):
+    from biexp.generate import readHistogram
+    from biexp.histogram import DecayHistogram, plotHistogram
+    if os.path.isdir(args.source):
+        hist = readHistogram(args.source)
+    else:
+        data = np.loadtxt(args.source, ndmin=2)
+        hist = DecayHistogram(args.bins, args.bins)
+        hist.fill(data[:, 0], data[:, 1] if data.shape[1] > 1 else np.zeros(len(data)))
+    plotHistogram(hist, args.output)
+    return True
+
+#==========================================SERVE=============================================
+
+def serve(args):
+    from biexp.server import FitServer
+    server = FitServer(args.workers, args.cache)
+    if args.unix:
+        server.serveUnix(args.unix)
+    else:
+        server.serveTCP(args.host, args.port)
+    return True
+
+#========================================MULTISTART==========================================
+
+def multistart(args):
+    from biexp.multistart import MultiStart
+    nll, fitter = loadFit(args.filename, args.model, args.resolution)
+    search = MultiStart(nll, fitter, args.starts, args.sampler, args.margin, seed=args.seed, processes=args.processes)
+    best = search.run()
+    status = [result['status'] for result in search.results]
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(eventCount(nll)))
+    if nll.weights is not None:
+        print('Distinct events                              :   {}'.format(len(nll.t)))
+    print('Starts converged / pruned / stopped          :   {} / {} / {}'.format(
+          status.count('converged'), status.count('pruned'), status.count('stopped')))
+    print('Wall time                                    :   {0:0.2f} s'.format(search.elapsed))
+    print('Best Estimated Fraction, Tau 1, Tau 2        :   {0:0.4f}, {1:0.4f}, {2:0.4f}'.format(*best['x']))
+    print('Minimum NLL                                  :   {0:0.4f}'.format(best['fval']))
+    print('--------------------------------DISTINCT MINIMA--------------------------------')
+    for minimum in search.minima:
+        print('NLL {0:0.4f} (+{1:0.4f})  x = [{2:0.4f}, {3:0.4f}, {4:0.4f}]  found by {5} starts'.format(
+              minimum['fval'], minimum['fval'] - best['fval'], *minimum['x'], minimum['count']))
+    print('-------------------------------------------------------------------------------')
+    return True
+
+#=========================================BATCH FIT===========================================
+
+def batchfit(args):
+    from biexp.batch import packDatasets, BatchLifetimeFit
+    datasets = [np.loadtxt(filename, ndmin=2)[:, 0] for filename in args.filenames]
+    lo, hi = args.window if args.window else (0.0, np.inf)
+    fit = BatchLifetimeFit(*packDatasets(datasets), t_lolim=lo, t_hilim=hi)
+    tau, errors, nll = fit.fit()
+    print('===============================================================================')
+    for filename, n, tau_i, error_i, ok in zip(args.filenames, fit.nevents, tau, errors, fit.converged):
+        print('{0:<40} {1:>8d} events   Tau = {2:0.4f} +- {3:0.4f}{4}'.format(
+              filename, int(n), tau_i, error_i, '' if ok else '   (not converged)'))
+    print('-------------------------------------------------------------------------------')
+    print('Fits per second                              :   {0:0.0f}'.format(fit.rate))
+    print('-------------------------------------------------------------------------------')
+    return bool(fit.converged.all())
+
+#=========================================PIPELINE===========================================
+
+def pipeline(args):
+    from biexp import Minuit
+    from biexp.pipeline import Pipeline
+    run = Pipeline(args.nevents, args.tau1, args.tau2, args.fraction, args.seed, args.batch, args.queue,
+                   args.output, args.binned, args.bins, warm=args.warm)
+    fitter = Minuit.default()
+    m = run.run(fitter)
+    timings = run.timings
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(args.nevents))
+    print('Fit                                          :   {}'.format('binned' if args.binned else 'unbinned'))
+    print('Generate / warm up fits / final fit          :   {0:0.2f} s / {1:0.2f} s / {2:0.2f} s'.format(
+          timings['generate'], timings['warm'], timings['fit']))
+    print('Wall time                                    :   {0:0.2f} s'.format(timings['total']))
+    print('Estimated Fraction, Tau 1, Tau 2             :   {0:0.4f}, {1:0.4f}, {2:0.4f}'.format(*fitter.values(m)))
+    print('Errors                                       :   {0:0.4f}, {1:0.4f}, {2:0.4f}'.format(*fitter.errors(m)))
+    print('-------------------------------------------------------------------------------')
+    return m.fmin.is_valid
+
+#========================================COARSE FIT==========================================
+
+def coarsefit(args):
+    from biexp.subsample import CoarseToFine
+    nll, fitter = loadFit(args.filename, args.model)
+    search = CoarseToFine(fitter, args.schedule, args.precision, args.min_events, args.seed)
+    m = search.fit(nll, np.array([0.5, 1.0, 2.0]))
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(len(nll.t)))
+    for stage in search.stages:
+        print('{0:>10d} events  {1:>5d} NLL calls  {2:8.2f} s   x = [{3:0.4f}, {4:0.4f}, {5:0.4f}]'.format(
+              stage['nevents'], stage['calls'], stage['seconds'], *stage['x']))
+    print('Event evaluations spent on subsamples        :   {0:0.1f}%'.format(100*search.cost()))
+    print('Wall time                                    :   {0:0.2f} s'.format(sum(stage['seconds'] for stage in search.stages)))
+    print('-------------------------------------------------------------------------------')
+    ok = m.fmin.is_valid
+    if args.compare:
+        # Reference: the minimiseLoop fit of part2.py and part3.py over every event, ended like the fits of the server
+        # as a zero threshold never ends a fit with the fraction on its bound
+        from biexp.server import MAX_LOOPS, THRESHOLD
+        reference = type(fitter).default(THRESHOLD)
+        full = reference.minimiseLoop(nll, np.array([0.5, 1.0, 2.0]), *((0.0,) if args.model == 'time' else ()),
+                                      max_loops=MAX_LOOPS)
+        for name in ['fraction', 'tau1', 'tau2']:
+            pull = (m.values[name] - full.values[name]) / full.errors[name] if full.errors[name] > 0 else 0.0
+            print('{0:<8} coarse {1:0.4f} +- {2:0.4f}   full {3:0.4f} +- {4:0.4f}   difference {5:+0.4f} sigma'.format(
+                  name, m.values[name], m.errors[name], full.values[name], full.errors[name], pull))
+            ok = ok and abs(pull) <= args.tolerance
+        print('-------------------------------------------------------------------------------')
+    return ok
+
+#=========================================AUTOTUNE===========================================
+
+def autotune(args):
+    from biexp.tuning import autotune, candidates, profilePath
+    configs = candidates(args.max_threads, args.float32)
+    entry = autotune(args.nevents, args.repeat, args.tolerance, configs=configs, save=not args.dry_run)
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(args.nevents))
+    for result in sorted(entry['results'], key=lambda result: result['seconds']):
+        config = result['config']
+        fit = 'fit {0:0.3f} sigma, errors {1:0.1%}'.format(result['parameter'], result['error']) \
+              if result['parameter'] is not None else ''
+        status = {True: '', False: '   (rejected)', None: '   (not fit checked)'}[result['accepted']]
+        print('{0:<6} chunk {1:>7} threads {2:>3} {3:<8} {4:9.3f} ms   NLL deviation {5:0.1e}   {6}{7}'.format(
+              config['backend'], str(config['chunk']), config['threads'], config['dtype'], result['seconds']*1e3,
+              result['deviation'], fit, status))
+    print('-------------------------------------------------------------------------------')
+    print('Fastest configuration                        :   {}'.format(entry['config']))
+    if entry['baseline']:
+        print('Speed up over the default                    :   {0:0.1f}x'.format(entry['baseline'] / entry['seconds']))
+    if not args.dry_run:
+        print('Saved to                                     :   {}'.format(profilePath()))
+    print('-------------------------------------------------------------------------------')
+    return True
+
+#========================================WINDOW SCAN=========================================
+
+def windowscan(args):
+    import time
+    from biexp import Minuit, TimeMinuit
+    from biexp.windows import SortedEvents
+    data = np.loadtxt(args.filename, ndmin=2)
+    start = time.perf_counter()
+    if args.model == 'time':
+        events, fitter = SortedEvents(data[:, 0]), TimeMinuit.default()
+    else:
+        events, fitter = SortedEvents(data[:, 0], data[:, 1]), Minuit.default()
+    setup = time.perf_counter() - start
+    results = events.scan(fitter, [(lo, hi) for lo in args.lo for hi in args.hi])
+    print('===============================================================================')
+    print('Number of Particle Decay Event               :   {}'.format(len(events.t)))
+    print(' t_lo   t_hi   events   fraction          tau1              tau2')
+    for result in results:
+        print('{0:5.2f}  {1:5.2f}  {2:7d}   {3:0.4f} +- {6:0.4f}  {4:0.4f} +- {7:0.4f}  {5:0.4f} +- {8:0.4f}{9}'.format(
+              *result['window'], result['nevents'], *result['values'], *result['errors'],
+              '' if result['valid'] else '   (invalid)'))
+    print('-------------------------------------------------------------------------------')
+    print('Sorting                                      :   {0:0.3f} s'.format(setup))
+    print('Mean fit time per window                     :   {0:0.3f} s'.format(np.mean([r['seconds'] for r in results])))
+    print('-------------------------------------------------------------------------------')
+    return all(result['valid'] for result in results)
+
+#=========================================VALIDATE===========================================
+
+def validate(args):
+    from biexp import Minuit, TimeMinuit
+    from biexp.validation import Validation
+    harness = Validation(error_events=args.error_events, candidates=args.candidates)
+    fitters = (TimeMinuit.default(), Minuit.default())
+    ok = harness.run(fitters, args.data_dir, args.sizes, args.seed)
+    print('===============================================================================')
+    print('{0:<7} {1:<28} {2:<10} {3:<22} {4:>11} {5:>11} {6:>9} {7:>9} {8:>7}'.format(
+          'check', 'sample', 'candidate', 'quantity', 'reference', 'candidate', 'diff', 'tol', 'speedup'))
+    for r in harness.results:
+        speedup = '' if r['speedup'] is None else '{0:0.1f}x'.format(r['speedup'])
+        print('{0:<7} {1:<28} {2:<10} {3:<22} {4:>11.5g} {5:>11.5g} {6:>9.2g} {7:>9.2g} {8:>7}{9}'.format(
+              r['check'], r['sample'], r['candidate'], r['quantity'], r['reference'], r['value'], r['difference'],
+              r['tolerance'], speedup, '' if r['passed'] else '   FAILED'))
+    print('-------------------------------------------------------------------------------')
+    print('Checks passed                                :   {} / {}'.format(
+          sum(r['passed'] for r in harness.results), len(harness.results)))
+    print('-------------------------------------------------------------------------------')
+    return ok
+
+#=========================================JOINT FIT==========================================
+
+def jointfit(args):
+    from biexp.joint import JointNLL, JointMinuit
+    terms = []
+    for i, source in enumerate(args.datasets):
+        # Every dataset is MODEL:FILE, time only datasets are fitted at the fixed decay angle of part2.py
+        model, filename = source.split(':', 1) if ':' in source else ('angle', source)
+        nll = loadFit(filename, model)[0]
+        terms.append(('{}{}'.format(model, i), nll, (0.0,) if model == 'time' else ()))
+    private = () if args.shared_fraction else ('fraction',)
+    with JointNLL(terms, private, args.workers, args.mode) as joint:
+        fitter = JointMinuit.default(joint.parameters)
+        m = fitter.minimise(joint, joint.start())
+    print('===============================================================================')
+    for (name, nll, fixed), source in zip(terms, args.datasets):
+        print('{0:<10} {1:<40} {2:>8d} events'.format(name, source, len(nll.t)))
+    print('-------------------------------------------------------------------------------')
+    for name, p in joint.parameters:
+        print('{0:<20} {1:0.4f} +- {2:0.4f}'.format(name, m.values[name], m.errors[name]))
+    print('Minimum NLL                                  :   {0:0.4f}'.format(m.fval))
+    print('-------------------------------------------------------------------------------')
+    return m.fmin.is_valid
+
+#===========================================SWEEP============================================
+
+def sweep(args):
+    from biexp.sweep import Sweep, grid
+    generators = grid(nevents=args.nevents, lifetime1=args.tau1, lifetime2=args.tau2, fraction=args.fraction,
+                      seed=args.seed)
+    variants = [dict(model=model, binned=fit == 'binned', bins=args.bins, errors=args.errors)
+                for model in args.models for fit in args.fits if not (fit == 'binned' and model == 'time')]
+    study = Sweep(args.cache, args.processes).add(generators, variants)
+    ok = study.run()
+    print('===============================================================================')
+    print('  events   tau1   tau2  frac  seed  model  fit         fraction  tau1      tau2      NLL')
+    for row in study.results():
+        g, v, fit = row['generator'], row['variant'], row['fit']
+        label = '{0:8d}  {1:5.2f}  {2:5.2f}  {3:4.2f}  {4:4d}  {5:<5}  {6:<10}'.format(
+                g['nevents'], g['lifetime1'], g['lifetime2'], g['fraction'], g['seed'], v['model'],
+                'binned' if v['binned'] else 'unbinned')
+        if fit is None:
+            print('{}  {}'.format(label, row['failed']))
+            continue
+        print('{0}  {1:0.4f}    {2:0.4f}    {3:0.4f}    {4:0.2f}{5}'.format(
+              label, *fit['values'], fit['fval'], '' if fit['valid'] else '   (invalid)'))
+        if row['error'] is not None:
+            print('{0:<52}+- {1}'.format('', '    '.join('{0:0.4f}'.format(error) if error is not None else '  --  '
+                                                             for error in row['error']['errors'])))
+    print('-------------------------------------------------------------------------------')
+    print('Nodes run / reused from the cache / failed   :   {} / {} / {}'.format(
+          len(study.computed), len(study.reused), len(study.failed)))
+    print('-------------------------------------------------------------------------------')
+    return ok
+
+#===========================================MAIN=============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='biexp')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('importtime', help='measure the import time of the core fit path')
+    p.add_argument('--budget', type=float, default=0.25, help='import time budget in seconds')
+    p.add_argument('--repeat', type=int, default=5)
+
+    p = commands.add_parser('bootstrap', help='bootstrap percentile intervals of the fit parameters')
+    p.add_argument('filename')
+    p.add_argument('--model', choices=['time', 'angle'], default='angle')
+    p.add_argument('-B', '--nboot', type=int, default=200)
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--processes', type=int, default=None)
+    p.add_argument('--mode', choices=['weights', 'index'], default='weights')
+    p.add_argument('--level', type=float, default=0.6827)
+    p.add_argument('--checkpoint', default=None, help='checkpoint file to resume an interrupted run from')
+    p.add_argument('--resolution', type=float, nargs='+', default=None, metavar='RES',
+                   help='snap t (and theta) to these resolutions and fit the distinct events weighted by their '
+                        'multiplicities, 0 only collapses exact duplicates')
+
+    p = commands.add_parser('generate', help='generate a reproducible sharded sample straight to disk')
+    p.add_argument('outdir')
+    p.add_argument('-n', '--nevents', type=int, required=True)
+    p.add_argument('--shards', type=int, default=os.cpu_count())
+    p.add_argument('--seed', type=int, required=True)
+    p.add_argument('--tau1', type=float, default=1.0)
+    p.add_argument('--tau2', type=float, default=2.0)
+    p.add_argument('--fraction', type=float, default=1.0)
+    p.add_argument('--chunk', type=int, default=1000000, help='events histogrammed per batch, in whole blocks of 65536 '
+                        '(the sample does not depend on it)')
+    p.add_argument('--bins', type=int, default=100, help='histogram bins in decay time and angle')
+    p.add_argument('--processes', type=int, default=None)
+
+    p = commands.add_parser('plot', help='plot the histograms of a generated sample directory or a data file')
+    p.add_argument('source')
+    p.add_argument('-o', '--output', default=None, help='render headlessly to this image file')
+    p.add_argument('--bins', type=int, default=100)
+
+    p = commands.add_parser('serve', help='run the fit server')
+    p.add_argument('--unix', default=None, help='Unix socket path (default: TCP)')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--cache', type=int, default=8, help='datasets cached per worker')
+
+    p = commands.add_parser('multistart', help='parallel multi start minimisation')
+    p.add_argument('filename')
+    p.add_argument('--model', choices=['time', 'angle'], default='angle')
+    p.add_argument('-K', '--starts', type=int, default=16)
+    p.add_argument('--sampler', choices=['lhs', 'sobol'], default='lhs')
+    p.add_argument('--margin', type=float, default=10.0, help='NLL margin behind the best start before pruning')
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--processes', type=int, default=None)
+    p.add_argument('--resolution', type=float, nargs='+', default=None, metavar='RES',
+                   help='snap t (and theta) to these resolutions and fit the distinct events weighted by their '
+                        'multiplicities, 0 only collapses exact duplicates')
+
+    p = commands.add_parser('batchfit', help='vectorized single lifetime fit of many files')
+    p.add_argument('filenames', nargs='+')
+    p.add_argument('--window', type=float, nargs=2, default=None, metavar=('T_LO', 'T_HI'),
+                   help='fit the events inside this decay time window, with the PDF normalised over it '
+                        '(default: 0 to infinity, as nll_minim.py)')
+
+    p = commands.add_parser('pipeline', help='generate a sample and fit it without intermediate files')
+    p.add_argument('-n', '--nevents', type=int, required=True)
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--tau1', type=float, default=1.0)
+    p.add_argument('--tau2', type=float, default=2.0)
+    p.add_argument('--fraction', type=float, default=1.0)
+    p.add_argument('--batch', type=int, default=100000, help='events generated per batch')
+    p.add_argument('--queue', type=int, default=8, help='maximum number of batches waiting to be fitted')
+    p.add_argument('-o', '--output', default=None, help='also write the events to this .npy file')
+    p.add_argument('--binned', action='store_true', help='fit the decay time and angle histogram instead')
+    p.add_argument('--bins', type=int, default=100)
+    p.add_argument('--warm', action=argparse.BooleanOptionalAction, default=None,
+                   help='warm up fits on the partial sample while generating (default: only with more than one core)')
+
+    p = commands.add_parser('coarsefit', help='fit on growing random subsamples, then the full sample')
+    p.add_argument('filename')
+    p.add_argument('--model', choices=['time', 'angle'], default='angle')
+    p.add_argument('--schedule', type=float, nargs='+', default=[0.01, 0.1], help='subsample fractions before the full fit')
+    p.add_argument('--precision', type=float, default=0.5,
+                   help='stage stopping distance, in statistical distances to the full sample minimum')
+    p.add_argument('--min-events', type=int, default=1000, help='skip smaller subsamples')
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--compare', action='store_true', help='also run the full minimiseLoop fit and compare')
+    p.add_argument('--tolerance', type=float, default=0.1, help='largest accepted difference in standard deviations')
+
+    p = commands.add_parser('autotune', help='benchmark the NLL evaluation configurations of this machine')
+    p.add_argument('-n', '--nevents', type=int, required=True, help='size of the synthetic dataset, as the target files')
+    p.add_argument('--repeat', type=int, default=5)
+    p.add_argument('--tolerance', type=float, default=0.01, help='largest accepted NLL deviation from the default')
+    p.add_argument('--max-threads', type=int, default=None)
+    p.add_argument('--float32', action='store_true',
+                   help='also benchmark float32 events, accepted only if the fit check passes')
+    p.add_argument('--dry-run', action='store_true', help='do not save the profile')
+
+    p = commands.add_parser('windowscan', help='fit every decay time window of a grid of t_lo and t_hi values')
+    p.add_argument('filename')
+    p.add_argument('--model', choices=['time', 'angle'], default='angle')
+    p.add_argument('--lo', type=float, nargs='+', default=[0.0], help='lower edges of the windows')
+    p.add_argument('--hi', type=float, nargs='+', default=[10.0], help='upper edges of the windows')
+
+    p = commands.add_parser('validate', help='check the accelerated fit paths against the reference implementations')
+    p.add_argument('--data-dir', default=None, help='directory of the bundled data files (default: the repository root)')
+    p.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000], help='synthetic sample sizes')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--error-events', type=int, default=2000, help='largest sample the proper error finder runs on')
+    p.add_argument('--candidates', nargs='+', choices=['grid', 'fused', 'fused32', 'profile'],
+                   default=['grid', 'fused', 'profile'], help='NLL evaluation configurations to check')
+
+    p = commands.add_parser('jointfit', help='simultaneous fit of several datasets sharing tau1 and tau2')
+    p.add_argument('datasets', nargs='+', metavar='MODEL:FILE', help='time:FILE or angle:FILE (default angle)')
+    p.add_argument('--shared-fraction', action='store_true', help='share the fraction too instead of one per dataset')
+    p.add_argument('--mode', choices=['thread', 'process', 'serial'], default='thread')
+    p.add_argument('--workers', type=int, default=None)
+
+    p = commands.add_parser('sweep', help='generate and fit a grid of generator settings and fit variants')
+    p.add_argument('--cache', default='sweep-cache', help='artifact cache directory, reused by later runs')
+    p.add_argument('--nevents', type=int, nargs='+', default=[10000])
+    p.add_argument('--tau1', type=float, nargs='+', default=[1.0])
+    p.add_argument('--tau2', type=float, nargs='+', default=[2.0])
+    p.add_argument('--fraction', type=float, nargs='+', default=[0.0, 0.5, 1.0])
+    p.add_argument('--seed', type=int, nargs='+', default=[0], help='one sample per seed and generator setting')
+    p.add_argument('--models', nargs='+', choices=['time', 'angle'], default=['time', 'angle'])
+    p.add_argument('--fits', nargs='+', choices=['unbinned', 'binned'], default=['unbinned'],
+                   help='binned fits use the decay angle, so they only run with the angle model')
+    p.add_argument('--bins', type=int, default=100)
+    p.add_argument('--errors', action='store_true', help='also run the proper error finder on every fit')
+    p.add_argument('--processes', type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == 'importtime':
+        ok = importTime(args.budget, args.repeat)
+    elif args.command == 'bootstrap':
+        ok = bootstrap(args)
+    elif args.command == 'generate':
+        ok = generate(args)
+    elif args.command == 'plot':
+        ok = plot(args)
+    elif args.command == 'serve':
+        ok = serve(args)
+    elif args.command == 'multistart':
+        ok = multistart(args)
+    elif args.command == 'batchfit':
+        ok = batchfit(args)
+    elif args.command == 'pipeline':
+        ok = pipeline(args)
+    elif args.command == 'coarsefit':
+        ok = coarsefit(args)
+    elif args.command == 'autotune':
+        ok = autotune(args)
+    elif args.command == 'windowscan':
+        ok = windowscan(args)
+    elif args.command == 'validate':
+        ok = validate(args)
+    elif args.command == 'jointfit':
+        ok = jointfit(args)
+    elif args.command == 'sweep':
+        ok = sweep(args)
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Bootstrap, a class for estimating the parameter errors of the bi-exponential decay fits by refitting resampled datasets.
+
+Each resample draws N event indices with replacement. With mode 'weights' the indices are turned into multinomial
+multiplicities and the NLL is evaluated as a weighted sum over the original events, so no resampled dataset is
+copied. Mode 'index' materialises the resampled events instead, for models without weights support. An NLL over
+the distinct events of a collapsed dataset draws the events it stands for, as multinomial multiplicities of its
+distinct events, in both modes.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import copy
+import multiprocessing
+import os
+import time
+import numpy as np
+from . import worker
+
+class BootstrapError(Exception):
+    """ An exception class for Bootstrap """
+    pass
+
+def _resample(nll, seed, mode):
+    rng = np.random.default_rng(seed)
+    n = len(nll.t)
+    weights = getattr(nll, 'weights', None)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        total = int(round(weights.sum()))
+        return nll.weighted(rng.multinomial(total, weights / weights.sum()).astype(float))
+    index = rng.integers(0, n, n)
+    if mode == 'weights':
+        return nll.weighted(np.bincount(index, minlength=n).astype(float))
+    sample = copy.copy(nll)
+    sample.t, sample.theta = nll.t[index], nll.theta[index]
+    return sample
+
+def _refit(seed):
+    state = worker.state
+    sample = _resample(state['nll'], seed, state['mode'])
+    m = state['fitter'].minimise(sample, np.array(state['x']))
+    return state['fitter'].values(m)
+
+
+class Bootstrap(object):
+    """
+    Class for bootstrap error estimation of the fraction, tau1 and tau2.
+
+    Properties:
+    nll(TimeAngleNLL)            -   NLL bound to the nominal dataset
+    fitter(Minuit)               -   minimiser used for the nominal fit and every refit
+    x(array)                     -   nominal minimum, the warm start of every refit
+    nboot(int)                   -   number of resamples, B
+    seed(int)                    -   seed of the SeedSequence the resample streams are spawned from
+    processes(int)               -   number of worker processes (None for all cores, 1 to run in process)
+    mode(str)                    -   'weights' or 'index' resampling
+    params(array)                -   (B, 3) refitted fraction, tau1 and tau2
+    rate(float)                  -   throughput of the last run in resamples per second
+
+    Methods:
+    * run                        -   refit the B resamples, resuming the completed ones from an optional Checkpoint
+    * interval                   -   percentile interval of every parameter
+    * errors                     -   standard deviation of every parameter over the resamples
+    """
+
+    def __init__(self, nll, fitter, x, nboot, seed=None, processes=None, mode='weights'):
+        if mode not in ('weights', 'index'):
+            raise BootstrapError('Invalid resampling mode!')
+        if mode == 'weights' and not hasattr(nll, 'weighted'):
+            raise BootstrapError('The NLL does not support weights, use mode index')
+        self.nll = nll
+        self.fitter = fitter
+        self.x = np.array(x, dtype=float)
+        self.nboot = nboot
+        self.seed = seed
+        self.processes = processes
+        self.mode = mode
+        self.params = None
+        self.rate = None
+
+    def run(self, checkpoint=None):
+        sequence = np.random.SeedSequence(self.seed)
+        params = []
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None:
+            # The entropy identifies the resample streams, even when no seed was given
+            sequence = np.random.SeedSequence(state['entropy'])
+            params = list(state['params'])
+        seeds = sequence.spawn(self.nboot)[len(params):]
+        start = time.perf_counter()
+        state = dict(nll=self.nll, fitter=self.fitter, x=self.x, mode=self.mode)
+        if self.processes == 1:
+            worker.initWorker(state)
+            results = map(_refit, seeds)
+            pool = None
+        else:
+            processes = self.processes or os.cpu_count()
+            chunksize = max(1, len(seeds) // (4 * processes))
+            pool = multiprocessing.Pool(processes, worker.initWorker, (state,))
+            results = pool.imap(_refit, seeds, chunksize)
+        try:
+            for result in results:
+                params.append(result)
+                if checkpoint is not None:
+                    checkpoint.save(dict(entropy=sequence.entropy, params=params))
+        finally:
+            if pool is not None:
+                pool.terminate()
+        if checkpoint is not None:
+            # Every resample is kept, so a resumed run of a completed bootstrap refits nothing
+            checkpoint.save(dict(entropy=sequence.entropy, params=params), force=True)
+        self.rate = len(seeds) / (time.perf_counter() - start)
+        self.params = np.array(params)
+        return self.params
+
+    def interval(self, level=0.6827):
+        if self.params is None:
+            raise BootstrapError('Bootstrap has not been run')
+        lo, hi = np.percentile(self.params, [50*(1-level), 50*(1+level)], axis=0)
+        return lo, hi
+
+    def errors(self):
+        if self.params is None:
+            raise BootstrapError('Bootstrap has not been run')
+        return np.std(self.params, axis=0, ddof=1)
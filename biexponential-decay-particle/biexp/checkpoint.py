@@ -0,0 +1,97 @@
+"""
+Checkpoint, a class for periodically saving the state of long running fits, scans, error searches and toy studies,
+so a pre-empted job resumes from its last checkpoint instead of starting again.
+
+A checkpoint is a small pickle of plain values and arrays (current parameters, step sizes, completed scan points,
+random stream state). It is written to a temporary file and renamed over the previous one, so a checkpoint on disk is
+always complete, and it is only rewritten once every interval seconds unless forced. When the job completes the
+checkpoint keeps its result, which a resumed job returns without running again.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import os
+import pickle
+import time
+import numpy as np
+
+class CheckpointError(Exception):
+    """ An exception class for Checkpoint """
+    pass
+
+
+class Checkpoint(object):
+    """
+    Class for an atomic, rate limited checkpoint file.
+
+    Properties:
+    filename(str)          -   checkpoint file
+    interval(float)        -   minimum number of seconds between two writes
+    kind(str)              -   kind of job the checkpoint belongs to, a checkpoint of another kind is never resumed
+
+    Methods:
+    * load                 -   return the saved state, or None when there is nothing to resume
+    * save                 -   save the state if the interval has elapsed (or when forced)
+    * finish               -   save the result of the completed job as a done state
+    * clear                -   remove the checkpoint, so the job starts again
+    """
+
+    def __init__(self, filename, kind, interval=5.0):
+        self.filename = filename
+        self.kind = kind
+        self.interval = interval
+        self.last = time.monotonic()
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return None
+        with open(self.filename, 'rb') as f:
+            kind, state = pickle.load(f)
+        if kind != self.kind:
+            raise CheckpointError('{} is a {} checkpoint, not {}'.format(self.filename, kind, self.kind))
+        return state
+
+    def save(self, state, force=False):
+        now = time.monotonic()
+        if not force and now - self.last < self.interval:
+            return False
+        tmp = self.filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump((self.kind, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+        self.last = now
+        return True
+
+    def finish(self, result, **state):
+        self.save(dict(state, done=True, result=result), force=True)
+
+    def clear(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+#========================================RESUMABLE SCAN======================================
+
+def scan(f, points, checkpoint=None):
+    """ Evaluate f(*point) at every point, resuming the completed points from the checkpoint """
+    values = []
+    if checkpoint is not None:
+        state = checkpoint.load()
+        if state is not None:
+            if len(state['points']) != len(points) or not np.array_equal(state['points'], points):
+                raise CheckpointError('The checkpoint belongs to a different scan')
+            if state.get('done'):
+                return list(state['result'])
+            values = list(state['values'])
+    for point in points[len(values):]:
+        values.append(f(*point))
+        if checkpoint is not None:
+            checkpoint.save(dict(points=np.asarray(points), values=values))
+    if checkpoint is not None:
+        checkpoint.finish(values, points=np.asarray(points))
+    return values
@@ -0,0 +1,140 @@
+"""
+ComponentModel, a class describing the decay PDF as a mixture of vectorized shape components in decay time and angle.
+
+One ComponentModel drives both the event generation (MyPDF) and the NLL fits (models). Each component shape is a
+vectorized function shape(t, theta, tau) of the decay time, the decay angle and its own lifetime. The components are
+normalised over the decay window with a Gauss-Legendre grid, which is computed once per window and reused for every
+parameter value.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import functools
+import numpy as np
+
+class ComponentError(Exception):
+    """ An exception class for ComponentModel """
+    pass
+
+#=====================================COMPONENT SHAPES=======================================
+
+# Shapes are module level functions rather than lambdas so the models can be pickled to worker processes
+def cosShape(t, theta, tau):
+    return (1+np.cos(theta)**2)*np.exp(-t/tau)
+
+def sinShape(t, theta, tau):
+    return (3*np.sin(theta)**2)*np.exp(-t/tau)
+
+#====================================QUADRATURE GRID=========================================
+
+@functools.lru_cache(maxsize=32)
+def gaussLegendre(t_lolim, t_hilim, theta_lolim, theta_hilim, t_order, theta_order):
+    """ Return the flattened nodes (t, theta) and weights of the Gauss-Legendre product grid of a decay window """
+    x_t, w_t = np.polynomial.legendre.leggauss(t_order)
+    x_theta, w_theta = np.polynomial.legendre.leggauss(theta_order)
+    t = 0.5*(t_hilim - t_lolim)*(x_t + 1) + t_lolim
+    theta = 0.5*(theta_hilim - theta_lolim)*(x_theta + 1) + theta_lolim
+    w = np.outer(0.5*(t_hilim - t_lolim)*w_t, 0.5*(theta_hilim - theta_lolim)*w_theta)
+    t, theta = np.meshgrid(t, theta, indexing='ij')
+    nodes = (t.ravel(), theta.ravel(), w.ravel())
+    # The grid is shared by every model with the same window, so protect it from in place changes
+    for arr in nodes:
+        arr.flags.writeable = False
+    return nodes
+
+
+class ComponentModel(object):
+    """
+    Class for a mixture of decay shape components normalised over the decay window.
+
+    Properties:
+    shapes(list)                 -   component shapes, vectorized functions shape(t, theta, tau)
+    acceptance(function)         -   optional vectorized acceptance(t, theta) multiplying every component
+    t_lolimit, t_hilimit         -   interval of the decay time
+    theta_lolimit, theta_hilimit -   interval of the decay angle
+    t_order, theta_order         -   number of Gauss-Legendre nodes in decay time and angle
+
+    Methods:
+    * window                     -   return a copy of the model over a new decay time window
+    * grid                       -   return the cached quadrature nodes and weights of the decay window
+    * shape                      -   evaluate one component (times the acceptance)
+    * normalise                  -   integrate every component over the decay window
+    * parameters                 -   names of the K-1 free fractions and K lifetimes, the NLL parameters in call order
+    * split                      -   split the parameters into the free fraction(s) and the lifetimes
+    * fractions                  -   expand the K-1 free fractions into all K component fractions
+    * pdf                        -   evaluate the normalised total PDF
+    * maxVal                     -   maximum of the normalised total PDF over the decay window
+    """
+
+    def __init__(self, shapes=(cosShape, sinShape), t_lolim=0.0, t_hilim=10.0, theta_lolim=0.0, theta_hilim=2*np.pi,
+                 acceptance=None, t_order=64, theta_order=32):
+        if len(shapes) < 1:
+            raise ComponentError('A model needs at least one component')
+        self.shapes = list(shapes)
+        self.acceptance = acceptance
+        self.t_lolimit = float(t_lolim)
+        self.t_hilimit = float(t_hilim)
+        self.theta_lolimit = float(theta_lolim)
+        self.theta_hilimit = float(theta_hilim)
+        self.t_order = t_order
+        self.theta_order = theta_order
+
+    def window(self, t_lolim, t_hilim):
+        return ComponentModel(self.shapes, t_lolim, t_hilim, self.theta_lolimit, self.theta_hilimit,
+                              self.acceptance, self.t_order, self.theta_order)
+
+    def grid(self):
+        return gaussLegendre(self.t_lolimit, self.t_hilimit, self.theta_lolimit, self.theta_hilimit,
+                             self.t_order, self.theta_order)
+
+    def shape(self, i, t, theta, tau):
+        value = self.shapes[i](t, theta, tau)
+        if self.acceptance is not None:
+            value = value * self.acceptance(t, theta)
+        return value
+
+    def normalise(self, taus):
+        t, theta, w = self.grid()
+        return np.array([np.dot(w, self.shape(i, t, theta, tau)) for i, tau in enumerate(taus)])
+
+    def parameters(self):
+        # fraction, tau1 and tau2 for the default two components, fraction1 ... fraction<K-1> otherwise
+        nshapes = len(self.shapes)
+        if nshapes == 2:
+            fractions = ['fraction']
+        else:
+            fractions = ['fraction{}'.format(i + 1) for i in range(nshapes - 1)]
+        return fractions + ['tau{}'.format(i + 1) for i in range(nshapes)]
+
+    def split(self, params):
+        if len(params) != 2*len(self.shapes) - 1:
+            raise ComponentError('Expected the {} parameters {}'.format(2*len(self.shapes) - 1, self.parameters()))
+        nfractions = len(self.shapes) - 1
+        fraction = params[0] if nfractions == 1 else list(params[:nfractions])
+        return fraction, list(params[nfractions:])
+
+    def fractions(self, fraction):
+        fraction = list(np.atleast_1d(fraction))
+        if len(fraction) != len(self.shapes) - 1:
+            raise ComponentError('Expected {} fractions'.format(len(self.shapes) - 1))
+        return fraction + [1 - sum(fraction)]
+
+    def pdf(self, t, theta, fraction, taus, norms=None):
+        if norms is None:
+            norms = self.normalise(taus)
+        fractions = self.fractions(fraction)
+        pdf = 0.0
+        for i, tau in enumerate(taus):
+            pdf = pdf + fractions[i]*self.shape(i, t, theta, tau)/norms[i]
+        return pdf
+
+    def maxVal(self, fraction, taus, npoints=401):
+        # Dense scan of the window, including both edges, with a small safety margin for the box method
+        t = np.linspace(self.t_lolimit, self.t_hilimit, npoints)
+        theta = np.linspace(self.theta_lolimit, self.theta_hilimit, npoints)
+        t, theta = np.meshgrid(t, theta, indexing='ij')
+        return 1.01*np.max(self.pdf(t, theta, fraction, taus))
@@ -0,0 +1,275 @@
+"""
+Minuit, classes for minimising the negative log likelihood (NLL) to find the best value of physics parameter
+        F, first and second particle lifetime of the given datafile.
+
+        * Minuit       -  fit of both decay times and angle distribution (formerly MinuitPart3)
+        * TimeMinuit   -  fit of the decay times distribution only, with a fixed decay angle (formerly MinuitPart2)
+
+Authors: Azid Harun
+
+Date :  25/11/2018
+
+"""
+
+# Import required packages (iminuit is only imported when the first minimisation is run)
+import numpy as np
+
+PARAMETERS = ['fraction', 'tau1', 'tau2']
+
+# Fraction, tau1 and tau2 bounds of the fits of part2.py and part3.py
+DEFAULT_BOUNDS = ((0.0, 1), (0.0, 5.0), (0.0, 5.0))
+
+class MinuitError(Exception):
+    """ An exception class for Minuit """
+    pass
+
+
+class FitMinimum(object):
+    """ Validity and number of function calls of a minimisation, as in the iminuit fmin """
+
+    def __init__(self, is_valid, nfcn):
+        self.is_valid = is_valid
+        self.nfcn = nfcn
+
+
+class FitResult(object):
+    """
+    Class for the result of a completed minimiseLoop kept in its checkpoint, read like the iminuit minimiser.
+
+    Properties:
+    values, errors(dict)         -   fitted parameters and their errors, by name
+    fval(float)                  -   minimum of the function
+    fmin(FitMinimum)             -   validity and number of function calls of the last minimisation
+    """
+
+    def __init__(self, m):
+        self.values = {name: float(m.values[name]) for name in m.parameters}
+        self.errors = {name: float(m.errors[name]) for name in m.parameters}
+        self.fval = float(m.fval)
+        self.fmin = FitMinimum(bool(m.fmin.is_valid), int(m.fmin.nfcn))
+
+
+class Minuit(object):
+    """
+    Class for minimising the NLL.
+
+    Properties:
+    threshold(float)             -   the minimising threshold value
+    fraction_bnd(float, tuple)   -   fraction bound
+    tau1_bnd(float, tuple)       -   tau1 bound
+    tau2_bnd(float, tuple)       -   tau2 bound, also the bound of every later lifetime of a model with more components
+    names(list)                  -   fitted parameters in the call order of the function, from ComponentModel.parameters
+    error_size(float)            -   the error of the calculated parameter is 1 unit if the function given increases by this value
+    error_step(float)            -   step of the parameter scan in properErrorFinder
+
+    Methods:
+    * default                    -    create the NLL minimiser with the default bounds, for the parameters of a model
+    * bound                      -    bound of a parameter
+    * values, errors             -    fitted parameters (and their errors) of a minimisation as an array
+    * minimise                   -    minimise the function, optionally seeding the step sizes with known errors
+                                      (e.g. from the analytic covariance of the NLL model)
+    * fix0minimise               -    minimise the function with fixed fraction
+    * fix1minimise               -    minimise the function with fixed tau1
+    * fix2minimise               -    minimise the function with fixed tau2
+    * minimiseLoop               -    repeat the minimisation until the NLL changes by less than the threshold
+    * create                     -    create the iminuit minimiser without running it, for staged minimisation
+    * isFinished                 -    control the minimiser
+    * isExceeded                 -    control the proper error finding process
+    * properErrorFinder          -    calculate the proper error of the parameter
+
+    minimiseLoop and properErrorFinder take an optional Checkpoint and resume from it, a completed one returns its saved
+    result (a FitResult for minimiseLoop). minimiseLoop also takes an optional max_loops cap on the number of
+    minimisations.
+    * simpleErrorFinder          -    calculate the simplistic error of the parameter
+    * readData                   -    read the input decay time and angle distributions (t and theta)
+    """
+
+    error_step = 0.000001
+
+#========================================INITIALISER========================================
+
+    def __init__(self, threshold, fraction_range, tau1_range, tau2_range, fn_type, names=None):
+        self.threshold = threshold
+        self.names = list(PARAMETERS if names is None else names)
+        self.fraction_bnd = fraction_range
+        self.tau1_bnd = tau1_range
+        self.tau2_bnd = tau2_range
+        if fn_type == 'nll':
+            self.error_size = 0.5
+        elif fn_type == 'chi':
+            self.error_size = 1.0
+        else:
+            raise MinuitError("Invalid function type!")
+
+    @classmethod
+    def default(cls, threshold=0.0, fn_type='nll', model=None):
+        return cls(threshold, *DEFAULT_BOUNDS, fn_type, None if model is None else model.parameters())
+
+#=========================================MINIMISER=========================================
+
+    def bound(self, name):
+        if name.startswith('fraction'):
+            return self.fraction_bnd
+        return self.tau1_bnd if name == 'tau1' else self.tau2_bnd
+
+    def options(self, x, errors=None):
+        # Starting value, limits, step size and fixed flag of every parameter, in the call order of the function
+        if errors is None:
+            errors = [self.error_size]*len(self.names)
+        bounds = [self.bound(name) for name in self.names]
+        return dict(values = dict(zip(self.names, x)),
+                    limits = dict(zip(self.names, bounds)),
+                    errors = dict(zip(self.names, errors)),
+                    fixed = {},
+                    errordef = self.error_size
+                    )
+
+    def create(self, f, x, errors=None, **fixed):
+        # fixed takes fix_<parameter> = True keywords, e.g. fix_fraction = True
+        import iminuit as im
+        options = self.options(x, errors)
+        for key, value in fixed.items():
+            options['fixed'][key[len('fix_'):]] = value
+        m = im.Minuit(f, **options['values'])
+        m.errordef = options['errordef']
+        m.print_level = 0
+        for name in options['values']:
+            m.limits[name] = options['limits'][name]
+            # A zero step (e.g. the error of a parameter on its bound) is replaced by the default step size
+            m.errors[name] = options['errors'][name] if options['errors'][name] > 0 else self.error_size
+            m.fixed[name] = options['fixed'].get(name, False)
+        return m
+
+    def migrad(self, f, x, errors=None, **fixed):
+        m = self.create(f, x, errors, **fixed)
+        m.migrad()
+        return m
+
+    def minimise(self, f, x, errors=None):
+        return self.migrad(f, x, errors)
+
+    def values(self, m):
+        return np.array([m.values[name] for name in self.names])
+
+    def errors(self, m):
+        return np.array([m.errors[name] for name in self.names])
+
+    def minimiseLoop(self, f, x, *fixed, checkpoint=None, max_loops=None):
+        x = np.array(x, dtype=float)
+        errors = None
+        diff = None
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None and state.get('done'):
+            return state['result']
+        if state is not None:
+            # Warm start from the saved parameters and step sizes, with at least one more minimisation
+            x, errors, ini_nll = state['x'], state['errors'], state['ini_nll']
+        else:
+            ini_nll = f(*x, *fixed)
+        # Loop the process until difference between previous and next NLL value lower than threshold
+        loops = 0
+        while not self.isFinished(diff) and (max_loops is None or loops < max_loops):
+            loops += 1
+            m = self.minimise(f, x, errors)
+            x = self.values(m)
+            errors = self.errors(m)
+            final_nll = m.fval
+            diff = np.abs(ini_nll - final_nll)
+            ini_nll = final_nll
+            if checkpoint is not None:
+                checkpoint.save(dict(x=x, errors=errors, ini_nll=ini_nll))
+        if checkpoint is not None:
+            checkpoint.finish(FitResult(m))
+        return m
+
+    def fix0minimise(self, f, x):
+        return self.migrad(f, x, fix_fraction = True)
+
+    def fix1minimise(self, f, x):
+        return self.migrad(f, x, fix_tau1 = True)
+
+    def fix2minimise(self, f, x):
+        return self.migrad(f, x, fix_tau2 = True)
+
+#==================================MINIMISER PROCESS CONTROL================================
+
+    def isFinished(self,diff):
+        if diff == None:
+            pass
+
+        elif diff > self.threshold:
+            pass
+
+        else:
+            finish = 'Minimisation is finished'
+            return finish
+
+    def isExceeded(self,diff):
+        if diff == None:
+            pass
+
+        elif diff < self.threshold:
+            pass
+
+        else:
+            finish = 'Minimisation is finished'
+            return finish
+
+#==================================PARAMETER ERROR CALCULATOR================================
+
+    def properErrorFinder(self, nll, idx, F_tau1_tau2, *fixed, checkpoint=None):
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None and state.get('done'):
+            return state['result']
+        ini_nll = nll(*F_tau1_tau2, *fixed)
+        best = F_tau1_tau2[idx]
+        diff = None
+        increment = 0
+        if state is not None:
+            F_tau1_tau2, increment, best, ini_nll, diff = state['x'], state['increment'], state['best'], state['ini_nll'], state['diff']
+        while not self.isExceeded(diff):
+            increment += 1
+            delta = self.error_step * increment
+            F_tau1_tau2[idx] += delta
+            # Calculate previous and next NLL value and also their difference.
+            m = self.migrad(nll, F_tau1_tau2, **{'fix_' + self.names[idx]: True})
+            F_tau1_tau2 = self.values(m)
+            final_nll = m.fval
+            diff = np.abs(ini_nll - final_nll)
+            if checkpoint is not None:
+                checkpoint.save(dict(x=F_tau1_tau2, increment=increment, best=best, ini_nll=ini_nll, diff=diff))
+        error = np.abs(F_tau1_tau2[idx] - best)
+        if checkpoint is not None:
+            checkpoint.finish(error)
+        return error
+
+    @staticmethod
+    def simpleErrorFinder(level, f_list, f_min, param, param_list):
+        f_errline = min(f_list, key=lambda x:abs(x-(f_min+level)))
+        index = f_list.index(f_errline)
+        param_error =  np.abs(param - param_list[index])
+        return param_error
+
+    @staticmethod
+    def readData(filename):
+        data = np.loadtxt(filename, ndmin=2)
+        t = data[:, 0]
+        # A decay time only file (e.g. MuonDecayEvent.txt) has no angle column, its theta is zero
+        theta = data[:, 1] if data.shape[1] > 1 else np.zeros_like(t)
+        return t, theta
+
+
+class TimeMinuit(Minuit):
+    """
+    Class for minimising the NLL with fixed decay angle parameter, theta.
+    """
+
+    error_step = -0.00001
+
+    def options(self, x, errors=None):
+        options = Minuit.options(self, x, errors)
+        options['values']['theta'] = 0.0
+        options['limits']['theta'] = (0.0, 2*np.pi)
+        options['errors']['theta'] = self.error_size
+        options['fixed']['theta'] = True
+        return options
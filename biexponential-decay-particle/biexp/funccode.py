@@ -0,0 +1,16 @@
+"""
+FuncCode, the parameter names of a callable taking its parameters as *args (the joint NLL, memoized objectives), in
+the form iminuit reads them.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+class FuncCode(object):
+    """ Parameter names of a callable with a variable number of parameters, as read by iminuit """
+
+    def __init__(self, names):
+        self.co_varnames = tuple(names)
+        self.co_argcount = len(names)
@@ -0,0 +1,139 @@
+"""
+Sharded generation, functions for generating very large reproducible samples with MyPDF in parallel straight to disk.
+
+The nevents are split into shards, and every shard into blocks of BLOCK events. Every shard has its own SeedSequence
+spawned from the seed, and every block of the shard draws from its own stream spawned from the shard's. A process pool
+worker generates each shard in chunks of whole blocks written in bulk to its own .npy segment. Every chunk is also
+filled into a per shard DecayHistogram, and the shard histograms are merged into histogram.npz. A JSON manifest records
+the settings and the segments. The chunk size only sets how many blocks are written at once, so the sample is bit for
+bit reproducible from (seed, shards) and can be read back segment by segment.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from .histogram import DecayHistogram
+from .pdf import MyPDF
+
+MANIFEST = 'manifest.json'
+HISTOGRAM = 'histogram.npz'
+
+# Events drawn from one random stream, fixed so the sample does not depend on the chunk size
+BLOCK = 65536
+
+class GenerateError(Exception):
+    """ An exception class for sharded generation """
+    pass
+
+#======================================SHARD WORKER==========================================
+
+def shardSizes(nevents, nshards):
+    # Deterministic split, the first (nevents % nshards) shards carry one extra event
+    base, extra = divmod(nevents, nshards)
+    return [base + (i < extra) for i in range(nshards)]
+
+def generateShard(task):
+    """ Generate one shard into its segment file and return its manifest entry """
+    settings, index, nevents, seed, filename = task
+    pdf = MyPDF(settings['t_lolim'], settings['t_hilim'], settings['theta_lolim'], settings['theta_hilim'],
+                settings['lifetime1'], settings['lifetime2'], settings['fraction'])
+    start = time.perf_counter()
+    # Column (Fortran) order keeps t and theta contiguous, so readers get them as zero copy column views
+    segment = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64, shape=(nevents, 2), fortran_order=True)
+    hist = DecayHistogram(settings['bins'], settings['bins'], settings['t_lolim'], settings['t_hilim'],
+                          settings['theta_lolim'], settings['theta_hilim'])
+    digest = hashlib.sha256()
+    block_seeds = seed.spawn(-(-nevents // BLOCK))
+    # The box maximum and the component norms only depend on the settings, so they are computed once per shard
+    ymax, norms = pdf.maxVal(), pdf.model.normalise(pdf.lifetimes)
+    chunk = max(1, settings['chunk'] // BLOCK) * BLOCK
+    for lo in range(0, nevents, chunk):
+        hi = min(lo + chunk, nevents)
+        for block in range(lo, hi, BLOCK):
+            pdf.rng = np.random.default_rng(block_seeds[block // BLOCK])
+            t, theta = pdf.next(min(block + BLOCK, hi) - block, ymax, norms)
+            segment[block:block + len(t), 0] = t
+            segment[block:block + len(t), 1] = theta
+            # Hashed block by block, so the digest does not depend on the chunk size either
+            digest.update(t.tobytes())
+            digest.update(theta.tobytes())
+        hist.fill(segment[lo:hi, 0], segment[lo:hi, 1])
+    segment.flush()
+    del segment
+    hist_file = filename[:-len('.npy')] + '-histogram.npz'
+    hist.save(hist_file)
+    elapsed = time.perf_counter() - start
+    return dict(index=index, file=os.path.basename(filename), histogram=os.path.basename(hist_file), nevents=nevents,
+                sha256=digest.hexdigest(), seconds=elapsed)
+
+#====================================SHARDED GENERATION======================================
+
+def generate(outdir, nevents, nshards, seed, lifetime1=1.0, lifetime2=2.0, fraction=1.0, t_lolim=0.0, t_hilim=10.0,
+             theta_lolim=0.0, theta_hilim=2*math.pi, chunk=1000000, bins=100, processes=None):
+    """ Generate nevents in nshards segments under outdir and return the manifest """
+    if nshards < 1 or nevents < 0:
+        raise GenerateError('Invalid number of events or shards')
+    os.makedirs(outdir, exist_ok=True)
+    settings = dict(t_lolim=t_lolim, t_hilim=t_hilim, theta_lolim=theta_lolim, theta_hilim=theta_hilim,
+                    lifetime1=lifetime1, lifetime2=lifetime2, fraction=fraction, chunk=chunk, block=BLOCK, bins=bins)
+    seeds = np.random.SeedSequence(seed).spawn(nshards)
+    tasks = [(settings, i, n, seeds[i], os.path.join(outdir, 'segment-{:05d}.npy'.format(i)))
+             for i, n in enumerate(shardSizes(nevents, nshards))]
+    processes = min(processes or os.cpu_count(), nshards)
+    start = time.perf_counter()
+    if processes == 1:
+        segments = [generateShard(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            segments = pool.map(generateShard, tasks, 1)
+    hist = DecayHistogram(bins, bins, t_lolim, t_hilim, theta_lolim, theta_hilim)
+    for entry in segments:
+        hist.merge(DecayHistogram.load(os.path.join(outdir, entry['histogram'])))
+    hist.save(os.path.join(outdir, HISTOGRAM))
+    elapsed = time.perf_counter() - start
+    manifest = dict(histogram=HISTOGRAM, nevents=nevents, shards=nshards, seed=seed, settings=settings, segments=segments,
+                    seconds=elapsed, processes=processes)
+    # Write the manifest last and atomically, so a manifest on disk always describes complete segments
+    tmp = os.path.join(outdir, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(outdir, MANIFEST))
+    return manifest
+
+#========================================READ BACK===========================================
+
+def readManifest(outdir):
+    with open(os.path.join(outdir, MANIFEST)) as f:
+        return json.load(f)
+
+def iterSegments(outdir):
+    """ Yield the (t, theta) memory mapped columns of every segment in shard order """
+    manifest = readManifest(outdir)
+    for entry in manifest['segments']:
+        segment = np.load(os.path.join(outdir, entry['file']), mmap_mode='r')
+        yield segment[:, 0], segment[:, 1]
+
+def readHistogram(outdir):
+    return DecayHistogram.load(os.path.join(outdir, readManifest(outdir)['histogram']))
+
+def readGenerated(outdir):
+    """ Read the whole sample into memory as (t, theta) arrays """
+    manifest = readManifest(outdir)
+    t = np.empty(manifest['nevents'])
+    theta = np.empty(manifest['nevents'])
+    lo = 0
+    for seg_t, seg_theta in iterSegments(outdir):
+        t[lo:lo + len(seg_t)] = seg_t
+        theta[lo:lo + len(seg_t)] = seg_theta
+        lo += len(seg_t)
+    return t, theta
@@ -0,0 +1,135 @@
+"""
+DecayHistogram, a class accumulating fixed bin histograms of the decay time and angle chunk by chunk.
+
+Histograms with the same binning merge by adding their counts, so every worker can fill its own and the results are
+combined afterwards. Plotting draws the pre-binned counts with plt.stairs, so it costs O(bins) whatever the number of
+events.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages (matplotlib is only imported when first used)
+import math
+import numpy as np
+
+class HistogramError(Exception):
+    """ An exception class for DecayHistogram """
+    pass
+
+
+class DecayHistogram(object):
+    """
+    Class for a 2D fixed bin histogram of the decay time and angle.
+
+    Properties:
+    t_bins, theta_bins           -   number of bins in decay time and angle
+    t_lolimit, t_hilimit         -   interval of the decay time
+    theta_lolimit, theta_hilimit -   interval of the decay angle
+    counts(array)                -   (t_bins, theta_bins) event counts
+    entries(int)                 -   number of events filled, including those outside the intervals
+
+    Methods:
+    * fill                       -   add a chunk of events
+    * merge                      -   add the counts of a histogram with the same binning
+    * tEdges, thetaEdges         -   bin edges
+    * tCounts, thetaCounts       -   projections on the decay time and angle
+    * save, load                 -   write and read the histogram as a .npz file
+    """
+
+    def __init__(self, t_bins=100, theta_bins=100, t_lolim=0.0, t_hilim=10.0, theta_lolim=0.0, theta_hilim=2*math.pi):
+        self.t_bins = t_bins
+        self.theta_bins = theta_bins
+        self.t_lolimit = float(t_lolim)
+        self.t_hilimit = float(t_hilim)
+        self.theta_lolimit = float(theta_lolim)
+        self.theta_hilimit = float(theta_hilim)
+        self.counts = np.zeros((t_bins, theta_bins), dtype=np.int64)
+        self.entries = 0
+
+    def binning(self):
+        return (self.t_bins, self.theta_bins, self.t_lolimit, self.t_hilimit, self.theta_lolimit, self.theta_hilimit)
+
+    @staticmethod
+    def binIndex(x, nbins, lo, hi):
+        # Like np.histogram, the last bin includes the upper edge and values outside [lo, hi] get index -1
+        index = np.minimum(np.floor((x - lo) * (nbins / (hi - lo))).astype(np.int64), nbins - 1)
+        index[(x < lo) | (x > hi)] = -1
+        return index
+
+    def fill(self, t, theta):
+        t = np.asarray(t, dtype=float)
+        theta = np.asarray(theta, dtype=float)
+        i = self.binIndex(t, self.t_bins, self.t_lolimit, self.t_hilimit)
+        j = self.binIndex(theta, self.theta_bins, self.theta_lolimit, self.theta_hilimit)
+        inside = (i >= 0) & (j >= 0)
+        flat = np.bincount(i[inside]*self.theta_bins + j[inside], minlength=self.t_bins*self.theta_bins)
+        self.counts += flat.reshape(self.t_bins, self.theta_bins)
+        self.entries += len(t)
+        return self
+
+    def merge(self, other):
+        if self.binning() != other.binning():
+            raise HistogramError('Cannot merge histograms with different binning')
+        self.counts += other.counts
+        self.entries += other.entries
+        return self
+
+    def tEdges(self):
+        return np.linspace(self.t_lolimit, self.t_hilimit, self.t_bins + 1)
+
+    def thetaEdges(self):
+        return np.linspace(self.theta_lolimit, self.theta_hilimit, self.theta_bins + 1)
+
+    def tCounts(self):
+        return self.counts.sum(axis=1)
+
+    def thetaCounts(self):
+        return self.counts.sum(axis=0)
+
+    def save(self, filename):
+        np.savez(filename, counts=self.counts, entries=self.entries, binning=np.array(self.binning()))
+
+    @staticmethod
+    def load(filename):
+        with np.load(filename) as f:
+            binning = f['binning']
+            hist = DecayHistogram(int(binning[0]), int(binning[1]), *binning[2:])
+            hist.counts = f['counts']
+            hist.entries = int(f['entries'])
+        return hist
+
+#========================================PLOTTING============================================
+
+def plotHistogram(hist, filename=None):
+    """ Plot the decay time and angle distributions of a histogram, to a file (headless) or on screen """
+    import matplotlib
+    if filename is not None:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure()
+    plt.subplot(2, 1, 1)
+    plt.stairs(hist.tCounts(), hist.tEdges(), fill=True)
+    plt.xlim(hist.t_lolimit, hist.t_hilimit)
+    plt.ylabel(r'$No.\/of\/entries$')
+    plt.xlabel(r'$Decay\/Time,\/t\//\mu s$')
+    plt.title(r'$t\/Distribution$', fontsize='x-large')
+
+    plt.subplot(2, 1, 2)
+    plt.stairs(hist.thetaCounts(), hist.thetaEdges()/math.pi*180, fill=True)
+    plt.xlim(0, 360)
+    plt.xticks(np.arange(0, 360, 90))
+    plt.ylabel(r'$No.\/of\/entries$')
+    plt.xlabel(r'$Decay\/Angle,\/\theta\//\degree$')
+    plt.title(r'$\theta\/Distribution$', fontsize='x-large')
+
+    # Display the subplots, or save them when rendering headlessly
+    plt.subplots_adjust(hspace=0.6)
+    if filename is None:
+        plt.show()
+    else:
+        fig.savefig(filename)
+        plt.close(fig)
@@ -0,0 +1,145 @@
+"""
+JointNLL, a class for the simultaneous fit of several datasets sharing the lifetimes, e.g. decay time only runs
+(part2.py) and decay time and angle runs (part3.py) of the same particle, in one minimiser session.
+
+Every dataset keeps its own NLL model. The joint NLL is the sum of the dataset NLLs, with tau1 and tau2 shared by
+every dataset and the private parameters (the fraction by default) fitted per dataset as fraction_<name>. The dataset
+terms of one call are evaluated concurrently, on a thread pool (numpy releases the GIL inside its loops, and the
+events are shared) or on a process pool whose workers hold every dataset.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import concurrent.futures
+import multiprocessing
+import os
+import numpy as np
+from .fitter import DEFAULT_BOUNDS, PARAMETERS, Minuit
+from .funccode import FuncCode
+from . import worker
+
+
+# Starting value of a parameter the given start values leave out
+START = dict(fraction=0.5, tau1=1.0, tau2=2.0)
+
+class JointError(Exception):
+    """ An exception class for JointNLL """
+    pass
+
+def _evaluate(task):
+    index, x = task
+    name, nll, fixed = worker.state['terms'][index]
+    return nll(*x, *fixed)
+
+
+class JointNLL(object):
+    """
+    Class for the joint NLL of several datasets.
+
+    Properties:
+    terms(list)            -   (name, NLL model, fixed arguments) of every dataset, e.g. (name, TimeNLL, (theta,))
+    private(tuple)         -   parameters fitted separately for every dataset, the others are shared
+    parameters(list)       -   (joint name, parameter) of every joint parameter, in call order
+    mode(str)              -   'thread' or 'process' pool, or 'serial'
+    func_code(FuncCode)    -   joint parameter names, read by iminuit
+
+    Methods:
+    * start                -   starting values of the joint parameters
+    * split                -   (fraction, tau1, tau2) of every dataset at a joint parameter point
+    * evaluate             -   NLL of every dataset at a joint parameter point, evaluated concurrently
+    * close                -   stop the worker pool
+    """
+
+    def __init__(self, terms, private=('fraction',), workers=None, mode='thread'):
+        terms = [(term[0], term[1], tuple(term[2]) if len(term) > 2 else ()) for term in terms]
+        names = [term[0] for term in terms]
+        if len(set(names)) != len(names):
+            raise JointError('Dataset names must be unique')
+        if any(p not in PARAMETERS for p in private):
+            raise JointError('Invalid private parameter in {}'.format(private))
+        self.private = tuple(private)
+        self.parameters = [(p, p) for p in PARAMETERS if p not in private]
+        self.parameters += [('{}_{}'.format(p, name), p) for name in names for p in PARAMETERS if p in private]
+        self.func_code = FuncCode([name for name, p in self.parameters])
+        # Position of every dataset parameter in the joint parameter vector
+        position = {name: i for i, (name, p) in enumerate(self.parameters)}
+        self.index = np.array([[position[p if p not in private else '{}_{}'.format(p, name)] for p in PARAMETERS]
+                               for name in names])
+        self.terms = terms
+        self.mode = mode
+        workers = min(workers or os.cpu_count() or 1, len(terms))
+        if mode == 'thread':
+            self.pool = concurrent.futures.ThreadPoolExecutor(workers)
+        elif mode == 'process':
+            self.pool = multiprocessing.Pool(workers, worker.initWorker, (dict(terms=terms),))
+        elif mode == 'serial':
+            self.pool = None
+        else:
+            raise JointError('Invalid pool mode {}'.format(mode))
+
+    def start(self, **values):
+        return np.array([values.get(name, values.get(p, START[p])) for name, p in self.parameters], dtype=float)
+
+    def split(self, x):
+        return np.asarray(x, dtype=float)[self.index]
+
+    def evaluate(self, x):
+        points = self.split(x)
+        if self.mode == 'process':
+            return self.pool.map(_evaluate, list(enumerate(points)))
+        tasks = [(nll, point, fixed) for (name, nll, fixed), point in zip(self.terms, points)]
+        if self.mode == 'thread':
+            return list(self.pool.map(lambda task: task[0](*task[1], *task[2]), tasks))
+        return [nll(*point, *fixed) for nll, point, fixed in tasks]
+
+    def __call__(self, *x):
+        return float(np.sum(self.evaluate(x)))
+
+    def close(self):
+        if self.mode == 'thread':
+            self.pool.shutdown()
+        elif self.mode == 'process':
+            self.pool.close()
+            self.pool.join()
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JointMinuit(Minuit):
+    """
+    Class for minimising a JointNLL, the bounds of fraction, tau1 and tau2 apply to their joint parameters.
+    """
+
+    def __init__(self, threshold, fraction_range, tau1_range, tau2_range, fn_type, parameters):
+        Minuit.__init__(self, threshold, fraction_range, tau1_range, tau2_range, fn_type)
+        self.parameters = parameters
+
+    @classmethod
+    def default(cls, parameters, threshold=0.0, fn_type='nll'):
+        return cls(threshold, *DEFAULT_BOUNDS, fn_type, parameters)
+
+    def options(self, x, errors=None):
+        if errors is None:
+            errors = [self.error_size]*len(self.parameters)
+        bounds = dict(fraction=self.fraction_bnd, tau1=self.tau1_bnd, tau2=self.tau2_bnd)
+        options = dict(values={}, limits={}, errors={}, fixed={}, errordef=self.error_size)
+        for (name, p), value, error in zip(self.parameters, x, errors):
+            options['values'][name] = value
+            options['limits'][name] = bounds[p]
+            options['errors'][name] = error
+        return options
+
+    def values(self, m):
+        return np.array([m.values[name] for name, p in self.parameters])
+
+    def errors(self, m):
+        return np.array([m.errors[name] for name, p in self.parameters])
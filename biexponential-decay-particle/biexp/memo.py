@@ -0,0 +1,177 @@
+"""
+MemoizedObjective, a wrapper remembering the values of an NLL or chi-squared objective at the parameter points it has
+already been evaluated at, so the repeated evaluations of the driver loops, the error finders, migrad line searches
+and scans of the same point are not recomputed over every event.
+
+Values are keyed on the exact parameter values (their bytes, so only bit identical points match) and on a dataset
+identity covering the events, the decay window, the model (shapes, acceptance, quadrature orders) and the evaluation
+configuration, and kept in a bounded LRU cache that can be shared by several objectives and used from several threads.
+The gradient and Hessian of the NLL models are cached alongside when they are requested.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import collections
+import hashlib
+import inspect
+import threading
+import numpy as np
+from .funccode import FuncCode
+
+class MemoError(Exception):
+    """ An exception class for MemoizedObjective """
+    pass
+
+#==========================================IDENTITY==========================================
+
+def functionIdentity(fn):
+    """ Return the identity of a shape or acceptance function """
+    if fn is None:
+        return 'None'
+    name = '{}.{}'.format(getattr(fn, '__module__', ''), getattr(fn, '__qualname__', repr(fn)))
+    # Lambdas, closures and partials of the same name may compute different things, so they are told apart by object
+    if '<' in name or getattr(fn, '__closure__', None) is not None or not hasattr(fn, '__qualname__'):
+        return '{}:{}'.format(name, id(fn))
+    return name
+
+def modelIdentity(model):
+    """ Return the identity of the ComponentModel of an NLL model """
+    if model is None:
+        return 'None'
+    return repr([[functionIdentity(shape) for shape in model.shapes], functionIdentity(model.acceptance),
+                 model.t_lolimit, model.t_hilimit, model.theta_lolimit, model.theta_hilimit,
+                 model.t_order, model.theta_order])
+
+def datasetIdentity(f):
+    """ Return the identity of the dataset, model and evaluation configuration an objective is bound to """
+    arrays = [getattr(f, name, None) for name in ('t', 'theta', 'weights', 'counts')]
+    if arrays[0] is None:
+        # A plain function reads its data from its module, so only the function itself identifies it
+        return '{}.{}:{}'.format(getattr(f, '__module__', ''), getattr(f, '__qualname__', type(f).__name__), id(f))
+    digest = hashlib.sha1(type(f).__name__.encode())
+    digest.update(repr([getattr(f, name, None) for name in ('t_lolimit', 't_hilimit', 'theta_lolimit',
+                                                             'theta_hilimit', 'normalisation')]).encode())
+    digest.update(modelIdentity(getattr(f, 'model', None)).encode())
+    config = getattr(f, 'config', None)
+    digest.update(repr(sorted(config.items()) if config else None).encode())
+    for arr in arrays:
+        digest.update(b'|' if arr is None else np.ascontiguousarray(arr, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class MemoCache(object):
+    """
+    Class for a bounded, thread safe LRU cache of objective values.
+
+    Properties:
+    maxsize(int)           -   largest number of entries kept
+    hits, misses(int)      -   lookups answered and not answered by the cache
+    evictions(int)         -   entries dropped to respect maxsize
+
+    Methods:
+    * get                  -   return the cached entry of a key, or None
+    * put                  -   store an entry, dropping the least recently used one when full
+    * stats                -   hit and miss counts and the hit rate
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self.entries),
+                        hit_rate=self.hits / lookups if lookups else 0.0)
+
+
+class MemoizedObjective(object):
+    """
+    Class for a memoized objective, called exactly like the wrapped NLL or chi-squared function.
+
+    Properties:
+    f(callable)            -   wrapped objective, its other attributes (t, model, ...) are reachable through the wrapper
+    identity(str)          -   dataset identity the cache entries are keyed on
+    cache(MemoCache)       -   cache of values, gradients and Hessians, possibly shared with other objectives
+    func_code(FuncCode)    -   parameter names of the wrapped objective, read by iminuit
+
+    Methods:
+    * derivatives          -   value, gradient and Hessian of an NLL model, cached
+    * gradient             -   gradient of an NLL model, cached
+    * stats                -   hit and miss counts and the hit rate of the cache
+    """
+
+    def __init__(self, f, cache=None, maxsize=4096, identity=None):
+        self.f = f
+        self.identity = identity or datasetIdentity(f)
+        self.cache = cache if cache is not None else MemoCache(maxsize)
+        # NLL models name their parameters themselves, as their number depends on the model
+        self.func_code = getattr(f, 'func_code', None) or FuncCode(list(inspect.signature(f).parameters))
+
+    def key(self, kind, args):
+        values = np.concatenate([np.ravel(np.asarray(a, dtype=float)) for a in args]) if args else np.empty(0)
+        return (self.identity, kind, values.tobytes())
+
+    def cached(self, kind, compute, args):
+        key = self.key(kind, args)
+        value = self.cache.get(key)
+        if value is None:
+            # Computed outside the lock, so threads only wait for each other on the cache itself
+            value = compute(*args)
+            self.cache.put(key, value)
+        return value
+
+    def __call__(self, *args):
+        return self.cached('value', self.f, args)
+
+    def derivatives(self, *args):
+        if not hasattr(self.f, 'derivatives'):
+            raise MemoError('{} has no analytic derivatives'.format(type(self.f).__name__))
+        result = self.cached('derivatives', self.f.derivatives, args)
+        # The value comes with the derivatives, so a later call at the same point is free
+        self.cache.put(self.key('value', args), result[0])
+        return result
+
+    def gradient(self, *args):
+        return self.derivatives(*args)[1]
+
+    def stats(self):
+        return self.cache.stats()
+
+    def __getattr__(self, name):
+        # Only reached for attributes the wrapper does not have itself
+        if name.startswith('__') or 'f' not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.f, name)
+
+    def __getstate__(self):
+        # The lock cannot be pickled, a copy in another process starts with its own empty cache
+        return dict(f=self.f, identity=self.identity, maxsize=self.cache.maxsize)
+
+    def __setstate__(self, state):
+        self.__init__(state['f'], maxsize=state['maxsize'], identity=state['identity'])
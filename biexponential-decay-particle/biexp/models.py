@@ -0,0 +1,322 @@
+"""
+NLL models, the negative log likelihood (NLL) functions of the bi-exponential decay fits of part2.py and part3.py,
+            bound to a dataset instead of to module globals so they can be imported and reused.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages (scipy.integrate is only imported for the reference dblquad normalisation, and
+# concurrent.futures for the first threaded evaluation)
+import copy
+import functools
+import math
+import os
+import numpy as np
+from .components import ComponentModel
+from .funccode import FuncCode
+from .tuning import evaluationConfig
+
+@functools.lru_cache(maxsize=None)
+def _executor(threads):
+    # One thread pool per thread count, shared by every NLL model of the process
+    import concurrent.futures
+    return concurrent.futures.ThreadPoolExecutor(threads)
+
+# A forked child (e.g. a Bootstrap or MultiStart pool worker) inherits the cached pools without their threads, so it
+# starts its own
+os.register_at_fork(after_in_child=_executor.cache_clear)
+
+#=====================================DISTINCT EVENTS========================================
+
+def quantise(x, resolution, origin=0.0):
+    """ Snap values to the nearest multiple of the resolution from the origin, e.g. to the TDC resolution """
+    return origin + np.round((np.asarray(x, dtype=float) - origin) / resolution) * resolution
+
+def uniqueEvents(t, theta=None, weights=None, t_resolution=None, theta_resolution=None):
+    """
+    Collapse identical events, after snapping them to the resolutions when given, into the distinct values and their
+    multiplicities (the sum of their weights for weighted events). Return (t, theta, multiplicity), theta is None
+    for decay times only.
+    """
+    t = np.asarray(t, dtype=float)
+    if t_resolution:
+        t = quantise(t, t_resolution)
+    keys = [t]
+    if theta is not None:
+        theta = np.asarray(theta, dtype=float)
+        if theta_resolution:
+            theta = quantise(theta, theta_resolution)
+        # np.lexsort sorts on the last key first
+        keys = [theta, t]
+    order = np.lexsort(keys)
+    keys = [key[order] for key in keys]
+    # An event starts a new distinct value when any of its coordinates differs from the previous event
+    first = np.zeros(len(t), dtype=bool)
+    first[:1] = True
+    for key in keys:
+        first[1:] |= key[1:] != key[:-1]
+    starts = np.flatnonzero(first)
+    if weights is None:
+        multiplicity = np.diff(np.append(starts, len(t)))
+    else:
+        multiplicity = np.add.reduceat(np.asarray(weights, dtype=float)[order], starts)
+    return keys[-1][starts], None if theta is None else keys[0][starts], multiplicity
+
+
+class TimeAngleNLL(object):
+    """
+    NLL of the decay time and angle distributions (part3.py). Calling the object with the parameters of its model,
+    fraction, tau1 and tau2 for the default two components, returns the NLL of the bound dataset, so it can be handed
+    directly to the Minuit classes.
+
+    Properties:
+    t(array)                     -   decay times
+    theta(array)                 -   decay angles
+    t_lolimit, t_hilimit         -   interval of the decay time
+    theta_lolimit, theta_hilimit -   interval of the decay angle
+    weights(array or None)       -   per event weights (e.g. bootstrap multiplicities, or the multiplicities of the
+                                     distinct events of a collapsed dataset), None for unit weights
+    model(ComponentModel)        -   decay shape components, shared with the MyPDF generator
+    normalisation(str)           -   'grid' for the cached Gauss-Legendre grid of the model, 'dblquad' for the
+                                     adaptive reference integration
+    config(dict)                 -   evaluation backend, chunk size, threads and dtype, from the machine profile of
+                                     the autotuner unless given (see tuning)
+    func_code(FuncCode)          -   parameter names of the model, read by iminuit
+
+    Methods:
+    * normalise                  -   integrate every decay component over the decay window
+    * pdf                        -   evaluate the normalised total PDF at every event
+    * collapse                   -   NLL over the distinct events of a dataset, weighted by their multiplicities
+    * weighted                   -   return the same NLL over the same events with new per event weights
+    * subset                     -   return the same NLL over a subset of the events (an index or slice)
+    * sumNLL                     -   sum the per event -log(pdf), applying the weights
+    * evaluate                   -   NLL at a parameter point with the evaluation configuration
+    * derivatives                -   NLL, exact gradient and Hessian in the model parameters in one pass
+    * covariance                 -   covariance and correlation matrix at the minimum from the inverse Hessian
+    """
+
+    def __init__(self, t, theta, t_lolim=0.0, t_hilim=10.0, theta_lolim=0.0, theta_hilim=2*np.pi, weights=None,
+                 model=None, normalisation='grid', config=None):
+        self.t = np.asarray(t, dtype=float)
+        self.theta = np.asarray(theta, dtype=float)
+        self.weights = weights
+        self.t_lolimit = t_lolim
+        self.t_hilimit = t_hilim
+        self.theta_lolimit = theta_lolim
+        self.theta_hilimit = theta_hilim
+        if model is None:
+            model = ComponentModel(t_lolim=t_lolim, t_hilim=t_hilim, theta_lolim=theta_lolim, theta_hilim=theta_hilim)
+        self.model = model
+        self.normalisation = normalisation
+        self.config = evaluationConfig(len(self.t), config)
+        self.func_code = FuncCode(self.model.parameters())
+        self._factors = None
+
+    @classmethod
+    def collapse(cls, t, theta, t_resolution=None, theta_resolution=None, weights=None, **options):
+        # Every call costs O(distinct events), and exact duplicates give the NLL of the per event fit
+        t, theta, multiplicity = uniqueEvents(t, theta, weights, t_resolution, theta_resolution)
+        return cls(t, theta, weights=multiplicity, **options)
+
+    def __getstate__(self):
+        # The fused backend cache is rebuilt on demand, so copies over other events or in other processes never
+        # see a stale one
+        state = self.__dict__.copy()
+        state['_factors'] = None
+        return state
+
+    def normalise(self, *taus):
+        if self.normalisation == 'grid':
+            return self.model.normalise(taus)
+        import scipy.integrate as integrate
+        norms = []
+        for i, tau in enumerate(taus):
+            shape = lambda t, theta: float(self.model.shape(i, t, theta, tau))
+            norms.append(integrate.dblquad( shape, self.theta_lolimit, self.theta_hilimit, lambda theta: self.t_lolimit, lambda theta: self.t_hilimit)[0])
+        return tuple(norms)
+
+    def pdf(self, params, theta):
+        fraction, taus = self.model.split(params)
+        return self.model.pdf(self.t, theta, fraction, taus, self.normalise(*taus))
+
+    def weighted(self, weights):
+        # Shallow copy, so the event arrays are shared rather than copied
+        nll = copy.copy(self)
+        nll.weights = weights
+        return nll
+
+    def subset(self, index):
+        # A slice keeps views of the event arrays, an index array copies the selected events
+        nll = copy.copy(self)
+        nll.t, nll.theta = self.t[index], self.theta[index]
+        if self.weights is not None:
+            nll.weights = np.asarray(self.weights)[index]
+        return nll
+
+    def sumNLL(self, pdf):
+        if self.weights is None:
+            return np.sum(-np.log(pdf))
+        return -np.dot(self.weights, np.log(pdf))
+
+    def factors(self, theta):
+        # Every component depends on its lifetime only through exp(-t/tau), so its shape at an infinite lifetime
+        # is the parameter independent angular factor (times the acceptance)
+        key = 'events' if theta is self.theta else float(theta)
+        if self._factors is None or self._factors[0] != key:
+            dtype = self.config['dtype']
+            factors = np.array([self.model.shape(i, self.t, theta, np.inf) * np.ones(len(self.t))
+                                for i in range(len(self.model.shapes))], dtype=dtype)
+            self._factors = (key, self.t.astype(dtype), factors)
+        return self._factors[1], self._factors[2]
+
+    def chunkNLL(self, s, fraction, taus, norms, theta):
+        weights = None if self.weights is None else np.asarray(self.weights)[s]
+        if self.config['backend'] == 'numpy':
+            theta = theta if np.ndim(theta) == 0 else theta[s]
+            log_pdf = np.log(self.model.pdf(self.t[s], theta, fraction, taus, norms))
+        else:
+            t, factors = self.factors(theta)
+            t = t[s]
+            log_pdf = np.zeros(len(t), dtype=t.dtype)
+            buffer = np.empty_like(log_pdf)
+            for i, coefficient in enumerate(np.array(self.model.fractions(fraction)) / norms):
+                np.multiply(t, -1/taus[i], out=buffer)
+                np.exp(buffer, out=buffer)
+                np.multiply(buffer, factors[i][s], out=buffer)
+                np.multiply(buffer, coefficient, out=buffer)
+                np.add(log_pdf, buffer, out=log_pdf)
+            np.log(log_pdf, out=log_pdf)
+        if weights is None:
+            return -np.sum(log_pdf, dtype=np.float64)
+        return -np.dot(weights, log_pdf.astype(np.float64, copy=False))
+
+    def evaluate(self, params, theta):
+        config = self.config
+        if config['backend'] == 'numpy' and config['chunk'] is None:
+            return self.sumNLL(self.pdf(params, theta))
+        fraction, taus = self.model.split(params)
+        norms = np.asarray(self.normalise(*taus))
+        nevents = len(self.t)
+        step = config['chunk'] or nevents
+        chunks = [slice(lo, lo + step) for lo in range(0, nevents, step)]
+        if config['backend'] == 'fused':
+            # Build the cache before the chunks share it
+            self.factors(theta)
+        if config['threads'] > 1 and len(chunks) > 1:
+            parts = _executor(config['threads']).map(lambda s: self.chunkNLL(s, fraction, taus, norms, theta), chunks)
+        else:
+            parts = [self.chunkNLL(s, fraction, taus, norms, theta) for s in chunks]
+        return math.fsum(parts)
+
+    def __call__(self, *params):
+        return self.evaluate(params, self.theta)
+
+#=====================================ANALYTIC DERIVATIVES====================================
+
+    def lifetimeTerms(self, tau):
+        # d/dtau log(norm) and its derivative, from the quadrature grid of the model. Every component depends on
+        # its lifetime only through exp(-t/tau), so d shape/d tau = shape * t/tau^2.
+        t, theta, w = self.model.grid()
+        terms = []
+        for i in range(len(tau)):
+            shape = w * self.model.shape(i, t, theta, tau[i])
+            norm = np.sum(shape)
+            dnorm = np.dot(shape, t) / tau[i]**2
+            d2norm = np.dot(shape, t**2/tau[i]**4 - 2*t/tau[i]**3)
+            terms.append((dnorm/norm, d2norm/norm - (dnorm/norm)**2))
+        return terms
+
+    def derivatives(self, *params, theta=None):
+        if theta is None:
+            theta = self.theta
+        fraction, taus = self.model.split(params)
+        fractions = self.model.fractions(fraction)
+        norms = self.normalise(*taus)
+        # Per component and event: the normalised shape g, a = d log(g)/d tau and da = d a/d tau
+        g, a, da = [], [], []
+        for i, (tau, (dlog, d2log)) in enumerate(zip(taus, self.lifetimeTerms(taus))):
+            g.append(self.model.shape(i, self.t, theta, tau) / norms[i])
+            a.append(self.t/tau**2 - dlog)
+            da.append(-2*self.t/tau**3 - d2log)
+        pdf = sum(c*gi for c, gi in zip(fractions, g))
+        # First and second derivatives of the pdf, divided by the pdf. The last component takes the remaining
+        # fraction, so each free fraction moves the pdf by its component minus the last one.
+        nfractions = len(fractions) - 1
+        first = np.array([g[j] - g[-1] for j in range(nfractions)] +
+                         [c*gi*ai for c, gi, ai in zip(fractions, g, a)]) / pdf
+        second = np.zeros((len(params), len(params)) + np.shape(pdf))
+        last = nfractions + len(taus) - 1
+        for j in range(nfractions):
+            second[j, nfractions + j] = second[nfractions + j, j] = g[j]*a[j] / pdf
+            second[j, last] = second[last, j] = -g[-1]*a[-1] / pdf
+        for i in range(len(taus)):
+            second[nfractions + i, nfractions + i] = fractions[i]*g[i]*(a[i]**2 + da[i]) / pdf
+        w = np.ones(len(self.t)) if self.weights is None else self.weights
+        value = -np.dot(w, np.log(pdf))
+        gradient = -first.dot(w)
+        hessian = np.einsum('in,jn,n->ij', first, first, w) - second.dot(w)
+        return value, gradient, hessian
+
+    def covariance(self, *params, theta=None):
+        # The NLL rises by 0.5 at one standard deviation, so the covariance is the plain inverse Hessian
+        hessian = self.derivatives(*params, theta=theta)[2]
+        cov = np.linalg.inv(hessian)
+        sigma = np.sqrt(np.diag(cov))
+        return cov, cov / np.outer(sigma, sigma)
+
+
+class TimeNLL(TimeAngleNLL):
+    """
+    NLL of the decay time distribution only (part2.py). The decay angle is a last, fixed parameter theta
+    that is shared by every event.
+    """
+
+    def __init__(self, t, t_lolim=0.0, t_hilim=10.0, theta_lolim=0.0, theta_hilim=2*np.pi, weights=None,
+                 model=None, normalisation='grid', config=None):
+        TimeAngleNLL.__init__(self, t, np.zeros(len(t)), t_lolim, t_hilim, theta_lolim, theta_hilim, weights,
+                              model, normalisation, config)
+        self.func_code = FuncCode(self.model.parameters() + ['theta'])
+
+    @classmethod
+    def collapse(cls, t, t_resolution=None, weights=None, **options):
+        t, theta, multiplicity = uniqueEvents(t, None, weights, t_resolution)
+        return cls(t, weights=multiplicity, **options)
+
+    def __call__(self, *params):
+        return self.evaluate(params[:-1], params[-1])
+
+
+class BinnedNLL(object):
+    """
+    Binned NLL of a DecayHistogram of the decay time and angle. Each bin probability is the total PDF at the bin centre
+    times the bin area, renormalised over the bins, so one call costs O(bins) whatever the number of events.
+
+    Properties:
+    hist(DecayHistogram)         -   binned events
+    model(ComponentModel)        -   decay shape components
+    func_code(FuncCode)          -   parameter names of the model, read by iminuit
+    """
+
+    def __init__(self, hist, model=None):
+        self.hist = hist
+        if model is None:
+            model = ComponentModel(t_lolim=hist.t_lolimit, t_hilim=hist.t_hilimit,
+                                   theta_lolim=hist.theta_lolimit, theta_hilim=hist.theta_hilimit)
+        self.model = model
+        self.func_code = FuncCode(self.model.parameters())
+        t_edges, theta_edges = hist.tEdges(), hist.thetaEdges()
+        t, theta = np.meshgrid(0.5*(t_edges[1:] + t_edges[:-1]), 0.5*(theta_edges[1:] + theta_edges[:-1]), indexing='ij')
+        # Only the filled bins contribute to the NLL
+        filled = hist.counts > 0
+        self.t, self.theta, self.counts = t[filled], theta[filled], hist.counts[filled].astype(float)
+        self.t_all, self.theta_all = t.ravel(), theta.ravel()
+
+    def __call__(self, *params):
+        fraction, taus = self.model.split(params)
+        norms = self.model.normalise(taus)
+        total = np.sum(self.model.pdf(self.t_all, self.theta_all, fraction, taus, norms))
+        pdf = self.model.pdf(self.t, self.theta, fraction, taus, norms) / total
+        return -np.dot(self.counts, np.log(pdf))
@@ -0,0 +1,153 @@
+"""
+MultiStart, a class for minimising the bi-exponential NLL from many starting points in parallel.
+
+The K starting points are a Latin hypercube or scrambled Sobol sample of the fraction, tau1 and tau2 ranges. Every
+start runs migrad in stages of a limited number of calls in a pool worker. The best NLL found so far is shared by all
+the workers, and a start whose NLL still trails it by more than the margin after a stage is abandoned.
+
+Minima that only differ by a relabelling of the two components are canonicalised to tau1 <= tau2 when both components
+have the same shape, which is the only case where the relabelling is a symmetry of the NLL. When the fraction sits on
+a bound the lifetime of the empty component is not determined, so it is ignored when the minima are grouped.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import multiprocessing
+import os
+import time
+import numpy as np
+from . import worker
+
+class MultiStartError(Exception):
+    """ An exception class for MultiStart """
+    pass
+
+def _runStart(task):
+    index, x = task
+    state = worker.state
+    nll, fitter, best = state['nll'], state['fitter'], state['best']
+    m = fitter.create(nll, x)
+    status = 'stopped'
+    for stage in range(1, state['max_stages'] + 1):
+        m.migrad(ncall=state['stage_calls'])
+        with best.get_lock():
+            if m.fval < best.value:
+                best.value = m.fval
+            leader = best.value
+        if m.fmin.is_valid:
+            status = 'converged'
+            break
+        if stage >= state['min_stages'] and m.fval > leader + state['margin']:
+            status = 'pruned'
+            break
+    return dict(index=index, start=x, x=fitter.values(m), fval=m.fval, status=status, stages=stage)
+
+#======================================STARTING POINTS=======================================
+
+def startingPoints(nstarts, bounds, sampler='lhs', seed=None):
+    """ Return nstarts points inside the (lo, hi) bounds of every parameter """
+    from scipy.stats import qmc
+    if sampler == 'lhs':
+        sample = qmc.LatinHypercube(d=len(bounds), seed=seed).random(nstarts)
+    elif sampler == 'sobol':
+        sample = qmc.Sobol(d=len(bounds), scramble=True, seed=seed).random(nstarts)
+    else:
+        raise MultiStartError('Invalid sampler {}'.format(sampler))
+    lo, hi = np.array(bounds, dtype=float).T
+    # Keep the starts strictly inside the bounds, where the lifetimes are positive
+    return qmc.scale(np.clip(sample, 1e-3, 1 - 1e-3), lo, hi)
+
+
+class MultiStart(object):
+    """
+    Class for parallel multi start minimisation with early pruning.
+
+    Properties:
+    nll(TimeAngleNLL)            -   NLL bound to the dataset
+    fitter(Minuit)               -   minimiser, its bounds are the ranges the starts are drawn from
+    nstarts(int)                 -   number of starts, K
+    sampler(str)                 -   'lhs' or 'sobol'
+    margin(float)                -   NLL margin behind the best start beyond which a start is abandoned
+    stage_calls(int)             -   NLL calls per migrad stage
+    results(list)                -   outcome of every start
+    minima(list)                 -   distinct minima found, best first
+
+    Methods:
+    * run                        -   run every start and return the canonical global best
+    * canonical                  -   canonicalise the component labelling of a minimum
+    * distinctMinima             -   group the converged starts into distinct minima
+    """
+
+    def __init__(self, nll, fitter, nstarts, sampler='lhs', margin=10.0, stage_calls=50, max_stages=20,
+                 min_stages=2, seed=None, processes=None):
+        self.nll = nll
+        self.fitter = fitter
+        self.nstarts = nstarts
+        self.sampler = sampler
+        self.margin = margin
+        self.stage_calls = stage_calls
+        self.max_stages = max_stages
+        self.min_stages = min_stages
+        self.seed = seed
+        self.processes = processes
+        self.results = None
+        self.minima = None
+        self.elapsed = None
+
+    def bounds(self):
+        return [self.fitter.fraction_bnd, self.fitter.tau1_bnd, self.fitter.tau2_bnd]
+
+    def run(self):
+        starts = startingPoints(self.nstarts, self.bounds(), self.sampler, self.seed)
+        tasks = list(enumerate(starts))
+        best = multiprocessing.Value('d', np.inf)
+        state = dict(nll=self.nll, fitter=self.fitter, best=best, margin=self.margin, stage_calls=self.stage_calls,
+                     max_stages=self.max_stages, min_stages=self.min_stages)
+        start = time.perf_counter()
+        if self.processes == 1:
+            worker.initWorker(state)
+            results = [_runStart(task) for task in tasks]
+        else:
+            processes = self.processes or os.cpu_count()
+            with multiprocessing.Pool(processes, worker.initWorker, (state,)) as pool:
+                results = pool.map(_runStart, tasks, 1)
+        self.elapsed = time.perf_counter() - start
+        for result in results:
+            result['x'] = self.canonical(result['x'])
+        self.results = results
+        self.minima = self.distinctMinima(results)
+        if not self.minima:
+            raise MultiStartError('No start converged')
+        return self.minima[0]
+
+    def symmetric(self):
+        shapes = self.nll.model.shapes
+        return len(shapes) == 2 and shapes[0] is shapes[1]
+
+    def canonical(self, x):
+        x = np.array(x, dtype=float)
+        if self.symmetric() and x[1] > x[2]:
+            x = np.array([1 - x[0], x[2], x[1]])
+        return x
+
+    def identified(self, x, edge=1e-3):
+        # Mask of the parameters the NLL constrains: the lifetime of an empty component is not
+        lo, hi = self.fitter.fraction_bnd
+        return np.array([True, x[0] > lo + edge, x[0] < hi - edge])
+
+    def distinctMinima(self, results, ftol=0.1, xtol=1e-2):
+        minima = []
+        for result in sorted((r for r in results if r['status'] == 'converged'), key=lambda r: r['fval']):
+            for minimum in minima:
+                mask = self.identified(minimum['x']) & self.identified(result['x'])
+                close = np.abs(result['x'] - minimum['x']) <= xtol * np.maximum(1, np.abs(minimum['x']))
+                if abs(result['fval'] - minimum['fval']) < ftol and np.all(close[mask]):
+                    minimum['count'] += 1
+                    break
+            else:
+                minima.append(dict(x=result['x'], fval=result['fval'], count=1))
+        return minima
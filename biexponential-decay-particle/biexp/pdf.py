@@ -0,0 +1,138 @@
+"""
+MyPDF, a class for generating random events with decay time and angle distributions according to the PDF described in the report.
+
+Authors: Azid Harun
+
+Date :  25/11/2018
+
+"""
+
+# Import required packages (matplotlib is only imported when first used)
+import numpy
+from .components import ComponentModel
+from .histogram import DecayHistogram, plotHistogram
+
+class PDFError(Exception):
+    """ An exception class for MyPDF """
+    pass
+
+#===============================================
+# 2D pdf
+class MyPDF:
+    """
+    Class for generating random events with decay time and angle distributions according to the PDF described in the report.
+
+    Properties:
+    lifetime1(float)       -  particle first lifetime
+    lifetime2(float)       -  particle second lifetime
+    lifetimes(list)        -  lifetime of every component of the model, [lifetime1, lifetime2] unless given for a
+                              model with other than two components
+
+    t_lolimit(float)       -  lower limit of interval for decay time
+    t_hilimit(float)       -  higher limit of interval for decay time
+
+    theta_lolimit(float)   -  lower limit of interval for decay angle
+    theta_hilimit(float)   -  higher limit of interval for decay angle
+
+    model(ComponentModel)  - decay shape components, shared with the NLL fits
+    shape1(function)       - PDF of first decay component, PDF1
+    shape2(function)       - PDF of second decay component, PDF2
+
+    fraction(float, list)  - fraction of PDF1 being the total PDF of the decay, the K-1 free fractions of a model
+                             with K components (see ComponentModel.fractions)
+    rng(Generator)         - random number source, the global numpy.random state unless a numpy Generator is given
+
+    Methods:
+    * maxVal               - return the maximum value of the total PDF of the decay
+    * normalise            - normalise the given pdf
+    * evaluate             - evaluate the normalised pdf at give decay time and angle
+    * next                 - draw N random number from distribution
+    * drawSample           - draw a random sample of N events from a pdf using box method, with the maximum and the
+                             component norms given when the caller draws many samples with the same parameters
+    * plotShape            - plot histograms of the decay time and angle distributions of the generated data,
+                             to a file when a filename is given
+    * writeData            - write out decay times and decay angles generated
+    """
+
+     # Constructor
+    def __init__(self, t_lolim, t_hilim, theta_lolim, theta_hilim, lifetime1, lifetime2, fraction, model=None, rng=None,
+                 lifetimes=None):
+        self.lifetime1 = lifetime1
+        self.lifetime2 = lifetime2
+        self.lifetimes = [lifetime1, lifetime2] if lifetimes is None else list(lifetimes)
+        self.t_lolimit = t_lolim
+        self.t_hilimit = t_hilim
+        self.theta_lolimit = theta_lolim
+        self.theta_hilimit = theta_hilim
+        if model is None:
+            model = ComponentModel(t_lolim=t_lolim, t_hilim=t_hilim, theta_lolim=theta_lolim, theta_hilim=theta_hilim)
+        self.model = model
+        if len(self.lifetimes) != len(model.shapes):
+            raise PDFError('Expected {} lifetimes, one per component'.format(len(model.shapes)))
+        self.shape1 = lambda t, theta: self.model.shape(0, t, theta, self.lifetimes[0])
+        self.shape2 = lambda t, theta: self.model.shape(1, t, theta, self.lifetimes[1])
+        self.fraction = fraction
+        self.rng = numpy.random if rng is None else rng
+
+    # Return the maximum value of the total PDF of the decay (normalised, as returned by evaluate)
+    def maxVal( self ) :
+        return self.model.maxVal(self.fraction, self.lifetimes)
+
+    def normalise( self, pdf ) :
+        if pdf not in range(1, len(self.lifetimes) + 1):
+            raise PDFError('Invalid PDF')
+        return self.model.normalise(self.lifetimes)[pdf - 1]
+
+    # Evaluate method (normalised)
+    def evaluate( self, t, theta, norm1, norm2, pdf_type):
+        pdf1 = self.fraction * (self.shape1(t, theta) / norm1)
+        pdf2 = (1-self.fraction) * (self.shape2(t, theta) / norm2)
+        if pdf_type == 'all':
+            return pdf1 + pdf2
+        elif pdf_type == '1':
+            return pdf1
+        elif pdf_type == '2':
+            return pdf2
+        else:
+            raise PDFError('Invalid PDF type')
+
+    # Draw N random number from distribution
+    def next(self, nevents, ymax=None, norms=None):
+        data  = self.drawSample(self, self.t_lolimit, self.t_hilimit, self.theta_lolimit, self.theta_hilimit, nevents,
+                                ymax, norms)
+        return data
+
+    @staticmethod
+    # To draw a random sample of N events from a pdf using box method, throwing the events in vectorized batches
+    def drawSample(self, t_lolim, t_hilim, theta_lolim, theta_hilim, nevents, ymax=None, norms=None):
+        times = [numpy.empty(0)]
+        thetas = [numpy.empty(0)]
+        if norms is None:
+            norms = self.model.normalise(self.lifetimes)
+        if ymax is None:
+            ymax = self.maxVal()
+        efficiency = 1 / (ymax * (t_hilim - t_lolim) * (theta_hilim - theta_lolim))
+        nleft = nevents
+        while nleft > 0:
+            nthrow = int(1.1 * nleft / efficiency) + 16
+            tthrow = self.rng.uniform(t_lolim, t_hilim, nthrow)
+            thetathrow = self.rng.uniform(theta_lolim, theta_hilim, nthrow)
+            ythrow = ymax * self.rng.uniform(size=nthrow)
+            keep = ythrow <= self.model.pdf(tthrow, thetathrow, self.fraction, self.lifetimes, norms)
+            times.append(tthrow[keep][:nleft])
+            thetas.append(thetathrow[keep][:nleft])
+            nleft -= len(times[-1])
+        return (numpy.concatenate(times), numpy.concatenate(thetas))
+
+    @staticmethod
+    # function to plot histograms of the decay time and angle distributions, binned once and drawn from the counts
+    def plotShape(data, t_lolim, t_hilim, theta_lolim, theta_hilim, nbins, filename=None ):
+        hist = DecayHistogram(nbins, nbins, t_lolim, t_hilim, theta_lolim, theta_hilim).fill(data[0], data[1])
+        plotHistogram(hist, filename)
+
+    @staticmethod
+    # function to write out decay times and decay angle generated
+    def writeData(data, filename):
+        with open(filename, 'a') as f:
+            for time, angle in zip(data[0], data[1]):
+                f.write('{0:0.16f} {1:0.16f}\n'.format(time, angle))
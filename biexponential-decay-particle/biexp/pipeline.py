@@ -0,0 +1,177 @@
+"""
+Pipeline, a class connecting MyPDF event generation directly to a fit through a bounded in memory queue, so validation
+samples never go through formatted text files.
+
+A producer process generates vectorized MyPDF batches and puts them on a bounded multiprocessing queue (optionally
+also writing them in bulk to a .npy file). The consumer appends every batch to preallocated arrays and fills the
+decay histogram while the producer keeps generating. Each time the received sample doubles it runs a warm up fit on
+it, so the final fit on the full sample starts next to the minimum and the fit overlaps with the generation.
+
+A failure on either side stops the other: a producer error is sent down the queue (and a producer that dies without
+sending it is noticed by polling its exit code), and the producer is terminated when the consumer fails.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from queue import Empty
+import numpy as np
+from .histogram import DecayHistogram
+from .models import BinnedNLL, TimeAngleNLL
+from .pdf import MyPDF
+
+# Seconds between two checks of the producer while waiting for a batch
+POLL = 1.0
+
+class PipelineError(Exception):
+    """ An exception class for Pipeline """
+    pass
+
+#=========================================PRODUCER===========================================
+
+def _produce(settings, nevents, batch, seed, queue, output):
+    try:
+        _generate(settings, nevents, batch, seed, queue, output)
+    except Exception:
+        # The error takes the place of the end of the stream, so the consumer stops waiting
+        queue.put(PipelineError('The producer failed:\n' + traceback.format_exc()))
+
+def _generate(settings, nevents, batch, seed, queue, output):
+    rng = np.random.default_rng(seed)
+    pdf = MyPDF(settings['t_lolim'], settings['t_hilim'], settings['theta_lolim'], settings['theta_hilim'],
+                settings['lifetime1'], settings['lifetime2'], settings['fraction'], rng=rng)
+    start = time.perf_counter()
+    segment = None
+    if output is not None:
+        segment = np.lib.format.open_memmap(output, mode='w+', dtype=np.float64, shape=(nevents, 2), fortran_order=True)
+    # The box maximum and the component norms are computed once rather than for every batch
+    ymax, norms = pdf.maxVal(), pdf.model.normalise(pdf.lifetimes)
+    for lo in range(0, nevents, batch):
+        t, theta = pdf.next(min(batch, nevents - lo), ymax, norms)
+        if segment is not None:
+            segment[lo:lo + len(t), 0] = t
+            segment[lo:lo + len(t), 1] = theta
+        queue.put((t, theta))
+    if segment is not None:
+        segment.flush()
+    # The end of the stream carries the generation time
+    queue.put(time.perf_counter() - start)
+
+
+class Pipeline(object):
+    """
+    Class for a generate to fit pipeline.
+
+    Properties:
+    nevents(int)           -   number of events to generate
+    settings(dict)         -   MyPDF decay window, lifetimes and fraction
+    batch(int)             -   events per generated batch
+    queue_size(int)        -   maximum number of batches waiting in the queue
+    output(str)            -   optional .npy file the events are also written to
+    binned(bool)           -   fit the histogram bins instead of the events
+    warm(bool)             -   run warm up fits while generating (default: only with more than one core)
+    timings(dict)          -   generate, wait, fit and total time of the last run
+
+    Methods:
+    * receive              -   next item of the queue, raising PipelineError if the producer failed or died
+    * run                  -   generate and fit, returning the iminuit object of the final fit
+    """
+
+    def __init__(self, nevents, lifetime1=1.0, lifetime2=2.0, fraction=1.0, seed=None, batch=100000, queue_size=8,
+                 output=None, binned=False, bins=100, t_lolim=0.0, t_hilim=10.0, theta_lolim=0.0,
+                 theta_hilim=2*math.pi, warm=None):
+        self.nevents = nevents
+        self.settings = dict(t_lolim=t_lolim, t_hilim=t_hilim, theta_lolim=theta_lolim, theta_hilim=theta_hilim,
+                             lifetime1=lifetime1, lifetime2=lifetime2, fraction=fraction)
+        self.seed = seed
+        self.batch = batch
+        self.queue_size = queue_size
+        self.output = output
+        self.binned = binned
+        # On a single core the warm up fits cannot overlap with the generation, they only delay it
+        self.warm = (os.cpu_count() or 1) > 1 if warm is None else warm
+        self.hist = DecayHistogram(bins, bins, t_lolim, t_hilim, theta_lolim, theta_hilim)
+        self.timings = None
+
+    def nll(self, t, theta):
+        s = self.settings
+        if self.binned:
+            return BinnedNLL(self.hist)
+        return TimeAngleNLL(t, theta, s['t_lolim'], s['t_hilim'], s['theta_lolim'], s['theta_hilim'])
+
+    def receive(self, queue, producer):
+        while True:
+            try:
+                item = queue.get(timeout=POLL)
+                break
+            except Empty:
+                if producer.exitcode is None:
+                    continue
+            # The producer has exited, anything it put before exiting is already in the queue
+            try:
+                item = queue.get(timeout=POLL)
+                break
+            except Empty:
+                raise PipelineError('The producer exited with code {} before the end of the stream'.format(
+                                    producer.exitcode))
+        if isinstance(item, PipelineError):
+            raise item
+        return item
+
+    def run(self, fitter, x=(0.5, 1.0, 2.0)):
+        start = time.perf_counter()
+        queue = multiprocessing.Queue(self.queue_size)
+        producer = multiprocessing.Process(target=_produce, args=(self.settings, self.nevents, self.batch, self.seed,
+                                                                  queue, self.output), daemon=True)
+        producer.start()
+        t = np.empty(self.nevents)
+        theta = np.empty(self.nevents)
+        x = np.array(x, dtype=float)
+        errors = None
+        received = 0
+        warm_at = max(self.batch, self.nevents // 10)
+        wait = 0.0
+        warm_time = 0.0
+        try:
+            while True:
+                before = time.perf_counter()
+                item = self.receive(queue, producer)
+                wait += time.perf_counter() - before
+                if not isinstance(item, tuple):
+                    generate = item
+                    break
+                n = len(item[0])
+                t[received:received + n] = item[0]
+                theta[received:received + n] = item[1]
+                self.hist.fill(item[0], item[1])
+                received += n
+                if self.warm and warm_at <= received < self.nevents:
+                    # Warm up fit on the events received so far, while the producer keeps generating
+                    before = time.perf_counter()
+                    m = fitter.minimise(self.nll(t[:received], theta[:received]), x, errors)
+                    x = fitter.values(m)
+                    errors = fitter.errors(m)
+                    warm_time += time.perf_counter() - before
+                    warm_at = 2*received
+        except BaseException:
+            # The producer may be blocked on the full queue, so it cannot be joined
+            producer.terminate()
+            raise
+        finally:
+            producer.join()
+        if received != self.nevents:
+            raise PipelineError('Received {} of {} events'.format(received, self.nevents))
+        before = time.perf_counter()
+        m = fitter.minimise(self.nll(t, theta), x, errors)
+        fit = time.perf_counter() - before
+        self.t, self.theta = t, theta
+        self.timings = dict(generate=generate, wait=wait, warm=warm_time, fit=fit, total=time.perf_counter() - start)
+        return m
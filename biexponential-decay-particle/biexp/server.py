@@ -0,0 +1,230 @@
+"""
+Fit server, a long lived asyncio service answering fit, scan and error requests for the NLL models, so tools do not
+pay Python start up, imports, parsing and cold fits for every lifetime fit.
+
+The protocol is one JSON object per line in both directions, over a Unix or TCP socket. Every request carries an id,
+which its response echoes, so one connection can keep several requests in flight:
+
+    {"id": 1, "op": "fit", "file": "data.txt", "model": "angle", "x": [0.5, 1.0, 2.0]}
+    {"id": 2, "op": "scan", "file": "data.txt", "model": "angle", "points": [[0.5, 1.0, 2.0], ...]}
+    {"id": 3, "op": "error", "file": "data.txt", "model": "angle", "x": [...], "idx": 1}
+    {"id": 4, "op": "cancel", "target": 3}
+    {"id": 5, "op": "stats"}
+
+CPU work runs in a process pool. Every worker keeps an LRU cache of the NLL models of recently used datasets, keyed
+by file path and modification time, so a dataset is parsed and prepared once per worker. The NLL models are
+memoized, so repeated scan and error requests at the same parameter points are answered without evaluating them.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import asyncio
+import collections
+import concurrent.futures
+import json
+import os
+import signal
+import socket
+import time
+import numpy as np
+
+class ServerError(Exception):
+    """ An exception class for the fit server """
+    pass
+
+#=======================================POOL WORKER==========================================
+
+# NLL change ending a fit and largest number of minimisations of a fit. With a fraction on its bound successive
+# minima differ by rounding only, so a zero threshold never ends the fit
+THRESHOLD = 1e-6
+MAX_LOOPS = 20
+
+# Per worker LRU cache of NLL models and fitters, keyed by (path, mtime, model)
+_cache = collections.OrderedDict()
+_cache_size = 8
+
+def _initWorker(cache_size):
+    global _cache_size
+    _cache_size = cache_size
+
+def _dataset(filename, model):
+    from biexp import Minuit, TimeMinuit, TimeAngleNLL, TimeNLL
+    from biexp.memo import MemoizedObjective
+    key = (os.path.abspath(filename), os.path.getmtime(filename), model)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    data = np.loadtxt(filename, ndmin=2)
+    if model == 'time':
+        entry = MemoizedObjective(TimeNLL(data[:, 0])), TimeMinuit.default(THRESHOLD), (0.0,)
+    elif model == 'angle':
+        entry = MemoizedObjective(TimeAngleNLL(data[:, 0], data[:, 1])), Minuit.default(THRESHOLD), ()
+    else:
+        raise ServerError('Invalid model {}'.format(model))
+    _cache[key] = entry
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+    return entry
+
+def runRequest(request):
+    """ Run one fit, scan or error request in the worker and return the JSON serialisable result """
+    nll, fitter, fixed = _dataset(request['file'], request.get('model', 'angle'))
+    x = np.array(request.get('x', [0.5, 1.0, 2.0]), dtype=float)
+    before = nll.stats()
+    if request['op'] == 'fit':
+        m = fitter.minimiseLoop(nll, x, *fixed, max_loops=MAX_LOOPS)
+        result = dict(values=fitter.values(m).tolist(), errors=fitter.errors(m).tolist(),
+                      fval=m.fval, nevents=len(nll.t))
+    elif request['op'] == 'scan':
+        result = dict(values=[float(nll(*point, *fixed)) for point in request['points']])
+    elif request['op'] == 'error':
+        proper = type(fitter)(0.5, fitter.fraction_bnd, fitter.tau1_bnd, fitter.tau2_bnd, 'nll')
+        result = dict(error=float(proper.properErrorFinder(nll, int(request['idx']), x, *fixed)))
+    else:
+        raise ServerError('Invalid operation {}'.format(request['op']))
+    after = nll.stats()
+    result['cache'] = dict(hits=after['hits'] - before['hits'], misses=after['misses'] - before['misses'])
+    return result
+
+#=========================================SERVER=============================================
+
+class FitServer(object):
+    """
+    Class for the asyncio fit server.
+
+    Properties:
+    workers(int)           -   number of worker processes
+    cache_size(int)        -   number of datasets cached per worker
+    pending(dict)          -   in flight asyncio tasks by (connection, request id)
+    latencies(deque)       -   latencies of the recently completed requests
+
+    Methods:
+    * serveUnix            -   serve on a Unix socket
+    * serveTCP             -   serve on a TCP host and port
+    * stats                -   queue depth, counters and latency statistics
+    """
+
+    def __init__(self, workers=None, cache_size=8):
+        self.workers = workers or os.cpu_count()
+        self.cache_size = cache_size
+        self.pool = None
+        self.pending = {}
+        self.latencies = collections.deque(maxlen=1000)
+        self.counts = collections.Counter()
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1e3
+        lookups = self.counts['nll_hits'] + self.counts['nll_misses']
+        return dict(queue_depth=len(self.pending), workers=self.workers, completed=self.counts['completed'],
+                    failed=self.counts['failed'], cancelled=self.counts['cancelled'],
+                    nll_cache=dict(hits=self.counts['nll_hits'], misses=self.counts['nll_misses'],
+                                   hit_rate=self.counts['nll_hits'] / lookups if lookups else 0.0),
+                    latency_ms=dict(mean=float(latencies.mean()) if len(latencies) else None,
+                                    p50=float(np.percentile(latencies, 50)) if len(latencies) else None,
+                                    p95=float(np.percentile(latencies, 95)) if len(latencies) else None))
+
+    async def handleRequest(self, key, request, writer):
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.pool, runRequest, request)
+            response = dict(id=request.get('id'), ok=True, result=result)
+            self.counts['completed'] += 1
+            self.counts['nll_hits'] += result['cache']['hits']
+            self.counts['nll_misses'] += result['cache']['misses']
+        except asyncio.CancelledError:
+            # A request already running in a worker cannot be interrupted, its result is discarded
+            response = dict(id=request.get('id'), ok=False, error='cancelled')
+            self.counts['cancelled'] += 1
+        except Exception as e:
+            response = dict(id=request.get('id'), ok=False, error='{}: {}'.format(type(e).__name__, e))
+            self.counts['failed'] += 1
+        finally:
+            self.pending.pop(key, None)
+            self.latencies.append(time.perf_counter() - start)
+        await self.send(writer, response)
+
+    def finished(self, task, key, rid, writer):
+        # A request cancelled before it started never runs handleRequest, so answer it here
+        if task.cancelled():
+            self.pending.pop(key, None)
+            self.counts['cancelled'] += 1
+            if not writer.is_closing():
+                writer.write((json.dumps(dict(id=rid, ok=False, error='cancelled')) + '\n').encode())
+
+    async def send(self, writer, response):
+        writer.write((json.dumps(response) + '\n').encode())
+        await writer.drain()
+
+    async def handleConnection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await self.send(writer, dict(id=None, ok=False, error='invalid JSON'))
+                    continue
+                op = request.get('op')
+                if op == 'stats':
+                    await self.send(writer, dict(id=request.get('id'), ok=True, result=self.stats()))
+                elif op == 'cancel':
+                    task = self.pending.get((id(writer), request.get('target')))
+                    if task is not None:
+                        task.cancel()
+                    await self.send(writer, dict(id=request.get('id'), ok=task is not None))
+                elif (id(writer), request.get('id')) in self.pending:
+                    await self.send(writer, dict(id=request.get('id'), ok=False, error='duplicate request id'))
+                else:
+                    key = (id(writer), request.get('id'))
+                    task = asyncio.ensure_future(self.handleRequest(key, request, writer))
+                    task.add_done_callback(lambda task, key=key, rid=request.get('id'): self.finished(task, key, rid, writer))
+                    self.pending[key] = task
+        finally:
+            writer.close()
+
+    async def serve(self, start):
+        self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=_initWorker,
+                                                           initargs=(self.cache_size,))
+        stopped = []
+        try:
+            server = await start(self.handleConnection)
+            # SIGTERM closes the server, so the pool workers are shut down with it rather than left running
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: stopped.append(True) or server.close())
+            async with server:
+                try:
+                    await server.serve_forever()
+                except asyncio.CancelledError:
+                    if not stopped:
+                        raise
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+    def serveUnix(self, path):
+        asyncio.run(self.serve(lambda handler: asyncio.start_unix_server(handler, path)))
+
+    def serveTCP(self, host, port):
+        asyncio.run(self.serve(lambda handler: asyncio.start_server(handler, host, port)))
+
+#=========================================CLIENT=============================================
+
+def request(address, payload, timeout=None):
+    """ Send one request to a fit server at a Unix socket path or a (host, port) pair and return its response """
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    with sock:
+        sock.connect(address)
+        payload = dict(payload)
+        payload.setdefault('id', 0)
+        sock.sendall((json.dumps(payload) + '\n').encode())
+        with sock.makefile('r') as f:
+            return json.loads(f.readline())
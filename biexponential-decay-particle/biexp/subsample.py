@@ -0,0 +1,98 @@
+"""
+CoarseToFine, a class for fitting very large event files on a schedule of growing random subsamples, so most migrad
+iterations are spent on cheap NLL evaluations and only the last ones run over every event.
+
+The events are shuffled once and every stage fits the first n events of the shuffled order, so the subsamples are
+nested views of one array. Each stage is warm started from the previous one, with the step sizes scaled to the
+expected errors of the larger sample.
+
+A stage is stopped, and the sample grown, once migrad's estimated distance to the subsample minimum (the EDM) is
+small compared to the statistical distance between the subsample and full sample minima. For a fraction p of the
+events that distance is sqrt(1 - p) subsample standard deviations, so refining a subsample further than precision
+times that only fits its own fluctuations. The last stage is one migrad over every event with the default tolerance,
+so the final parameters and errors are those of the full fit; the subsample stages stand in for the repeated
+minimisations of minimiseLoop, which the full fit would otherwise run over every event.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import time
+import numpy as np
+
+class SubsampleError(Exception):
+    """ An exception class for CoarseToFine """
+    pass
+
+
+class CoarseToFine(object):
+    """
+    Class for coarse to fine subsample fitting.
+
+    Properties:
+    fitter(Minuit)           -   minimiser of the full fit, also used for every stage
+    schedule(tuple)          -   increasing fractions of the events fitted before the full sample
+    precision(float)         -   stage stopping distance, in statistical distances to the full sample minimum
+    min_events(int)          -   stages with fewer events are skipped
+    stages(list)             -   events, parameters, NLL calls and time of every stage of the last fit
+
+    Methods:
+    * stageTolerance         -   migrad tolerance of a stage fitting a fraction of the events
+    * fit                    -   fit the NLL through the schedule, returning the iminuit object of the full fit
+    * cost                   -   fraction of the event evaluations spent on the subsamples
+    """
+
+    def __init__(self, fitter, schedule=(0.01, 0.1), precision=0.5, min_events=1000, seed=None):
+        if list(schedule) != sorted(schedule) or not all(0 < p < 1 for p in schedule):
+            raise SubsampleError('The schedule must be increasing fractions between 0 and 1')
+        self.fitter = fitter
+        self.schedule = tuple(schedule)
+        self.precision = precision
+        self.min_events = min_events
+        self.seed = seed
+        self.stages = None
+
+    def stageTolerance(self, fraction):
+        # Migrad stops at EDM < 0.002 tol errordef, and the NLL rises by errordef z^2 at z standard deviations
+        z = self.precision * math.sqrt(1 - fraction)
+        return z**2 / 0.002
+
+    def fit(self, nll, x):
+        nevents = len(nll.t)
+        shuffled = nll.subset(np.random.default_rng(self.seed).permutation(nevents))
+        x = np.array(x, dtype=float)
+        errors = None
+        previous = None
+        self.stages = []
+        for fraction in self.schedule:
+            n = int(round(fraction * nevents))
+            if n < self.min_events:
+                continue
+            if errors is not None:
+                errors = errors * math.sqrt(previous / n)
+            start = time.perf_counter()
+            m = self.fitter.create(shuffled.subset(slice(0, n)), x, errors)
+            m.tol = self.stageTolerance(n / nevents)
+            m.migrad()
+            x = self.fitter.values(m)
+            errors = self.fitter.errors(m)
+            # A parameter at its limit has no error estimate, so it keeps the default step size
+            errors = np.where(errors > 0, errors, self.fitter.error_size)
+            self.stages.append(dict(nevents=n, x=x, calls=m.fmin.nfcn, seconds=time.perf_counter() - start))
+            previous = n
+        if errors is not None:
+            errors = errors * math.sqrt(previous / nevents)
+        start = time.perf_counter()
+        m = self.fitter.minimise(nll, x, errors)
+        self.stages.append(dict(nevents=nevents, x=self.fitter.values(m),
+                                calls=m.fmin.nfcn, seconds=time.perf_counter() - start))
+        return m
+
+    def cost(self):
+        # NLL calls weighted by the number of events they ran over
+        work = np.array([stage['nevents'] * stage['calls'] for stage in self.stages], dtype=float)
+        return work[:-1].sum() / work.sum()
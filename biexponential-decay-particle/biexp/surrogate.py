@@ -0,0 +1,165 @@
+"""
+NLLSurrogate, a class for serving NLL profiles, error crossings and profile plots from cubic spline surrogates, so
+they are not rescanned with the full NLL every time.
+
+For every parameter the NLL profile through the minimum (the other parameters fixed at the minimum, as draw_profile)
+is evaluated on an adaptive design: intervals are bisected until the spline through the evaluated points predicts the
+NLL at every new midpoint within the tolerance. A few extra true evaluations at random points then check the finished
+surrogate against the same tolerance: the points that miss it become knots, their intervals are refined again and new
+random points are checked, until every check passes or the point budget is spent (a SurrogateError). The knots are
+saved with the fit result and the splines rebuilt on load.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages (scipy.interpolate and matplotlib are only imported when first used)
+import numpy as np
+
+PARAMETERS = ['fraction', 'tau1', 'tau2']
+
+class SurrogateError(Exception):
+    """ An exception class for NLLSurrogate """
+    pass
+
+
+class NLLSurrogate(object):
+    """
+    Class for spline surrogates of the NLL profiles through the minimum.
+
+    Properties:
+    x(array)               -   parameters at the minimum
+    fmin(float)            -   NLL at the minimum
+    ranges(list)           -   (lo, hi) range of every profile
+    knots(list)            -   evaluated parameter values of every profile
+    values(list)           -   true NLL at the knots
+    error_bound(array)     -   largest |surrogate - NLL| of every profile on its last validation points, within
+                               tol + rtol*(NLL - fmin) of build at each of them
+    evaluations(int)       -   number of true NLL evaluations spent
+
+    Methods:
+    * build                -   evaluate the adaptive design and validate the splines, refining them until they
+                               meet the tolerance
+    * refine               -   bisect the given intervals of one profile until the spline predicts their midpoints
+    * profile              -   surrogate NLL of one parameter profile
+    * crossing             -   parameter values where a profile crosses fmin + level (asymmetric errors)
+    * error                -   mean distance from the minimum to the crossings, the one found if the other is outside
+                               the range of the profile (nan without any)
+    * drawProfile          -   plot one profile, like iminuit draw_profile
+    * save, load           -   write and read the knots as a .npz file
+    """
+
+    def __init__(self, x, fmin, ranges):
+        self.x = np.array(x, dtype=float)
+        self.fmin = float(fmin)
+        self.ranges = [tuple(map(float, r)) for r in ranges]
+        self.knots = [None]*len(self.x)
+        self.values = [None]*len(self.x)
+        self.splines = [None]*len(self.x)
+        self.error_bound = np.full(len(self.x), np.nan)
+        self.evaluations = 0
+
+    def evaluate(self, f, i, v, fixed):
+        point = self.x.copy()
+        point[i] = v
+        self.evaluations += 1
+        return f(*point, *fixed)
+
+    def spline(self, knots, values):
+        from scipy.interpolate import CubicSpline
+        return CubicSpline(knots, values)
+
+    def build(self, f, fixed=(), tol=1e-3, rtol=1e-4, initial=9, max_points=513, nvalidate=5, seed=0):
+        # The tolerance is absolute near the minimum and relative to the rise of the NLL far from it, so the error
+        # crossings within a few units of fmin are good to about tol
+        rng = np.random.default_rng(seed)
+        for i, (lo, hi) in enumerate(self.ranges):
+            knots = np.linspace(lo, hi, initial)
+            values = np.array([self.evaluate(f, i, v, fixed) for v in knots])
+            if not np.all(np.isfinite(values)):
+                raise SurrogateError('The NLL of {} is not finite over {}'.format(PARAMETERS[i], (lo, hi)))
+            pending = range(len(knots) - 1)
+            while True:
+                knots, values = self.refine(f, i, knots, values, pending, fixed, tol, rtol, max_points)
+                spline = self.spline(knots, values)
+                check = rng.uniform(lo, hi, nvalidate)
+                check = check[~np.isin(check, knots)]
+                truth = np.array([self.evaluate(f, i, v, fixed) for v in check])
+                errors = np.abs(spline(check) - truth)
+                self.error_bound[i] = errors.max(initial=0.0)
+                failed = errors > tol + rtol*np.abs(truth - self.fmin)
+                if not failed.any():
+                    break
+                if len(knots) + len(check) > max_points:
+                    raise SurrogateError('The surrogate of {} misses the tolerance by up to {:g} with {} points'.format(
+                        PARAMETERS[i], self.error_bound[i], len(knots)))
+                # The checked points are true evaluations, so they become knots, and the intervals on either side of
+                # a failed one are refined again
+                knots, values = np.append(knots, check), np.append(values, truth)
+                order = np.argsort(knots)
+                knots, values = knots[order], values[order]
+                position = np.searchsorted(knots, check[failed])
+                pending = sorted(set(position - 1) | set(position))
+            self.knots[i] = knots
+            self.values[i] = values
+            self.splines[i] = spline
+        return self
+
+    def refine(self, f, i, knots, values, pending, fixed, tol, rtol, max_points):
+        knots, values = list(knots), list(values)
+        while pending and len(knots) < max_points:
+            spline = self.spline(knots, values)
+            new = []
+            for j in pending:
+                mid = 0.5*(knots[j] + knots[j + 1])
+                value = self.evaluate(f, i, mid, fixed)
+                if abs(spline(mid) - value) > tol + rtol*abs(value - self.fmin):
+                    new.append(mid)
+                knots.append(mid)
+                values.append(value)
+            order = np.argsort(knots)
+            knots = list(np.array(knots)[order])
+            values = list(np.array(values)[order])
+            # Only the intervals around a failed midpoint are refined again
+            pending = sorted(set(j for mid in new for j in (knots.index(mid) - 1, knots.index(mid))))
+        return np.array(knots), np.array(values)
+
+    def profile(self, i, v):
+        if self.splines[i] is None:
+            raise SurrogateError('The surrogate of {} has not been built'.format(PARAMETERS[i]))
+        return self.splines[i](v)
+
+    def crossing(self, i, level=0.5):
+        roots = self.splines[i].solve(self.fmin + level, extrapolate=False)
+        below, above = roots[roots < self.x[i]], roots[roots > self.x[i]]
+        return (below.max() if len(below) else np.nan, above.min() if len(above) else np.nan)
+
+    def error(self, i, level=0.5):
+        distances = np.abs(np.array(self.crossing(i, level)) - self.x[i])
+        # nan for a parameter the NLL does not constrain within the range
+        return np.nan if np.all(np.isnan(distances)) else np.nanmean(distances)
+
+    def drawProfile(self, i, bound=None, bins=100):
+        import matplotlib.pyplot as plt
+        lo, hi = self.ranges[i] if bound is None else bound
+        v = np.linspace(max(lo, self.ranges[i][0]), min(hi, self.ranges[i][1]), bins)
+        plt.plot(v, self.profile(i, v))
+        plt.xlabel(PARAMETERS[i])
+
+    def save(self, filename):
+        np.savez(filename, x=self.x, fmin=self.fmin, ranges=np.array(self.ranges), error_bound=self.error_bound,
+                 **{'knots{}'.format(i): k for i, k in enumerate(self.knots)},
+                 **{'values{}'.format(i): v for i, v in enumerate(self.values)})
+
+    @staticmethod
+    def load(filename):
+        with np.load(filename) as f:
+            surrogate = NLLSurrogate(f['x'], f['fmin'], f['ranges'])
+            surrogate.error_bound = f['error_bound']
+            for i in range(len(surrogate.x)):
+                surrogate.knots[i] = f['knots{}'.format(i)]
+                surrogate.values[i] = f['values{}'.format(i)]
+                surrogate.splines[i] = surrogate.spline(surrogate.knots[i], surrogate.values[i])
+        return surrogate
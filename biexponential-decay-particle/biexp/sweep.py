@@ -0,0 +1,258 @@
+"""
+Sweep, a scheduler for generate and fit studies over a grid of generator settings (lifetimes, fraction, number of
+events, seed) and fit variants (decay time only or decay time and angle model, unbinned or binned, with or without the
+proper errors), replacing the hand edited settings of singleToy in part1.py.
+
+The study is a dependency graph of nodes:
+* generate   -   a sharded sample of one generator setting (see generate)
+* histogram  -   the DecayHistogram of a sample with the binning of a binned fit
+* fit        -   the minimiseLoop fit of one variant to a sample or its histogram
+* error      -   the properErrorFinder errors of every parameter at the minimum of a fit
+
+Every node is keyed by a hash of its settings and of the keys of the nodes it depends on, and its artifacts are kept
+in its own directory of the cache, with a node.json result written last. A node found in the cache is not run again,
+so a sample generated once is reused by every fit variant, and re-running a grown grid only runs the new nodes. The
+nodes whose dependencies are complete run concurrently on a process pool.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+import numpy as np
+from .fitter import DEFAULT_BOUNDS, PARAMETERS
+
+RESULT = 'node.json'
+
+# Generator settings of part1.py, the grid overrides any of them
+GENERATOR = dict(nevents=10000, lifetime1=1.0, lifetime2=2.0, fraction=1.0, seed=0, t_lolim=0.0, t_hilim=10.0,
+                 theta_lolim=0.0, theta_hilim=2*math.pi)
+VARIANT = dict(model='angle', binned=False, bins=100, errors=False)
+
+class SweepError(Exception):
+    """ An exception class for Sweep """
+    pass
+
+#=======================================NODE WORKERS=========================================
+
+def _fitter(params, threshold=0.0):
+    from .fitter import Minuit, TimeMinuit
+    fitter = TimeMinuit if params['model'] == 'time' else Minuit
+    return fitter(threshold, *params['bounds'], 'nll')
+
+def _nll(params, inputs):
+    from .generate import readGenerated
+    from .histogram import DecayHistogram
+    from .models import BinnedNLL, TimeAngleNLL, TimeNLL
+    if params['binned']:
+        return BinnedNLL(DecayHistogram.load(os.path.join(inputs['histogram'], 'histogram.npz'))), ()
+    s = params['generator']
+    t, theta = readGenerated(inputs['generate'])
+    if params['model'] == 'time':
+        return TimeNLL(t, s['t_lolim'], s['t_hilim'], s['theta_lolim'], s['theta_hilim']), (0.0,)
+    return TimeAngleNLL(t, theta, s['t_lolim'], s['t_hilim'], s['theta_lolim'], s['theta_hilim']), ()
+
+def _generateNode(params, inputs, outdir):
+    from .generate import generate
+    s = params['generator']
+    manifest = generate(outdir, s['nevents'], 1, s['seed'], s['lifetime1'], s['lifetime2'], s['fraction'],
+                        s['t_lolim'], s['t_hilim'], s['theta_lolim'], s['theta_hilim'], processes=1)
+    return dict(nevents=manifest['nevents'], sha256=[entry['sha256'] for entry in manifest['segments']])
+
+def _histogramNode(params, inputs, outdir):
+    from .generate import iterSegments
+    from .histogram import DecayHistogram
+    s = params['generator']
+    hist = DecayHistogram(params['bins'], params['bins'], s['t_lolim'], s['t_hilim'], s['theta_lolim'], s['theta_hilim'])
+    for t, theta in iterSegments(inputs['generate']):
+        hist.fill(t, theta)
+    hist.save(os.path.join(outdir, 'histogram.npz'))
+    return dict(entries=int(hist.entries), filled=int(np.count_nonzero(hist.counts)))
+
+def _fitNode(params, inputs, outdir):
+    nll, fixed = _nll(params, inputs)
+    fitter = _fitter(params, params['threshold'])
+    m = fitter.minimiseLoop(nll, params['x'], *fixed)
+    return dict(values=fitter.values(m).tolist(), errors=fitter.errors(m).tolist(),
+                fval=m.fval, valid=bool(m.fmin.is_valid))
+
+def _errorNode(params, inputs, outdir):
+    nll, fixed = _nll(params, inputs)
+    with open(os.path.join(inputs['fit'], RESULT)) as f:
+        x = np.array(json.load(f)['result']['values'])
+    bounds = np.array(params['bounds'], dtype=float)
+    if np.any(x < bounds[:, 0] + 1e-3) or np.any(x > bounds[:, 1] - 1e-3):
+        # The proper error scan of a parameter on its bound, or of the lifetime of an empty component, never reaches
+        # the +0.5 level
+        return dict(errors=[None]*len(PARAMETERS), skipped='a parameter is on its bound')
+    proper = _fitter(params, 0.5)
+    return dict(errors=[float(proper.properErrorFinder(nll, i, x.copy(), *fixed)) for i in range(len(PARAMETERS))])
+
+NODES = dict(generate=_generateNode, histogram=_histogramNode, fit=_fitNode, error=_errorNode)
+
+def _runNode(task):
+    """ Run one node into its artifact directory and return its result """
+    kind, key, params, inputs, outdir = task
+    os.makedirs(outdir, exist_ok=True)
+    start = time.perf_counter()
+    result = NODES[kind](params, inputs, outdir)
+    record = dict(kind=kind, key=key, params=params, result=result, seconds=time.perf_counter() - start)
+    # Written last and atomically, so a node.json on disk always describes complete artifacts
+    tmp = os.path.join(outdir, RESULT + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(record, f, indent=1)
+    os.replace(tmp, os.path.join(outdir, RESULT))
+    return record
+
+#==========================================SWEEP=============================================
+
+def grid(**axes):
+    """ Return the generator settings of every combination of the axes, e.g. grid(fraction=[0.0, 0.5, 1.0]) """
+    names = sorted(axes)
+    return [dict(GENERATOR, **dict(zip(names, values))) for values in itertools.product(*[axes[n] for n in names])]
+
+
+class Sweep(object):
+    """
+    Class for the generate and fit sweep scheduler.
+
+    Properties:
+    cache_dir(str)         -   directory holding one artifact directory per node
+    processes(int)         -   number of worker processes, 1 runs every node in this process
+    bounds(tuple)          -   fraction, tau1 and tau2 ranges of the fits
+    x(list)                -   starting fraction, tau1 and tau2 of the fits
+    threshold(float)       -   NLL change below which the minimiseLoop of a fit stops
+    nodes(dict)            -   kind, settings and dependencies of every node, by key
+    studies(list)          -   (generator settings, variant, fit key, error key) of every grid point and variant
+    computed, reused(list) -   keys of the nodes run and found in the cache by the last run
+    failed(dict)           -   error message of every failed or skipped node of the last run
+
+    Methods:
+    * add                  -   add the nodes of a grid of generator settings and fit variants
+    * pending              -   keys of the nodes not in the cache, in dependency order
+    * run                  -   run the pending nodes on the process pool
+    * results              -   one row per grid point and variant, read from the cache
+    """
+
+    def __init__(self, cache_dir, processes=None, bounds=DEFAULT_BOUNDS, x=(0.5, 1.0, 2.0),
+                 threshold=1e-6):
+        self.cache_dir = cache_dir
+        self.processes = processes or os.cpu_count() or 1
+        self.bounds = [list(bound) for bound in bounds]
+        self.x = [float(value) for value in x]
+        # With a fraction on its bound successive migrad minima differ by rounding only, so a zero threshold never stops
+        self.threshold = threshold
+        self.nodes = {}
+        self.studies = []
+        self.computed = []
+        self.reused = []
+        self.failed = {}
+
+    def node(self, kind, params, deps):
+        text = json.dumps([kind, params, sorted(deps.items())], sort_keys=True)
+        key = '{}-{}'.format(kind, hashlib.sha256(text.encode()).hexdigest()[:16])
+        self.nodes.setdefault(key, dict(kind=kind, params=params, deps=deps))
+        return key
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def cached(self, key):
+        return os.path.exists(os.path.join(self.path(key), RESULT))
+
+    def add(self, generators, variants):
+        for generator in generators:
+            generator = dict(GENERATOR, **generator)
+            data = self.node('generate', dict(generator=generator), {})
+            for variant in variants:
+                variant = dict(VARIANT, **variant)
+                if variant['model'] not in ('time', 'angle'):
+                    raise SweepError('Invalid model {}'.format(variant['model']))
+                if variant['binned'] and variant['model'] == 'time':
+                    raise SweepError('Binned fits need the decay angle, use the angle model')
+                deps = dict(generate=data)
+                if variant['binned']:
+                    deps = dict(histogram=self.node('histogram', dict(generator=generator, bins=variant['bins']), deps))
+                params = dict(generator=generator, model=variant['model'], binned=variant['binned'],
+                              bins=variant['bins'] if variant['binned'] else None, bounds=self.bounds, x=self.x,
+                              threshold=self.threshold)
+                fit = self.node('fit', params, deps)
+                error = self.node('error', params, dict(deps, fit=fit)) if variant['errors'] else None
+                self.studies.append((generator, variant, fit, error))
+        return self
+
+    def pending(self):
+        order = []
+        def visit(key):
+            if key in order or self.cached(key):
+                return
+            for dep in self.nodes[key]['deps'].values():
+                visit(dep)
+            order.append(key)
+        for key in self.nodes:
+            visit(key)
+        return order
+
+    def submit(self, pool, key):
+        node = self.nodes[key]
+        task = (node['kind'], key, node['params'], {name: self.path(dep) for name, dep in node['deps'].items()},
+                self.path(key))
+        if pool is None:
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(_runNode(task))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return pool.submit(_runNode, task)
+
+    def run(self):
+        waiting = self.pending()
+        self.reused = [key for key in self.nodes if key not in waiting]
+        self.computed = []
+        self.failed = {}
+        pool = concurrent.futures.ProcessPoolExecutor(self.processes) if self.processes > 1 else None
+        running = {}
+        try:
+            while waiting or running:
+                for key in list(waiting):
+                    deps = self.nodes[key]['deps'].values()
+                    if any(dep in self.failed for dep in deps):
+                        self.failed[key] = 'skipped, a dependency failed'
+                        waiting.remove(key)
+                    elif all(self.cached(dep) for dep in deps):
+                        running[self.submit(pool, key)] = key
+                        waiting.remove(key)
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    if future.exception() is not None:
+                        self.failed[key] = '{}: {}'.format(type(future.exception()).__name__, future.exception())
+                    else:
+                        self.computed.append(key)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return not self.failed
+
+    def result(self, key):
+        if key is None or not self.cached(key):
+            return None
+        with open(os.path.join(self.path(key), RESULT)) as f:
+            return json.load(f)['result']
+
+    def results(self):
+        rows = []
+        for generator, variant, fit, error in self.studies:
+            rows.append(dict(generator=generator, variant=variant, fit=self.result(fit), error=self.result(error),
+                             failed=self.failed.get(fit) or self.failed.get(error)))
+        return rows
@@ -0,0 +1,190 @@
+"""
+Autotuning of the NLL evaluation, a module for benchmarking the NLL evaluation configurations on this machine and
+keeping the fastest one in a per machine profile file that the NLL models load automatically.
+
+An evaluation configuration has four settings:
+* backend    -   'numpy', the plain expression of the component model, or 'fused', which precomputes the angular
+                 factor of every component once per dataset and evaluates exp(-t/tau) in place in reused buffers
+* chunk      -   number of events per evaluation chunk, None for every event at once
+* threads    -   number of threads the chunks are spread over (numpy releases the GIL inside its loops)
+* dtype      -   'float64' or 'float32' event arrays of the fused backend, the sum is always accumulated in float64
+
+A configuration is only recorded when it does not change the physics: its NLL must agree with the default evaluation,
+and a fit with it must reproduce the parameters and errors of the default fit within the validation tolerances. The
+float32 configurations are only benchmarked on request, as they can pass both checks on the synthetic dataset and
+still move the errors of a real dataset beyond the tolerances.
+
+The configuration of an NLL model is, from lowest to highest priority: the defaults, the profile entry nearest to
+the number of events, the BIEXP_EVAL environment variable (a JSON object, or 'default' to ignore the profile) and
+the config argument of the model.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages (json and platform are only imported when a profile is read or written)
+import functools
+import os
+import time
+import numpy as np
+
+DEFAULT_CONFIG = dict(backend='numpy', chunk=None, threads=1, dtype='float64')
+
+# Profiles of another version were tuned without the fit check and are ignored
+PROFILE_VERSION = 2
+
+class TuningError(Exception):
+    """ An exception class for the autotuner """
+    pass
+
+#==========================================PROFILE===========================================
+
+def machine():
+    """ Return the fingerprint of this machine a profile belongs to """
+    import platform
+    return dict(host=platform.node(), cpus=os.cpu_count(), arch=platform.machine(), system=platform.system())
+
+def profilePath():
+    # One profile per host, so a home directory shared between machines keeps one profile for each
+    if os.environ.get('BIEXP_PROFILE'):
+        return os.environ['BIEXP_PROFILE']
+    import platform
+    return os.path.join(os.path.expanduser('~'), '.biexp', 'profile-{}.json'.format(platform.node()))
+
+@functools.lru_cache(maxsize=4)
+def _readProfile(filename, mtime):
+    import json
+    with open(filename) as f:
+        return json.load(f)
+
+def readProfile(filename=None):
+    """ Return the profile of this machine, or None when there is none """
+    filename = filename or profilePath()
+    if not os.path.exists(filename):
+        return None
+    profile = _readProfile(filename, os.path.getmtime(filename))
+    # A profile copied from another machine does not describe this one
+    if profile.get('machine') != machine() or profile.get('version') != PROFILE_VERSION:
+        return None
+    return profile
+
+def writeProfile(profile, filename=None):
+    import json
+    filename = filename or profilePath()
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    tmp = filename + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(profile, f, indent=1)
+    os.replace(tmp, filename)
+
+def evaluationConfig(nevents, config=None):
+    """ Return the evaluation configuration of an NLL model over nevents events """
+    result = dict(DEFAULT_CONFIG)
+    env = os.environ.get('BIEXP_EVAL')
+    if env != 'default':
+        profile = readProfile()
+        if profile and profile['entries']:
+            # The entry benchmarked on the dataset size nearest to this one, on a log scale
+            size = min(profile['entries'], key=lambda n: abs(np.log(int(n)) - np.log(max(nevents, 1))))
+            result.update(profile['entries'][size]['config'])
+        if env:
+            import json
+            result.update(json.loads(env))
+    if config:
+        result.update(config)
+    if result['backend'] not in ('numpy', 'fused') or result['dtype'] not in ('float64', 'float32'):
+        raise TuningError('Invalid evaluation configuration {}'.format(result))
+    return result
+
+#========================================BENCHMARKING========================================
+
+def candidates(max_threads=None, float32=False):
+    """ Return the evaluation configurations worth benchmarking on this machine, with float32 ones on request """
+    max_threads = max_threads or os.cpu_count() or 1
+    threads = sorted(set([1] + [2**k for k in range(1, 16) if 2**k < max_threads] + [max_threads]))
+    configs = [dict(DEFAULT_CONFIG)]
+    for chunk in [None, 2**14, 2**16, 2**18]:
+        for n in threads:
+            # Threads only share work between chunks
+            if n > 1 and chunk is None:
+                continue
+            if chunk is not None:
+                configs.append(dict(backend='numpy', chunk=chunk, threads=n, dtype='float64'))
+            for dtype in ['float64', 'float32'] if float32 else ['float64']:
+                configs.append(dict(backend='fused', chunk=chunk, threads=n, dtype=dtype))
+    return configs
+
+def _timeCall(nll, point, repeat):
+    nll(*point)
+    best = np.inf
+    for i in range(repeat):
+        start = time.perf_counter()
+        nll(*point)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def fitCheck(reference, nll, fitter, x=(0.5, 1.0, 2.0), tolerances=None):
+    """
+    Fit with nll and return the largest parameter deviation (in reference standard deviations) and the largest relative
+    error deviation from the reference fit, and whether both are within the validation tolerances.
+    """
+    from .validation import TOLERANCES
+    tolerances = tolerances or TOLERANCES
+    m = fitter.minimise(nll, np.array(x))
+    values, errors = fitter.values(m), fitter.errors(m)
+    ref_values, ref_errors = reference
+    sigma = np.where(ref_errors > 0, ref_errors, np.inf)
+    parameter = float(np.max(np.abs(values - ref_values) / sigma))
+    error = float(np.max(np.abs(errors - ref_errors) / sigma))
+    return parameter, error, parameter <= tolerances['parameter'] and error <= tolerances['error']
+
+def autotune(nevents, repeat=5, tolerance=0.01, seed=0, configs=None, filename=None, save=True):
+    """
+    Benchmark the evaluation configurations on a synthetic dataset of nevents events and record the fastest one
+    whose NLL agrees with the default evaluation within tolerance (in NLL units, the errors are at +0.5) and whose fit
+    passes fitCheck against the default fit. The fit check runs on the fastest candidates first, until one passes.
+    Return the profile entry.
+    """
+    from .fitter import Minuit
+    from .models import TimeAngleNLL
+    from .pdf import MyPDF
+    generator = MyPDF(0.0, 10.0, 0.0, 2*np.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(seed))
+    t, theta = generator.next(nevents)
+    points = [(0.5, 1.0, 2.0), (0.2, 0.5, 3.0), (0.8, 1.5, 1.2)]
+    reference = TimeAngleNLL(t, theta, config=DEFAULT_CONFIG)
+    expected = np.array([reference(*point) for point in points])
+    results = []
+    for config in configs or candidates():
+        nll = TimeAngleNLL(t, theta, config=config)
+        deviation = float(np.max(np.abs([nll(*point) - value for point, value in zip(points, expected)])))
+        seconds = _timeCall(nll, points[0], repeat)
+        # accepted stays None for the candidates the fit check is not needed for
+        results.append(dict(config=config, seconds=seconds, deviation=deviation, parameter=None, error=None,
+                            accepted=None if deviation <= tolerance else False))
+    fitter = Minuit.default()
+    m = fitter.minimise(reference, np.array(points[0]))
+    fit = (fitter.values(m), fitter.errors(m))
+    best = None
+    for result in sorted(results, key=lambda result: result['seconds']):
+        if result['accepted'] is False:
+            continue
+        if result['config'] == DEFAULT_CONFIG:
+            result['parameter'], result['error'], result['accepted'] = 0.0, 0.0, True
+        else:
+            nll = TimeAngleNLL(t, theta, config=result['config'])
+            result['parameter'], result['error'], result['accepted'] = fitCheck(fit, nll, fitter, points[0])
+        if result['accepted']:
+            best = result
+            break
+    if best is None:
+        raise TuningError('No configuration passed the NLL and fit checks')
+    baseline = results[0]['seconds'] if results[0]['config'] == DEFAULT_CONFIG else None
+    entry = dict(config=best['config'], seconds=best['seconds'], baseline=baseline, results=results,
+                 date=time.strftime('%Y-%m-%d %H:%M:%S'))
+    if save:
+        profile = readProfile(filename) or dict(machine=machine(), version=PROFILE_VERSION, entries={})
+        profile['entries'][str(nevents)] = entry
+        writeProfile(profile, filename)
+    return entry
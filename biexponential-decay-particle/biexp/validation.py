@@ -0,0 +1,381 @@
+"""
+Validation, a harness checking every accelerated NLL evaluation, error finder and sampler against the reference
+behaviour, so speed work cannot silently change the physics results.
+
+References and candidates:
+* NLL        -   the dblquad normalised nll of part2.py and part3.py, against the Gauss-Legendre grid and every
+                 evaluation configuration of the autotuner (including the machine profile). Compared on the NLL at
+                 a few points and on the fitted parameters and MINUIT errors
+* errors     -   Minuit.properErrorFinder, against the MINUIT errors and the analytic Hessian, both on the grid NLL
+                 so only the error finder differs. properErrorFinder is one sided and profiles the other parameters,
+                 the others are parabolic, so they agree to the asymmetry of the NLL (a few percent at 1k events)
+* sampler    -   the scalar box sampler of part1.py, against the vectorized MyPDF and the sharded generator. All are
+                 tested against the model with a chi2 of the decay time and angle marginals, and the candidates
+                 against the reference with two sample KS tests
+
+The references are verbatim copies of the part1.py, part2.py and part3.py code the library replaced.
+
+Every check records the reference and candidate values, their difference, the tolerance and the speed up of the
+candidate, and the harness fails when any tolerance is exceeded.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages (scipy.integrate is only imported by the dblquad references, and scipy.stats by the sampler
+# checks)
+import math
+import os
+import tempfile
+import time
+import numpy
+import numpy as np
+from .components import ComponentModel
+from .models import TimeAngleNLL, TimeNLL
+from .fitter import PARAMETERS
+from .pdf import MyPDF, PDFError
+from .tuning import DEFAULT_CONFIG
+
+# Bundled data files of the repository, decay times only
+BUNDLED = ['MuonDecayEvent.txt', 'ExtraMuonDecayEvent.txt', 'MoreExtraMuonDecayEvent.txt']
+
+# Largest differences accepted: NLL in NLL units (errors are at +0.5), parameters in reference standard deviations,
+# errors relative to the reference error (the same error definition, or parabolic against properErrorFinder), and
+# the smallest accepted p-value of a distribution test
+TOLERANCES = dict(nll=0.01, parameter=0.05, error=0.05, error_finder=0.1, pvalue=0.001)
+
+# NLL evaluation candidates, None is the machine profile of the autotuner
+CANDIDATES = dict(grid=DEFAULT_CONFIG,
+                  fused=dict(DEFAULT_CONFIG, backend='fused', chunk=2**16),
+                  fused32=dict(DEFAULT_CONFIG, backend='fused', chunk=2**16, dtype='float32'),
+                  profile=None)
+
+class ValidationError(Exception):
+    """ An exception class for Validation """
+    pass
+
+#====================================BASELINE REFERENCES=====================================
+
+# Verbatim copies of the scalar box sampler of part1.py (MyPDF, renamed, without its plotting and writing methods) and
+# of the nll functions of part2.py and part3.py, as they were before the biexp library. Their data were module globals,
+# here they are bound by the functions returning them, which also import scipy.integrate as the scripts did.
+
+class BaselinePDF:
+    """
+    Class for generating random events with decay time and angle distributions according to the PDF described in the report.
+    
+    Properties:
+    lifetime1(float)       -  particle first lifetime
+    lifetime2(float)       -  particle second lifetime
+
+    t_lolimit(float)       -  lower limit of interval for decay time
+    t_hilimit(float)       -  higher limit of interval for decay time
+
+    theta_lolimit(float)   -  lower limit of interval for decay angle
+    theta_hilimit(float)   -  higher limit of interval for decay angle
+
+    shape1(function)       - PDF of first decay component, PDF1
+    shape2(function)       - PDF of second decay component, PDF2
+
+    max1(float)            - maximum value of PDF1
+    max2(float)            - maximum value of PDF2
+
+    fraction(float)        - fraction of PDF1 being the total PDF of the decay
+    
+    Methods:
+    * maxVal               - return the maximum value of the total PDF of the decay
+    * normalise            - normalise the given pdf
+    * evaluate             - evaluate the normalised pdf at give decay time and angle 
+    * next                 - draw N random number from distribution
+    * drawSample           - draw a random sample of N events from a pdf using box method
+    * plotShape            - plot histograms of the decay time and angle distributions of the generated data
+    * writeData            - write out decay times and decay angles generated
+    """
+    
+     # Constructor
+    def __init__(self, t_lolim, t_hilim, theta_lolim, theta_hilim, lifetime1, lifetime2, fraction):
+        self.lifetime1 = lifetime1
+        self.lifetime2 = lifetime2
+        self.t_lolimit = t_lolim
+        self.t_hilimit = t_hilim
+        self.theta_lolimit = theta_lolim
+        self.theta_hilimit = theta_hilim
+        self.shape1 = lambda t, theta: (1+math.cos(theta)**2)*(math.exp(-t/lifetime1))
+        self.shape2 = lambda t, theta: (3*math.sin(theta)**2)*(math.exp(-t/lifetime2))
+        self.max1 = self.shape1(t_lolim, theta_lolim)
+        self.max2 = self.shape2(t_lolim, theta_lolim)
+        self.fraction = fraction
+  
+    # Return the maximum value of the total PDF of the decay
+    def maxVal( self ) :
+        return self.fraction * self.max1 + (1-self.fraction) * self.max2
+    
+    def normalise( self, pdf ) :
+        import scipy.integrate as integrate
+        if pdf == 1:
+            return integrate.dblquad( self.shape1, self.theta_lolimit, self.theta_hilimit, lambda theta: self.t_lolimit, lambda theta: self.t_hilimit)[0]
+        elif pdf == 2:
+            return integrate.dblquad( self.shape2, self.theta_lolimit, self.theta_hilimit, lambda theta: self.t_lolimit, lambda theta: self.t_hilimit)[0]
+        else:
+            raise PDFError('Invalid PDF')
+ 
+    # Evaluate method (normalised)
+    def evaluate( self, t, theta, norm1, norm2, pdf_type):
+        pdf1 = self.fraction * (self.shape1(t, theta) / norm1)
+        pdf2 = (1-self.fraction) * (self.shape2(t, theta) / norm2)
+        if pdf_type == 'all':
+            return pdf1 + pdf2
+        elif pdf_type == '1':
+            return pdf1
+        elif pdf_type == '2':
+            return pdf2
+        else:
+            raise PDFError('Invalid PDF type')
+
+    # Draw N random number from distribution
+    def next(self, nevents):
+        data  = self.drawSample(self, self.t_lolimit, self.t_hilimit, self.theta_lolimit, self.theta_hilimit, nevents)
+        return data
+
+    @staticmethod
+    # To draw a random sample of N events from a pdf using box method
+    def drawSample(self, t_lolim, t_hilim, theta_lolim, theta_hilim, nevents):
+        times = []
+        thetas = []
+        for i in range(nevents):
+            ythrow = 1.
+            yval=0.
+            norm1, norm2 = self.normalise(1), self.normalise(2)
+            while ythrow > yval:
+                tthrow = numpy.random.uniform(t_lolim, t_hilim)
+                thetathrow = numpy.random.uniform(theta_lolim, theta_hilim)
+                ythrow = self.maxVal() * numpy.random.uniform()
+                yval =  self.evaluate(tthrow, thetathrow, norm1, norm2, 'all')
+            times.append(tthrow)
+            thetas.append(thetathrow)
+        return (times, thetas)
+
+
+
+def baselineTimeNLL(t):
+    """ Return the nll of part2.py bound to the decay times t, called as nll(fraction, tau1, tau2, theta) """
+    import scipy.integrate as integrate
+    # Define Negative Log Likelihood function
+    def nll(fraction, tau1, tau2, theta):
+        shape1 = lambda t, theta: (1+math.cos(theta)**2)*(math.exp(-t/tau1))
+        shape2 = lambda t, theta: (3*math.sin(theta)**2)*(math.exp(-t/tau2))
+        norm1 = integrate.dblquad( shape1, 0.0, 2*np.pi, lambda theta: 0.0, lambda theta: 10.0)[0]
+        norm2 = integrate.dblquad( shape2, 0.0, 2*np.pi, lambda theta: 0.0, lambda theta: 10.0)[0]
+        pdf1 = fraction*(1+np.cos(theta)**2)*(np.exp(-t/tau1))/norm1
+        pdf2 = (1-fraction)*(3*np.sin(theta)**2)*(np.exp(-t/tau2))/norm2
+        pdf = pdf1 + pdf2
+        return np.sum(-np.log(pdf))
+    return nll
+
+def baselineNLL(t, theta):
+    """ Return the nll of part3.py bound to the decay times and angles, called as nll(fraction, tau1, tau2) """
+    import scipy.integrate as integrate
+    # Define Negative Log Likelihood function
+    def nll(fraction, tau1, tau2):
+        shape1 = lambda t, theta: (1+math.cos(theta)**2)*(math.exp(-t/tau1))
+        shape2 = lambda t, theta: (3*math.sin(theta)**2)*(math.exp(-t/tau2))
+        norm1 = integrate.dblquad( shape1, 0.0, 2*np.pi, lambda theta: 0.0, lambda theta: 10.0)[0]
+        norm2 = integrate.dblquad( shape2, 0.0, 2*np.pi, lambda theta: 0.0, lambda theta: 10.0)[0]
+        pdf1 = fraction*(1+np.cos(theta)**2)*(np.exp(-t/tau1))/norm1
+        pdf2 = (1-fraction)*(3*np.sin(theta)**2)*(np.exp(-t/tau2))/norm2
+        pdf = pdf1 + pdf2
+        return np.sum(-np.log(pdf))
+    return nll
+
+#=======================================MODEL BINNING========================================
+
+def binProbabilities(model, fraction, taus, edges, axis):
+    """ Return the probability of every decay time (axis 0) or decay angle (axis 1) bin, integrated with the model grid """
+    norms = model.normalise(taus)
+    fractions = model.fractions(fraction)
+    probabilities = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if axis == 0:
+            window = model.window(lo, hi)
+        else:
+            window = ComponentModel(model.shapes, model.t_lolimit, model.t_hilimit, lo, hi, model.acceptance,
+                                    model.t_order, model.theta_order)
+        probabilities.append(np.dot(fractions, window.normalise(taus) / norms))
+    return np.array(probabilities)
+
+def _timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+class Validation(object):
+    """
+    Class for the accuracy versus speed validation harness.
+
+    Properties:
+    tolerances(dict)       -   largest accepted differences, see TOLERANCES
+    candidates(dict)       -   NLL evaluation configurations checked against the dblquad reference
+    error_events(int)      -   largest sample the proper error finder is run on (its cost grows with the sample)
+    sampler_events(int)    -   largest sample drawn with the scalar reference sampler (two dblquads per event)
+    results(list)          -   one entry per check
+    passed(bool)           -   True when every check is within its tolerance
+
+    Methods:
+    * nllChecks            -   compare the NLL values, fitted parameters and errors of every candidate evaluation
+    * errorChecks          -   compare the error finders with properErrorFinder
+    * samplerChecks        -   compare the samplers with MyPDF.drawSample and the model
+    * run                  -   run every check on the bundled and synthetic samples
+    """
+
+    def __init__(self, tolerances=None, error_events=2000, candidates=('grid', 'fused', 'profile'),
+                 sampler_events=10000):
+        self.tolerances = dict(TOLERANCES, **(tolerances or {}))
+        self.candidates = {name: CANDIDATES[name] for name in candidates}
+        self.error_events = error_events
+        self.sampler_events = sampler_events
+        self.results = []
+
+    @property
+    def passed(self):
+        return all(result['passed'] for result in self.results)
+
+    def record(self, check, sample, candidate, quantity, reference, value, difference, tolerance, speedup=None):
+        passed = bool(difference <= tolerance)
+        self.results.append(dict(check=check, sample=sample, candidate=candidate, quantity=quantity,
+                                 reference=float(reference), value=float(value), difference=float(difference),
+                                 tolerance=tolerance, passed=passed, speedup=speedup))
+        return passed
+
+    def recordTest(self, check, sample, candidate, quantity, pvalue, speedup=None):
+        # Distribution tests fail below the smallest accepted p-value
+        alpha = self.tolerances['pvalue']
+        self.results.append(dict(check=check, sample=sample, candidate=candidate, quantity=quantity, reference=alpha,
+                                 value=float(pvalue), difference=float(pvalue), tolerance=alpha,
+                                 passed=bool(pvalue >= alpha), speedup=speedup))
+
+    def skip(self, check, sample, candidate, reason):
+        self.results.append(dict(check=check, sample=sample, candidate=candidate, quantity=reason, reference=np.nan,
+                                 value=np.nan, difference=np.nan, tolerance=np.nan, passed=True, speedup=None))
+
+#=========================================NLL CHECKS=========================================
+
+    def makeNLL(self, t, theta, **options):
+        if theta is None:
+            return TimeNLL(t, **options)
+        return TimeAngleNLL(t, theta, **options)
+
+    def identified(self, values, fitter, edge=1e-3):
+        # The lifetime of an empty component is not constrained by the data, so it is not compared
+        lo, hi = fitter.fraction_bnd
+        return [True, values[0] > lo + edge, values[0] < hi - edge]
+
+    def nllChecks(self, sample, t, theta, fitter, x=(0.5, 1.0, 2.0)):
+        fixed = (0.0,) if theta is None else ()
+        points = [(0.5, 1.0, 2.0), (0.3, 0.8, 2.5), (0.7, 1.4, 1.6)]
+        reference = baselineTimeNLL(t) if theta is None else baselineNLL(t, theta)
+        expected, ref_time = _timed(lambda: [reference(*point, *fixed) for point in points])
+        ref_fit, ref_fit_time = _timed(fitter.minimise, reference, np.array(x))
+        ref_values = fitter.values(ref_fit)
+        mask = self.identified(ref_values, fitter)
+        for name, config in self.candidates.items():
+            nll = self.makeNLL(t, theta, config=config)
+            nll(*points[0], *fixed)
+            values, cand_time = _timed(lambda: [nll(*point, *fixed) for point in points])
+            deviation = np.max(np.abs(np.subtract(values, expected)))
+            self.record('nll', sample, name, 'NLL', expected[0], values[0], deviation, self.tolerances['nll'],
+                        ref_time / cand_time)
+            fit, fit_time = _timed(fitter.minimise, nll, np.array(x))
+            for i, param in enumerate(PARAMETERS):
+                if not mask[i]:
+                    self.skip('fit', sample, name, param + ' not constrained')
+                    continue
+                sigma = ref_fit.errors[param]
+                if sigma > 0:
+                    self.record('fit', sample, name, param, ref_fit.values[param], fit.values[param],
+                                abs(fit.values[param] - ref_fit.values[param]) / sigma, self.tolerances['parameter'],
+                                ref_fit_time / fit_time)
+                    self.record('fit', sample, name, param + ' error', sigma, fit.errors[param],
+                                abs(fit.errors[param] - sigma) / sigma, self.tolerances['error'])
+        return ref_fit
+
+#========================================ERROR CHECKS========================================
+
+    def errorChecks(self, sample, t, theta, fitter):
+        fixed = (0.0,) if theta is None else ()
+        nll = self.makeNLL(t, theta, config=DEFAULT_CONFIG)
+        m, fit_time = _timed(fitter.minimise, nll, np.array([0.5, 1.0, 2.0]))
+        x = fitter.values(m)
+        mask = self.identified(x, fitter)
+        if not all(mask):
+            # With an empty component the proper error scan of its lifetime never reaches the +0.5 level
+            self.skip('errors', sample, 'all', 'a component is empty')
+            return
+        proper = type(fitter)(0.5, fitter.fraction_bnd, fitter.tau1_bnd, fitter.tau2_bnd, 'nll')
+        hessian, hessian_time = _timed(nll.covariance, *x, *fixed)
+        hessian = np.sqrt(np.diag(hessian[0]))
+        for i, param in enumerate(PARAMETERS):
+            reference, ref_time = _timed(proper.properErrorFinder, nll, i, x.copy(), *fixed)
+            for name, value, seconds in [('migrad', m.errors[param], fit_time), ('hessian', hessian[i], hessian_time)]:
+                self.record('errors', sample, name, param + ' error', reference, value,
+                            abs(value - reference) / reference, self.tolerances['error_finder'], ref_time / seconds)
+
+#=======================================SAMPLER CHECKS=======================================
+
+    def samplerChecks(self, sample, nevents, seed, fraction=0.5, lifetimes=(1.0, 2.0), bins=50):
+        import scipy.stats as stats
+        from .generate import generate, readGenerated
+        # The scalar sampler draws from the global numpy random state
+        numpy.random.seed(seed)
+        nref = min(nevents, self.sampler_events)
+        reference = BaselinePDF(0.0, 10.0, 0.0, 2*np.pi, lifetimes[0], lifetimes[1], fraction)
+        (ref_t, ref_theta), ref_time = _timed(reference.next, nref)
+        ref_t, ref_theta = np.array(ref_t), np.array(ref_theta)
+        vectorized = MyPDF(0.0, 10.0, 0.0, 2*np.pi, lifetimes[0], lifetimes[1], fraction,
+                           rng=np.random.default_rng(seed + 1))
+        (vec_t, vec_theta), vec_time = _timed(vectorized.next, nevents)
+        with tempfile.TemporaryDirectory() as outdir:
+            manifest = generate(outdir, nevents, 4, seed + 2, lifetimes[0], lifetimes[1], fraction, processes=1)
+            cand_t, cand_theta = readGenerated(outdir)
+        # Speed ups per event, as the reference sample may be smaller
+        per_event = ref_time / nref
+        samples = [('box', ref_t, ref_theta, None), ('drawSample', vec_t, vec_theta, per_event * nevents / vec_time),
+                   ('sharded', cand_t, cand_theta, per_event * nevents / manifest['seconds'])]
+        model = vectorized.model
+        for name, t, theta, speedup in samples:
+            for axis, values, lo, hi in [(0, t, 0.0, 10.0), (1, theta, 0.0, 2*np.pi)]:
+                edges = np.linspace(lo, hi, bins + 1)
+                expected = binProbabilities(model, fraction, list(lifetimes), edges, axis)
+                observed = np.histogram(values, edges)[0]
+                pvalue = stats.chisquare(observed, expected * observed.sum() / expected.sum()).pvalue
+                self.recordTest('sampler', sample, name, ['t', 'theta'][axis] + ' chi2 p-value', pvalue, speedup)
+        for name, t, theta, speedup in samples[1:]:
+            for quantity, a, b in [('t KS p-value', ref_t, t), ('theta KS p-value', ref_theta, theta)]:
+                self.recordTest('sampler', sample, name, quantity, stats.ks_2samp(a, b).pvalue)
+
+#===========================================RUN==============================================
+
+    def run(self, fitters, data_dir=None, sizes=(1000, 10000, 100000), seed=0):
+        """ Run every check; fitters is the (time, angle) pair of Minuit classes of part2.py and part3.py """
+        time_fitter, angle_fitter = fitters
+        data_dir = data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+        for filename in BUNDLED:
+            path = os.path.join(data_dir, filename)
+            if not os.path.exists(path):
+                self.skip('data', filename, 'all', 'file not found')
+                continue
+            t = np.loadtxt(path, ndmin=2)[:, 0]
+            self.nllChecks(filename, t, None, time_fitter)
+            if len(t) <= self.error_events:
+                self.errorChecks(filename, t, None, time_fitter)
+        for nevents in sizes:
+            name = 'synthetic {}'.format(nevents)
+            generator = MyPDF(0.0, 10.0, 0.0, 2*np.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(seed + nevents))
+            t, theta = generator.next(nevents)
+            self.nllChecks(name, t, theta, angle_fitter)
+            if nevents <= self.error_events:
+                self.errorChecks(name, t, theta, angle_fitter)
+            self.samplerChecks(name, nevents, seed + nevents)
+        return self.passed
@@ -0,0 +1,87 @@
+"""
+SortedEvents, a class keeping a dataset sorted by decay time, so the fit can be repeated over many decay time windows
+(systematics studies varying t_lo and t_hi) without filtering the events into copies or reloading the file.
+
+The events are sorted once. A window [t_lo, t_hi] is then the contiguous slice between two binary searches, and its
+NLL model is built over views of the sorted arrays, with the component model normalised over that window only.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import time
+import numpy as np
+from .components import ComponentModel
+from .models import TimeAngleNLL, TimeNLL
+
+class WindowError(Exception):
+    """ An exception class for SortedEvents """
+    pass
+
+
+class SortedEvents(object):
+    """
+    Class for a dataset sorted by decay time.
+
+    Properties:
+    t(array)                     -   decay times, sorted
+    theta(array or None)         -   decay angles in the same order, None for a decay time only dataset (part2.py)
+    weights(array or None)       -   per event weights in the same order
+    order(array)                 -   index of every sorted event in the original dataset
+    model(ComponentModel)        -   decay shape components, the window of every fit replaces its decay time interval
+    config(dict)                 -   evaluation configuration handed to the NLL models
+
+    Methods:
+    * bounds                     -   slice of the sorted events inside a window
+    * window                     -   NLL model of the events inside a window, normalised over the window
+    * scan                       -   fit every window, warm starting each fit from the previous one
+    """
+
+    def __init__(self, t, theta=None, weights=None, theta_lolim=0.0, theta_hilim=2*np.pi, model=None, config=None):
+        t = np.asarray(t, dtype=float)
+        self.order = np.argsort(t, kind='stable')
+        self.t = t[self.order]
+        self.theta = None if theta is None else np.asarray(theta, dtype=float)[self.order]
+        self.weights = None if weights is None else np.asarray(weights, dtype=float)[self.order]
+        if model is None:
+            model = ComponentModel(theta_lolim=theta_lolim, theta_hilim=theta_hilim)
+        self.model = model
+        self.config = config
+
+    def bounds(self, t_lo, t_hi):
+        if not t_lo < t_hi:
+            raise WindowError('Invalid decay time window [{}, {}]'.format(t_lo, t_hi))
+        return slice(np.searchsorted(self.t, t_lo, 'left'), np.searchsorted(self.t, t_hi, 'right'))
+
+    def window(self, t_lo, t_hi):
+        s = self.bounds(t_lo, t_hi)
+        if s.stop <= s.start:
+            raise WindowError('No events in the decay time window [{}, {}]'.format(t_lo, t_hi))
+        model = self.model.window(t_lo, t_hi)
+        weights = None if self.weights is None else self.weights[s]
+        if self.theta is None:
+            return TimeNLL(self.t[s], t_lo, t_hi, model.theta_lolimit, model.theta_hilimit, weights, model,
+                           config=self.config)
+        return TimeAngleNLL(self.t[s], self.theta[s], t_lo, t_hi, model.theta_lolimit, model.theta_hilimit, weights,
+                            model, config=self.config)
+
+    def scan(self, fitter, windows, x=(0.5, 1.0, 2.0)):
+        results = []
+        x = np.array(x, dtype=float)
+        errors = None
+        for t_lo, t_hi in windows:
+            start = time.perf_counter()
+            nll = self.window(t_lo, t_hi)
+            m = fitter.minimise(nll, x, errors)
+            values = fitter.values(m)
+            errors = fitter.errors(m)
+            results.append(dict(window=(t_lo, t_hi), nevents=len(nll.t), values=values, errors=errors, fval=m.fval,
+                                valid=m.fmin.is_valid, seconds=time.perf_counter() - start))
+            # Neighbouring windows have close minima, but a failed fit is a poor starting point
+            if m.fmin.is_valid:
+                x = values
+            errors = np.where(errors > 0, errors, fitter.error_size)
+        return results
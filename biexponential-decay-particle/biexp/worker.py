@@ -0,0 +1,19 @@
+"""
+Worker state, the per process state of the multiprocessing pool workers of Bootstrap, MultiStart and JointNLL.
+
+The pool initialiser sets it once in every worker process, so the NLL models, events and fitters a task needs are sent
+to each worker once instead of being pickled with every task. A run in the calling process sets it the same way.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# State of this process, read by the task functions
+state = {}
+
+def initWorker(values):
+    """ Pool initialiser, replace the state of this process by the dict of values """
+    state.clear()
+    state.update(values)
@@ -0,0 +1,70 @@
+"""
+Tests of the vectorized batch lifetime fit against known answers.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp.batch import BatchError, BatchLifetimeFit, packDatasets
+
+TAUS = (0.5, 1.0, 2.0, 3.0)
+
+def truncatedNLL(data, lo, hi):
+    # Single lifetime NLL of exp(-t/tau) normalised over [lo, hi]
+    return lambda s: np.sum(data)/s + len(data)*math.log(s*(math.exp(-lo/s) - math.exp(-hi/s)))
+
+def test_pack_datasets():
+    values, offsets = packDatasets([[1.0, 2.0], [3.0], [4.0, 5.0, 6.0]])
+    assert np.array_equal(values, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]) and np.array_equal(offsets, [0, 2, 3])
+    with pytest.raises(BatchError):
+        packDatasets([[1.0], []])
+
+def test_fit_without_window_is_the_sample_mean():
+    rng = np.random.default_rng(3)
+    datasets = [rng.exponential(tau, 20000) for tau in TAUS]
+    fit = BatchLifetimeFit(*packDatasets(datasets))
+    tau, errors, nll = fit.fit()
+    # Without a window the maximum likelihood lifetime is the mean, with error tau/sqrt(n)
+    assert fit.converged.all()
+    assert tau == pytest.approx([np.mean(data) for data in datasets], rel=1e-8)
+    assert errors == pytest.approx(tau / np.sqrt(20000), rel=1e-6)
+    assert nll == pytest.approx([truncatedNLL(data, 0.0, np.inf)(t) for data, t in zip(datasets, tau)], rel=1e-10)
+
+def test_fit_in_a_window_solves_the_truncated_likelihood():
+    rng = np.random.default_rng(4)
+    # Exponential events inside [1, 5] only, drawn by inverting the truncated distribution
+    datasets = []
+    for tau in TAUS:
+        u = rng.uniform(size=5000)
+        datasets.append(1.0 - tau*np.log(1 - u*(1 - math.exp(-4.0/tau))))
+    fit = BatchLifetimeFit(*packDatasets(datasets), t_lolim=1.0, t_hilim=5.0)
+    tau, errors, nll = fit.fit()
+    assert fit.converged.all()
+    assert np.all(np.abs(tau - TAUS) < 4*errors)
+    for data, tau_i in zip(datasets, tau):
+        # The derivative of the truncated NLL vanishes at the fitted lifetime
+        f = truncatedNLL(data, 1.0, 5.0)
+        assert (f(tau_i*(1 + 1e-6)) - f(tau_i*(1 - 1e-6))) / (2e-6*tau_i) == pytest.approx(0.0, abs=1e-3)
+
+def test_events_outside_the_window_are_masked():
+    rng = np.random.default_rng(5)
+    datasets = [rng.exponential(tau, 20000) for tau in TAUS]
+    fit = BatchLifetimeFit(*packDatasets(datasets), t_lolim=1.0, t_hilim=5.0)
+    inside = [data[(data >= 1.0) & (data <= 5.0)] for data in datasets]
+    assert fit.nevents.tolist() == [len(data) for data in inside]
+    assert fit.tsum == pytest.approx([np.sum(data) for data in inside], rel=1e-12)
+    # The events inside the window of the full exponentials fit to the same lifetime as the truncated samples
+    masked = fit.fit()[0]
+    assert masked == pytest.approx(BatchLifetimeFit(*packDatasets(inside), t_lolim=1.0, t_hilim=5.0).fit()[0], rel=1e-10)
+    with pytest.raises(BatchError):
+        BatchLifetimeFit(*packDatasets([[0.5, 6.0], [2.0]]), t_lolim=1.0, t_hilim=5.0)
@@ -0,0 +1,58 @@
+"""
+Tests of the bootstrap error estimation: weighted resamples, resampling modes and reproducibility across processes.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.bootstrap import Bootstrap, BootstrapError, _resample
+
+@pytest.fixture(scope='module')
+def nll():
+    np.random.seed(5)
+    return TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5).next(400))
+
+def fitter():
+    return Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+
+def test_weighted_nll_equals_resampled_events(nll):
+    index = np.random.default_rng(0).integers(0, len(nll.t), len(nll.t))
+    weights = np.bincount(index, minlength=len(nll.t)).astype(float)
+    resampled = TimeAngleNLL(nll.t[index], nll.theta[index])
+    assert nll.weighted(weights)(0.4, 1.1, 1.9) == pytest.approx(resampled(0.4, 1.1, 1.9), rel=1e-12)
+    assert nll.weights is None
+
+def test_modes_and_processes_give_the_same_refits(nll):
+    x = [0.5, 1.0, 2.0]
+    weights = Bootstrap(nll, fitter(), x, 3, seed=11, processes=1).run()
+    index = Bootstrap(nll, fitter(), x, 3, seed=11, processes=1, mode='index').run()
+    pooled = Bootstrap(nll, fitter(), x, 3, seed=11, processes=2).run()
+    assert weights.shape == (3, 3)
+    assert index == pytest.approx(weights, rel=1e-4)
+    assert np.array_equal(pooled, weights)
+    assert not np.array_equal(Bootstrap(nll, fitter(), x, 3, seed=12, processes=1).run(), weights)
+
+def test_errors_need_a_run(nll):
+    boot = Bootstrap(nll, fitter(), [0.5, 1.0, 2.0], 3)
+    with pytest.raises(BootstrapError):
+        boot.errors()
+    with pytest.raises(BootstrapError):
+        Bootstrap(nll, fitter(), [0.5, 1.0, 2.0], 3, mode='jackknife')
+
+def test_collapsed_resamples_draw_every_event(nll):
+    collapsed = TimeAngleNLL.collapse(np.round(nll.t, 1), np.round(nll.theta))
+    for mode in ['weights', 'index']:
+        resample = _resample(collapsed, 3, mode)
+        # The multiplicities of the distinct events are redrawn, so the resample stands for as many events
+        assert len(resample.t) == len(collapsed.t) and resample.weights.sum() == len(nll.t)
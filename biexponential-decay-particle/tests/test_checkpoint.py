@@ -0,0 +1,101 @@
+"""
+Tests of the checkpoints: atomic saving, and resuming scans, fits and bootstraps.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.bootstrap import Bootstrap
+from biexp.checkpoint import Checkpoint, CheckpointError, scan
+
+@pytest.fixture(scope='module')
+def nll():
+    return TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(3)).next(500))
+
+def fitter():
+    return Minuit(1e-6, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+
+def test_save_is_rate_limited_and_checks_the_kind(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'job.ckpt'), 'scan', interval=3600.0)
+    assert checkpoint.load() is None
+    assert not checkpoint.save(dict(values=[1.0]))
+    assert checkpoint.save(dict(values=[1.0]), force=True)
+    assert checkpoint.load() == dict(values=[1.0])
+    assert not os.path.exists(str(tmp_path / 'job.ckpt.tmp'))
+    with pytest.raises(CheckpointError):
+        Checkpoint(str(tmp_path / 'job.ckpt'), 'fit').load()
+
+def test_scan_resumes_the_remaining_points(tmp_path):
+    calls = []
+    def f(x, y):
+        calls.append((x, y))
+        return x + y
+    points = np.array([(i, 2.0*i) for i in range(6)])
+    checkpoint = Checkpoint(str(tmp_path / 'scan.ckpt'), 'scan', interval=0.0)
+    # A scan interrupted after three points
+    checkpoint.save(dict(points=points, values=[f(*point) for point in points[:3]]), force=True)
+    calls.clear()
+    assert scan(f, points, checkpoint) == [3.0*i for i in range(6)]
+    assert len(calls) == 3
+    checkpoint.save(dict(points=points[:2], values=[]), force=True)
+    with pytest.raises(CheckpointError):
+        scan(f, points, checkpoint)
+
+def test_fit_resumes_from_the_saved_minimum(tmp_path, nll):
+    m = fitter().minimiseLoop(nll, [0.5, 1.0, 2.0])
+    x = np.array([m.values['fraction'], m.values['tau1'], m.values['tau2']])
+    errors = np.array([m.errors['fraction'], m.errors['tau1'], m.errors['tau2']])
+    checkpoint = Checkpoint(str(tmp_path / 'fit.ckpt'), 'fit')
+    checkpoint.save(dict(x=x, errors=errors, ini_nll=m.fval), force=True)
+    resumed = fitter().minimiseLoop(nll, [0.1, 4.0, 4.0], checkpoint=checkpoint)
+    assert resumed.fval == pytest.approx(m.fval, abs=1e-4)
+    assert resumed.values['tau1'] == pytest.approx(m.values['tau1'], rel=1e-3)
+
+def test_bootstrap_resumes_the_remaining_resamples(tmp_path, nll):
+    x = [0.5, 1.0, 2.0]
+    full = Bootstrap(nll, fitter(), x, 4, seed=9, processes=1).run()
+    checkpoint = Checkpoint(str(tmp_path / 'boot.ckpt'), 'bootstrap')
+    # Two completed resamples, marked so that a refit of them would show
+    saved = [np.full(3, -1.0), np.full(3, -2.0)]
+    checkpoint.save(dict(entropy=np.random.SeedSequence(9).entropy, params=saved), force=True)
+    resumed = Bootstrap(nll, fitter(), x, 4, seed=9, processes=1).run(checkpoint)
+    assert np.array_equal(resumed[:2], saved)
+    assert np.array_equal(resumed[2:], full[2:])
+    # A completed bootstrap keeps every resample
+    assert np.array_equal(Bootstrap(nll, fitter(), x, 4, seed=9, processes=1).run(checkpoint), resumed)
+
+def test_completed_stages_are_not_run_again(tmp_path, nll):
+    calls = []
+    def counted(fraction, tau1, tau2):
+        calls.append(1)
+        return nll(fraction, tau1, tau2)
+    checkpoint = Checkpoint(str(tmp_path / 'fit.ckpt'), 'fit')
+    m = fitter().minimiseLoop(counted, [0.5, 1.0, 2.0], checkpoint=checkpoint)
+    calls.clear()
+    done = fitter().minimiseLoop(counted, [0.5, 1.0, 2.0], checkpoint=checkpoint)
+    assert calls == [] and done.fval == m.fval and done.fmin.is_valid == m.fmin.is_valid
+    assert [done.values[name] for name in ['fraction', 'tau1', 'tau2']] == [m.values['fraction'], m.values['tau1'], m.values['tau2']]
+    points = np.array([(0.5, 1.0, 2.0), (0.4, 1.0, 2.0)])
+    checkpoint = Checkpoint(str(tmp_path / 'scan.ckpt'), 'scan')
+    values = scan(counted, points, checkpoint)
+    calls.clear()
+    assert scan(counted, points, checkpoint) == values and calls == []
+    with pytest.raises(CheckpointError):
+        scan(counted, points[:1], checkpoint)
+    checkpoint = Checkpoint(str(tmp_path / 'error.ckpt'), 'error')
+    proper = Minuit(0.5, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+    x = np.array([m.values['fraction'], m.values['tau1'], m.values['tau2']])
+    error = proper.properErrorFinder(counted, 1, x.copy(), checkpoint=checkpoint)
+    calls.clear()
+    assert proper.properErrorFinder(counted, 1, x.copy(), checkpoint=checkpoint) == error and calls == []
@@ -0,0 +1,78 @@
+"""
+Tests of the component model: quadrature normalisation, fractions and generation from the model.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, PDFError, TimeAngleNLL
+from biexp.components import ComponentError, ComponentModel, cosShape, sinShape
+
+def flatShape(t, theta, tau):
+    return np.exp(-t/tau) * np.ones_like(theta)
+
+def test_grid_normalisation_matches_dblquad():
+    nll = TimeAngleNLL([1.0], [1.0])
+    reference = TimeAngleNLL([1.0], [1.0], normalisation='dblquad')
+    for taus in [(1.0, 2.0), (0.3, 4.5)]:
+        assert nll.normalise(*taus) == pytest.approx(reference.normalise(*taus), rel=1e-8)
+
+def test_window_normalisation_matches_dblquad():
+    import scipy.integrate as integrate
+    model = ComponentModel(acceptance=lambda t, theta: 1 - 0.05*t).window(1.0, 5.0)
+    taus = [0.8, 2.3]
+    norms = model.normalise(taus)
+    for i, tau in enumerate(taus):
+        shape = lambda theta, t: float(model.shape(i, np.array([t]), np.array([theta]), tau)[0])
+        expected = integrate.dblquad(shape, 1.0, 5.0, 0.0, 2*math.pi)[0]
+        assert norms[i] == pytest.approx(expected, rel=1e-8)
+
+def test_fractions_and_pdf_normalisation():
+    model = ComponentModel()
+    assert model.fractions(0.3) == pytest.approx([0.3, 0.7])
+    with pytest.raises(ComponentError):
+        model.fractions([0.3, 0.2])
+    t, theta, w = model.grid()
+    assert np.dot(w, model.pdf(t, theta, 0.3, [1.0, 2.0])) == pytest.approx(1.0, rel=1e-10)
+
+def test_generated_lifetime():
+    np.random.seed(6)
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.5, 2.0, 1.0).next(20000)
+    assert len(t) == len(theta) == 20000
+    assert np.all((t >= 0.0) & (t <= 10.0) & (theta >= 0.0) & (theta <= 2*math.pi))
+    # The mean decay time of exp(-t/tau) truncated at t = 10
+    expected = 1.5 - 10.0*math.exp(-10.0/1.5)/(1 - math.exp(-10.0/1.5))
+    assert abs(np.mean(t) - expected) < 4*1.5/math.sqrt(20000)
+
+def test_three_components_generate_and_fit():
+    model = ComponentModel(shapes=(cosShape, sinShape, flatShape))
+    assert model.parameters() == ['fraction1', 'fraction2', 'tau1', 'tau2', 'tau3']
+    with pytest.raises(PDFError):
+        MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, [0.3, 0.3], model=model)
+    truth = np.array([0.3, 0.3, 1.0, 2.0, 0.5])
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, [0.3, 0.3], model=model, lifetimes=[1.0, 2.0, 0.5],
+                     rng=np.random.default_rng(3)).next(20000)
+    nll = TimeAngleNLL(t, theta, model=model)
+    # The analytic gradient and Hessian run over every component
+    value, gradient, hessian = nll.derivatives(*truth)
+    assert value == pytest.approx(nll(*truth), rel=1e-12)
+    h = 1e-5
+    steps = h*np.eye(len(truth))
+    assert gradient == pytest.approx([(nll(*(truth + step)) - nll(*(truth - step))) / (2*h) for step in steps], abs=1e-3)
+    fitter = Minuit.default(model=model)
+    m = fitter.minimise(nll, [0.35, 0.25, 0.8, 1.8, 0.7])
+    assert m.fmin.is_valid
+    assert list(m.parameters) == model.parameters()
+    assert np.all(np.abs(fitter.values(m) - truth) < 3*fitter.errors(m))
+    cov, corr = nll.covariance(*fitter.values(m))
+    assert np.sqrt(np.diag(cov)) == pytest.approx(fitter.errors(m), rel=0.1)
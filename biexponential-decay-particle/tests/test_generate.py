@@ -0,0 +1,50 @@
+"""
+Tests of the sharded generation: reproducible segments, shard sizes and reading the sample back.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import MyPDF
+from biexp.generate import generate, iterSegments, readGenerated, readManifest, shardSizes
+
+def hashes(manifest):
+    return [segment['sha256'] for segment in manifest['segments']]
+
+def test_shard_sizes():
+    assert shardSizes(10, 3) == [4, 3, 3]
+    assert sum(shardSizes(150001, 4)) == 150001
+
+def test_samples_are_reproducible_across_processes(tmp_path):
+    serial = generate(str(tmp_path / 'serial'), 50000, 3, 7, chunk=20000, processes=1)
+    pooled = generate(str(tmp_path / 'pooled'), 50000, 3, 7, chunk=20000, processes=2)
+    assert hashes(serial) == hashes(pooled)
+    assert hashes(generate(str(tmp_path / 'other'), 50000, 3, 8, chunk=20000, processes=1)) != hashes(serial)
+    t, theta = readGenerated(str(tmp_path / 'serial'))
+    assert np.array_equal((t, theta), readGenerated(str(tmp_path / 'pooled')))
+    assert len(t) == readManifest(str(tmp_path / 'serial'))['nevents'] == 50000
+    assert [len(seg_t) for seg_t, seg_theta in iterSegments(str(tmp_path / 'serial'))] == shardSizes(50000, 3)
+    assert np.all((t >= 0.0) & (t <= 10.0) & (theta >= 0.0) & (theta <= 2*math.pi))
+
+def test_samples_do_not_depend_on_the_chunk_size(tmp_path):
+    # More events per shard than one block, so the shards are written in several chunks
+    reference = generate(str(tmp_path / 'large'), 150000, 2, 3, chunk=10**6, processes=1)
+    for name, chunk, processes in [('small', 1000, 1), ('pooled', 1000, 2)]:
+        assert hashes(generate(str(tmp_path / name), 150000, 2, 3, chunk=chunk, processes=processes)) == hashes(reference)
+
+def test_box_maximum_is_computed_once_per_shard(tmp_path, monkeypatch):
+    calls = []
+    maxVal = MyPDF.maxVal
+    monkeypatch.setattr(MyPDF, 'maxVal', lambda self: calls.append(1) or maxVal(self))
+    # Three blocks in each of two shards
+    generate(str(tmp_path / 'sample'), 400000, 2, 3, fraction=0.5, chunk=10**6, processes=1)
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+"""
+Tests of the streaming decay histograms: merging, saving, the generation histogram and headless plotting.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp.generate import generate, readGenerated, readHistogram
+from biexp.histogram import DecayHistogram, HistogramError, plotHistogram
+
+@pytest.fixture(scope='module')
+def sample():
+    rng = np.random.default_rng(2)
+    return rng.exponential(2.0, 3000), rng.uniform(0.0, 2*math.pi, 3000)
+
+def test_merge_equals_single_fill(sample):
+    t, theta = sample
+    whole = DecayHistogram(20, 10).fill(t, theta)
+    merged = DecayHistogram(20, 10).fill(t[:700], theta[:700]).merge(DecayHistogram(20, 10).fill(t[700:], theta[700:]))
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.entries == whole.entries == len(t)
+    assert whole.counts.sum() == np.count_nonzero(t <= 10.0)
+    expected = np.histogram2d(t, theta, bins=(20, 10), range=((0.0, 10.0), (0.0, 2*math.pi)))[0]
+    assert np.array_equal(whole.counts, expected)
+    with pytest.raises(HistogramError):
+        whole.merge(DecayHistogram(20, 20))
+
+def test_save_load_and_plot(tmp_path, sample):
+    hist = DecayHistogram(20, 10).fill(*sample)
+    hist.save(str(tmp_path / 'hist.npz'))
+    loaded = DecayHistogram.load(str(tmp_path / 'hist.npz'))
+    assert loaded.binning() == hist.binning()
+    assert np.array_equal(loaded.counts, hist.counts) and loaded.entries == hist.entries
+    plotHistogram(loaded, str(tmp_path / 'hist.png'))
+    assert os.path.getsize(str(tmp_path / 'hist.png')) > 0
+
+def test_generation_histogram_matches_the_sample(tmp_path):
+    generate(str(tmp_path), 30000, 2, 1, bins=25, processes=1)
+    t, theta = readGenerated(str(tmp_path))
+    assert np.array_equal(readHistogram(str(tmp_path)).counts, DecayHistogram(25, 25).fill(t, theta).counts)
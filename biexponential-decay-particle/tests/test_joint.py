@@ -0,0 +1,52 @@
+"""
+Tests of the joint fit of several datasets sharing the lifetimes.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import MyPDF, TimeAngleNLL, TimeNLL
+from biexp.joint import JointError, JointMinuit, JointNLL
+
+@pytest.fixture(scope='module')
+def terms():
+    angle = TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.3, rng=np.random.default_rng(11)).next(5000))
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.6, rng=np.random.default_rng(12)).next(5000)
+    return [('angle', angle), ('time', TimeNLL(t), (0.0,))]
+
+def test_joint_nll_is_the_sum(terms):
+    (name1, angle), (name2, time_nll, fixed) = terms
+    for mode in ['serial', 'thread', 'process']:
+        with JointNLL(terms, mode=mode, workers=2) as joint:
+            assert [name for name, p in joint.parameters] == ['tau1', 'tau2', 'fraction_angle', 'fraction_time']
+            assert joint.start(fraction_time=0.6).tolist() == [1.0, 2.0, 0.5, 0.6]
+            assert joint(1.1, 2.2, 0.4, 0.7) == pytest.approx(angle(0.4, 1.1, 2.2) + time_nll(0.7, 1.1, 2.2, 0.0), rel=1e-12)
+    with JointNLL(terms, private=(), mode='serial') as joint:
+        assert joint(0.4, 1.1, 2.2) == pytest.approx(angle(0.4, 1.1, 2.2) + time_nll(0.4, 1.1, 2.2, 0.0), rel=1e-12)
+
+def test_invalid_joint_nll(terms):
+    with pytest.raises(JointError):
+        JointNLL([terms[0], terms[0]])
+    with pytest.raises(JointError):
+        JointNLL(terms, private=('theta',))
+    with pytest.raises(JointError):
+        JointNLL(terms, mode='cluster')
+
+def test_joint_fit(terms):
+    other = TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.6, rng=np.random.default_rng(12)).next(5000))
+    with JointNLL([terms[0], ('other', other)], mode='serial') as joint:
+        fitter = JointMinuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll', joint.parameters)
+        m = fitter.minimise(joint, joint.start())
+    assert m.fmin.is_valid
+    for name, truth in [('tau1', 1.0), ('tau2', 2.0), ('fraction_angle', 0.3), ('fraction_other', 0.6)]:
+        assert m.values[name] == pytest.approx(truth, abs=4*m.errors[name])
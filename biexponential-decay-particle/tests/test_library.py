@@ -0,0 +1,54 @@
+"""
+Tests of the biexp library: side effect free imports, reading the data files and fitting a generated sample.
+
+Run with `python -m pytest tests` from the biexponential-decay-particle directory.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from biexp import Minuit, MyPDF, TimeAngleNLL, TimeNLL
+
+def test_import_loads_no_heavy_modules():
+    probe = ('import sys\n'
+             'import biexp\n'
+             'print([m for m in ("matplotlib", "scipy.integrate", "iminuit") if m in sys.modules])\n')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    assert out.strip() == '[]'
+
+def test_read_data_with_and_without_angles(tmp_path):
+    np.savetxt(tmp_path / 'both.txt', [[1.5, 0.5], [2.5, 1.0]])
+    np.savetxt(tmp_path / 'time.txt', [1.5, 2.5])
+    t, theta = Minuit.readData(str(tmp_path / 'both.txt'))
+    assert np.array_equal(t, [1.5, 2.5]) and np.array_equal(theta, [0.5, 1.0])
+    t, theta = Minuit.readData(str(tmp_path / 'time.txt'))
+    assert np.array_equal(t, [1.5, 2.5]) and np.array_equal(theta, [0.0, 0.0])
+    t, theta = Minuit.readData(os.path.join(ROOT, '..', 'MuonDecayEvent.txt'))
+    assert len(t) == len(theta) > 0 and not theta.any()
+
+def test_time_nll_is_time_angle_nll_at_fixed_angle():
+    t = np.array([0.5, 1.0, 3.0])
+    assert TimeNLL(t)(0.4, 1.0, 2.0, 0.3) == pytest.approx(TimeAngleNLL(t, np.full(3, 0.3))(0.4, 1.0, 2.0), rel=1e-12)
+
+def test_fit_recovers_generated_parameters():
+    np.random.seed(4)
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5).next(1000)
+    nll = TimeAngleNLL(t, theta)
+    fitter = Minuit.default()
+    assert [fitter.fraction_bnd, fitter.tau1_bnd, fitter.tau2_bnd] == [(0.0, 1), (0.0, 5.0), (0.0, 5.0)]
+    m = fitter.minimise(nll, [0.4, 1.2, 1.8])
+    assert m.fmin.is_valid
+    assert np.all(np.abs(fitter.values(m) - [0.5, 1.0, 2.0]) < 4*fitter.errors(m))
+    assert fitter.values(m).tolist() == [m.values['fraction'], m.values['tau1'], m.values['tau2']]
@@ -0,0 +1,98 @@
+"""
+Tests of the memoizing objective wrapper: cached values and derivatives, dataset identities and the LRU bound.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import pickle
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.components import ComponentModel
+from biexp.memo import MemoCache, MemoError, MemoizedObjective, datasetIdentity
+
+@pytest.fixture(scope='module')
+def events():
+    return MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(13)).next(2000)
+
+def test_values_and_derivatives_are_cached(events):
+    nll = TimeAngleNLL(*events)
+    memo = MemoizedObjective(nll)
+    assert memo(0.5, 1.0, 2.0) == nll(0.5, 1.0, 2.0)
+    assert memo(0.5, 1.0, 2.0) == nll(0.5, 1.0, 2.0)
+    assert memo.stats()['hits'] == 1 and memo.stats()['misses'] == 1
+    value, gradient, hessian = memo.derivatives(0.4, 1.0, 2.0)
+    assert np.array_equal(memo.gradient(0.4, 1.0, 2.0), gradient)
+    # The value at a point whose derivatives are cached is free
+    assert memo(0.4, 1.0, 2.0) == value and memo.stats()['hits'] == 3
+    assert memo.t is nll.t
+    with pytest.raises(MemoError):
+        MemoizedObjective(lambda x, y: x + y).derivatives(1.0, 2.0)
+
+def test_fit_is_unchanged(events):
+    nll = TimeAngleNLL(*events)
+    fitter = Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+    plain = fitter.minimise(nll, [0.5, 1.0, 2.0])
+    memo = fitter.minimise(MemoizedObjective(nll), [0.5, 1.0, 2.0])
+    assert list(memo.parameters) == ['fraction', 'tau1', 'tau2']
+    assert memo.fval == plain.fval and list(memo.values) == list(plain.values)
+
+def test_identity_and_shared_cache(events):
+    t, theta = events
+    cache = MemoCache(maxsize=2)
+    first = MemoizedObjective(TimeAngleNLL(t, theta), cache)
+    second = MemoizedObjective(TimeAngleNLL(t[:1000], theta[:1000]), cache)
+    assert datasetIdentity(TimeAngleNLL(t, theta)) == first.identity != second.identity
+    assert first(0.5, 1.0, 2.0) != second(0.5, 1.0, 2.0)
+    assert cache.stats()['misses'] == 2
+    first(0.3, 1.0, 2.0)
+    assert cache.stats()['evictions'] == 1 and cache.stats()['size'] == 2
+    copy = pickle.loads(pickle.dumps(first))
+    assert copy.identity == first.identity and copy.stats()['size'] == 0
+    assert copy(0.5, 1.0, 2.0) == first.f(0.5, 1.0, 2.0)
+
+def test_array_objectives_of_the_scripts():
+    # nll_minim.py and chi2_minim.py call their objectives with one parameter array
+    calls = []
+    def chi(param):
+        calls.append(1)
+        return param[0]**2 + param[1]
+    memo = MemoizedObjective(chi)
+    assert memo(np.array([2.0, 1.0])) == 5.0 and memo(np.array([2.0, 1.0])) == 5.0
+    assert memo(np.array([2.0, 1.5])) == 5.5
+    assert len(calls) == 2 and memo.stats()['hit_rate'] == pytest.approx(1/3)
+
+def rising(t, theta):
+    return 1 - np.exp(-t)
+
+def test_identity_covers_the_model_and_config(events):
+    t, theta = events
+    cache = MemoCache()
+    plain = TimeAngleNLL(t, theta)
+    accepted = TimeAngleNLL(t, theta, model=ComponentModel(acceptance=rising))
+    fused = TimeAngleNLL(t, theta, config=dict(backend='fused'))
+    identities = [MemoizedObjective(nll, cache).identity for nll in [plain, accepted, fused]]
+    assert len(set(identities)) == 3
+    assert MemoizedObjective(accepted, cache)(0.5, 1.0, 2.0) == accepted(0.5, 1.0, 2.0) != plain(0.5, 1.0, 2.0)
+    assert datasetIdentity(TimeAngleNLL(t, theta, model=ComponentModel(acceptance=rising))) == identities[1]
+    # Lambdas of the same name may differ, so each is its own model
+    first, second = [ComponentModel(acceptance=lambda t, theta: t) for i in range(2)]
+    assert datasetIdentity(TimeAngleNLL(t, theta, model=first)) != datasetIdentity(TimeAngleNLL(t, theta, model=second))
+
+def test_import_loads_no_pools():
+    probe = ('import sys\n'
+             'import biexp.memo\n'
+             'print([m for m in ("biexp.joint", "multiprocessing", "concurrent.futures") if m in sys.modules])\n')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    assert out.strip() == '[]'
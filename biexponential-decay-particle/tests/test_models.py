@@ -0,0 +1,76 @@
+"""
+Tests of the NLL models: the analytic gradient, Hessian and covariance, and the fits of collapsed events.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL, TimeNLL
+from biexp.models import quantise, uniqueEvents
+
+@pytest.fixture(scope='module')
+def sample():
+    pdf = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(1))
+    return pdf.next(2000)
+
+def test_hessian_matches_finite_differences(sample):
+    nll = TimeAngleNLL(*sample)
+    x = np.array([0.45, 1.1, 1.9])
+    value, gradient, hessian = nll.derivatives(*x)
+    assert value == pytest.approx(nll(*x), rel=1e-12)
+    h = 1e-5
+    steps = np.eye(3) * h
+    numeric = np.array([(nll(*(x + step)) - nll(*(x - step))) / (2*h) for step in steps])
+    assert gradient == pytest.approx(numeric, rel=1e-5, abs=1e-4)
+    numeric = np.array([(nll.derivatives(*(x + step))[1] - nll.derivatives(*(x - step))[1]) / (2*h) for step in steps])
+    assert hessian == pytest.approx(numeric, rel=1e-5)
+    assert np.allclose(hessian, hessian.T)
+
+def test_weighted_derivatives(sample):
+    nll = TimeAngleNLL(*sample)
+    counts = np.random.default_rng(0).poisson(1.0, len(nll.t))
+    repeated = TimeAngleNLL(np.repeat(nll.t, counts), np.repeat(nll.theta, counts))
+    weighted = nll.weighted(counts.astype(float)).derivatives(0.45, 1.1, 1.9)
+    for a, b in zip(weighted, repeated.derivatives(0.45, 1.1, 1.9)):
+        assert a == pytest.approx(b, rel=1e-10)
+
+def test_covariance_matches_minuit(sample):
+    nll = TimeAngleNLL(*sample)
+    m = Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll').minimise(nll, [0.5, 1.0, 2.0])
+    x = [m.values['fraction'], m.values['tau1'], m.values['tau2']]
+    cov, corr = nll.covariance(*x)
+    # At the minimum the estimated distance to the minimum is within the MINUIT tolerance
+    gradient = nll.derivatives(*x)[1]
+    assert 0.5*gradient.dot(cov).dot(gradient) < 1e-3
+    assert np.all(np.linalg.eigvalsh(cov) > 0)
+    assert np.diag(corr) == pytest.approx(np.ones(3))
+    assert np.sqrt(np.diag(cov)) == pytest.approx([m.errors['fraction'], m.errors['tau1'], m.errors['tau2']], rel=0.1)
+
+def test_uniqueEvents():
+    t, theta, multiplicity = uniqueEvents([2.0, 1.0, 2.0, 1.04, 2.0], [0.5, 0.5, 0.6, 0.5, 0.5], t_resolution=0.1)
+    assert t.tolist() == [1.0, 2.0, 2.0] and theta.tolist() == [0.5, 0.5, 0.6]
+    assert multiplicity.tolist() == [2, 2, 1]
+    t, theta, multiplicity = uniqueEvents([1.0, 3.0, 1.0], weights=[0.5, 2.0, 1.5])
+    assert t.tolist() == [1.0, 3.0] and theta is None and multiplicity.tolist() == [2.0, 2.0]
+
+def test_collapse_reproduces_the_per_event_nll(sample):
+    # Quantised events have many exact duplicates
+    t, theta = quantise(sample[0], 0.05), quantise(sample[1], 0.5)
+    nll = TimeAngleNLL(t, theta)
+    collapsed = TimeAngleNLL.collapse(t, theta)
+    assert len(collapsed.t) < len(t) and collapsed.weights.sum() == len(t)
+    for a, b in zip(collapsed.derivatives(0.45, 1.1, 1.9), nll.derivatives(0.45, 1.1, 1.9)):
+        assert a == pytest.approx(b, rel=1e-10)
+    time_only = TimeNLL.collapse(t)
+    assert time_only(0.45, 1.1, 1.9, 0.0) == pytest.approx(TimeNLL(t)(0.45, 1.1, 1.9, 0.0), rel=1e-10)
+    assert TimeAngleNLL.collapse(*sample, 0.05, 0.5)(0.45, 1.1, 1.9) == pytest.approx(collapsed(0.45, 1.1, 1.9), rel=1e-10)
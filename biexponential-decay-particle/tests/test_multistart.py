@@ -0,0 +1,62 @@
+"""
+Tests of the multi start minimisation: starting points, canonical minima, grouping and the global best.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.components import ComponentModel, cosShape
+from biexp.multistart import MultiStart, MultiStartError, startingPoints
+
+BOUNDS = [(0.0, 1), (0.0, 5.0), (0.0, 5.0)]
+
+@pytest.fixture(scope='module')
+def nll():
+    return TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(4)).next(1000))
+
+def fitter():
+    return Minuit(0.0, *BOUNDS, 'nll')
+
+def test_starting_points_fill_the_bounds():
+    for sampler in ['lhs', 'sobol']:
+        points = startingPoints(16, BOUNDS, sampler, seed=1)
+        assert points.shape == (16, 3)
+        assert np.all(points > 0) and np.all(points < [1, 5.0, 5.0])
+    # A Latin hypercube has one point in every stratum of every parameter
+    points = startingPoints(8, BOUNDS, 'lhs', seed=1)
+    assert sorted(np.floor(points[:, 1] / 5.0 * 8).astype(int)) == list(range(8))
+    with pytest.raises(MultiStartError):
+        startingPoints(4, BOUNDS, 'grid')
+
+def test_canonical_minima_and_grouping():
+    symmetric = TimeAngleNLL([1.0], [1.0], model=ComponentModel(shapes=(cosShape, cosShape)))
+    assert MultiStart(symmetric, fitter(), 4).canonical([0.3, 2.0, 1.0]) == pytest.approx([0.7, 1.0, 2.0])
+    assert MultiStart(TimeAngleNLL([1.0], [1.0]), fitter(), 4).canonical([0.3, 2.0, 1.0]) == pytest.approx([0.3, 2.0, 1.0])
+    results = [dict(x=np.array([0.5, 1.0, 2.0]), fval=10.0, status='converged'),
+               dict(x=np.array([0.5, 1.0, 2.001]), fval=10.01, status='converged'),
+               # The lifetime of an empty component is not identified
+               dict(x=np.array([1.0, 1.5, 0.2]), fval=12.0, status='converged'),
+               dict(x=np.array([1.0, 1.5, 4.0]), fval=12.0, status='converged'),
+               dict(x=np.array([0.1, 3.0, 3.0]), fval=5.0, status='pruned')]
+    minima = MultiStart(TimeAngleNLL([1.0], [1.0]), fitter(), 4).distinctMinima(results)
+    assert [(minimum['fval'], minimum['count']) for minimum in minima] == [(10.0, 2), (12.0, 2)]
+
+def test_global_best_matches_a_single_fit(nll):
+    single = fitter().minimise(nll, [0.5, 1.0, 2.0])
+    search = MultiStart(nll, fitter(), 4, seed=2, processes=1)
+    best = search.run()
+    assert len(search.results) == 4
+    assert best['fval'] == pytest.approx(single.fval, abs=1e-3)
+    assert best['x'] == pytest.approx([single.values['fraction'], single.values['tau1'], single.values['tau2']], rel=1e-2)
+    assert MultiStart(nll, fitter(), 4, seed=2, processes=2).run()['fval'] == pytest.approx(best['fval'], abs=1e-3)
@@ -0,0 +1,57 @@
+"""
+Tests of the generate to fit pipeline: the received events, the output file and the unbinned and binned fits.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import time
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF
+from biexp.pipeline import Pipeline, PipelineError
+
+def fitter():
+    return Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+
+def test_events_are_the_generated_batches(tmp_path):
+    output = str(tmp_path / 'events.npy')
+    pipeline = Pipeline(20000, fraction=0.5, seed=3, batch=6000, queue_size=2, output=output, warm=True)
+    m = pipeline.run(fitter())
+    pdf = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(3))
+    batches = [pdf.next(n) for n in (6000, 6000, 6000, 2000)]
+    assert np.array_equal(pipeline.t, np.concatenate([t for t, theta in batches]))
+    assert np.array_equal(pipeline.theta, np.concatenate([theta for t, theta in batches]))
+    assert np.array_equal(np.load(output), np.column_stack((pipeline.t, pipeline.theta)))
+    assert pipeline.hist.entries == 20000
+    assert m.fmin.is_valid
+    cold = Pipeline(20000, fraction=0.5, seed=3, batch=6000, warm=False).run(fitter())
+    assert cold.fval == pytest.approx(m.fval, abs=1e-3)
+
+def test_binned_fit():
+    m = Pipeline(50000, fraction=0.5, seed=4, batch=10000, binned=True, bins=50, warm=False).run(fitter())
+    assert m.fmin.is_valid
+    assert m.values['tau1'] == pytest.approx(1.0, abs=5*m.errors['tau1'])
+    assert m.values['tau2'] == pytest.approx(2.0, abs=5*m.errors['tau2'])
+
+class FailingFitter(object):
+    def minimise(self, f, x, errors=None):
+        raise ValueError('fit failed')
+
+def test_failures_stop_the_pipeline(tmp_path):
+    # The producer cannot open its output file, so it fails before sending any batch
+    with pytest.raises(PipelineError, match='The producer failed'):
+        Pipeline(1000, seed=1, output=str(tmp_path / 'missing' / 'events.npy')).run(fitter())
+    # A failing warm up fit stops a producer blocked on the full queue
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        Pipeline(10**7, seed=1, batch=10000, queue_size=1, warm=True).run(FailingFitter())
+    assert time.perf_counter() - start < 30
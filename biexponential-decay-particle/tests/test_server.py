@@ -0,0 +1,120 @@
+"""
+Tests of the fit server: fit, scan and failing requests over a Unix socket, and the server statistics.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.server import request
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp('server')
+    data = str(tmp / 'data.txt')
+    np.savetxt(data, np.column_stack(MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(8)).next(1000)))
+    address = str(tmp / 'fit.sock')
+    process = subprocess.Popen([sys.executable, '-m', 'biexp', 'serve', '--unix', address, '--workers', '1'], cwd=ROOT)
+    try:
+        for i in range(300):
+            if os.path.exists(address):
+                break
+            time.sleep(0.1)
+        yield address, data
+    finally:
+        process.terminate()
+        process.wait(10)
+
+def test_fit_and_scan(server):
+    address, data = server
+    fit = request(address, dict(op='fit', file=data, model='angle'), timeout=300)
+    assert fit['ok'] and fit['result']['nevents'] == 1000
+    values = fit['result']['values']
+    assert values[1] == pytest.approx(1.0, abs=0.3) and values[2] == pytest.approx(2.0, abs=0.5)
+    points = [[0.5, 1.0, 2.0], values]
+    scan = request(address, dict(op='scan', file=data, model='angle', points=points), timeout=60)
+    nll = TimeAngleNLL(*np.loadtxt(data, unpack=True))
+    assert scan['result']['values'] == pytest.approx([nll(*point) for point in points], rel=1e-9)
+    assert scan['result']['values'][1] == pytest.approx(fit['result']['fval'], rel=1e-9)
+
+def test_failures_are_answered(server):
+    address, data = server
+    failed = request(address, dict(id=7, op='fit', file=data, model='spline'), timeout=60)
+    assert failed['id'] == 7 and not failed['ok'] and 'ServerError' in failed['error']
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(60)
+        sock.connect(address)
+        sock.sendall(b'not json\n')
+        with sock.makefile('r') as f:
+            assert json.loads(f.readline()) == dict(id=None, ok=False, error='invalid JSON')
+    stats = request(address, dict(op='stats'), timeout=60)['result']
+    assert stats['failed'] >= 1 and stats['queue_depth'] == 0
+
+def test_fit_with_a_fraction_on_its_bound_ends(server):
+    address, data = server
+    # A single lifetime file puts the fraction on its bound, where successive minima differ by rounding only
+    filename = os.path.join(ROOT, '..', 'MuonDecayEvent.txt')
+    fit = request(address, dict(op='fit', file=filename, model='time'), timeout=60)
+    assert fit['ok'] and fit['result']['nevents'] == 1000
+
+def test_minimise_loop_stops_at_max_loops():
+    nll = TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(9)).next(500))
+    calls = []
+    def counted(fraction, tau1, tau2):
+        calls.append((fraction, tau1, tau2))
+        return nll(fraction, tau1, tau2)
+    # A negative threshold is never reached
+    m = Minuit.default(-1.0).minimiseLoop(counted, [0.5, 1.0, 2.0], max_loops=3)
+    assert m.fmin.is_valid
+    single = len(calls)
+    calls.clear()
+    Minuit.default(-1.0).minimiseLoop(counted, [0.5, 1.0, 2.0], max_loops=1)
+    assert len(calls) < single
+
+def running(pid):
+    # A child the init process has not reaped yet is a zombie, which has stopped running
+    try:
+        with open('/proc/{}/stat'.format(pid)) as f:
+            return f.read().split(')')[-1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='reads the process tree from /proc')
+def test_terminate_stops_the_workers(tmp_path):
+    data = str(tmp_path / 'data.txt')
+    np.savetxt(data, np.column_stack(MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(9)).next(200)))
+    address = str(tmp_path / 'fit.sock')
+    process = subprocess.Popen([sys.executable, '-m', 'biexp', 'serve', '--unix', address, '--workers', '1'], cwd=ROOT)
+    try:
+        for i in range(300):
+            if os.path.exists(address):
+                break
+            time.sleep(0.1)
+        assert request(address, dict(op='fit', file=data, model='angle'), timeout=300)['ok']
+        with open('/proc/{0}/task/{0}/children'.format(process.pid)) as f:
+            workers = [int(pid) for pid in f.read().split()]
+        assert workers
+    finally:
+        process.terminate()
+        process.wait(30)
+    assert process.returncode == 0
+    for i in range(100):
+        if not any(running(pid) for pid in workers):
+            break
+        time.sleep(0.1)
+    assert not any(running(pid) for pid in workers)
@@ -0,0 +1,67 @@
+"""
+Tests of coarse to fine subsample fitting: the schedule, the stage tolerance, event subsets and the final fit.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import argparse
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from biexp import Minuit, MyPDF, TimeAngleNLL
+from biexp.__main__ import coarsefit
+from biexp.subsample import CoarseToFine, SubsampleError
+
+def fitter():
+    return Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+
+def test_schedule_and_tolerance():
+    for schedule in [(0.1, 0.01), (0.1, 1.0), (0.0, 0.5)]:
+        with pytest.raises(SubsampleError):
+            CoarseToFine(fitter(), schedule)
+    # The EDM at the stage tolerance is the precision times the statistical distance, squared, over two
+    fit = CoarseToFine(fitter(), precision=0.5)
+    assert 0.002 * fit.stageTolerance(0.19) * 0.5 == pytest.approx(0.5 * (0.5*0.9)**2)
+
+def test_subset():
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(1)).next(100)
+    nll = TimeAngleNLL(t, theta, weights=np.arange(100.0))
+    index = np.array([5, 3, 99])
+    subset = nll.subset(index)
+    assert np.array_equal(subset.t, t[index]) and np.array_equal(subset.weights, [5.0, 3.0, 99.0])
+    assert np.shares_memory(nll.subset(slice(0, 10)).t, nll.t)
+    assert subset(0.5, 1.0, 2.0) == pytest.approx(TimeAngleNLL(t[index], theta[index], weights=[5.0, 3.0, 99.0])(0.5, 1.0, 2.0))
+
+def test_final_stage_is_the_full_fit():
+    nll = TimeAngleNLL(*MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(2)).next(100000))
+    full = fitter().minimise(nll, [0.3, 1.5, 3.0])
+    coarse = CoarseToFine(fitter(), schedule=(0.02, 0.1), seed=3)
+    m = coarse.fit(nll, [0.3, 1.5, 3.0])
+    assert [stage['nevents'] for stage in coarse.stages] == [2000, 10000, 100000]
+    assert m.fmin.is_valid
+    for name in ['fraction', 'tau1', 'tau2']:
+        assert m.values[name] == pytest.approx(full.values[name], abs=0.05*full.errors[name])
+    assert 0 < coarse.cost() < 1
+
+def test_compared_full_fit_is_bounded(monkeypatch):
+    # The reference fit of coarsefit --compare must end even when successive minima only differ by rounding
+    calls = []
+    minimiseLoop = Minuit.minimiseLoop
+    def recordLoop(self, *args, **options):
+        calls.append((self.threshold, options.get('max_loops')))
+        return minimiseLoop(self, *args, **options)
+    monkeypatch.setattr(Minuit, 'minimiseLoop', recordLoop)
+    args = argparse.Namespace(filename=os.path.join(ROOT, '..', 'MuonDecayEvent.txt'), model='time', schedule=[0.5],
+                              precision=0.5, min_events=100, seed=1, compare=True, tolerance=0.1)
+    coarsefit(args)
+    threshold, max_loops = calls[-1]
+    assert threshold > 0 and max_loops is not None
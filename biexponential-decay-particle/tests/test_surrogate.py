@@ -0,0 +1,80 @@
+"""
+Tests of the NLL surrogate: spline accuracy, error crossings and saving.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp.surrogate import NLLSurrogate, SurrogateError
+
+CENTRE = np.array([0.5, 1.0, 2.0])
+SIGMA = np.array([0.05, 0.1, 0.2])
+
+def nll(fraction, tau1, tau2):
+    # Asymmetric profiles: a parabola of width SIGMA near the minimum with a cubic term
+    z = (np.array([fraction, tau1, tau2]) - CENTRE) / SIGMA
+    return 100.0 + np.sum(0.5*z**2 + 0.01*z**3)
+
+@pytest.fixture(scope='module')
+def surrogate():
+    return NLLSurrogate(CENTRE, nll(*CENTRE), [(0.2, 0.8), (0.5, 1.5), (1.0, 3.0)]).build(nll)
+
+def test_profiles_match_the_nll(surrogate):
+    for i, (lo, hi) in enumerate(surrogate.ranges):
+        v = np.linspace(lo, hi, 101)
+        points = np.tile(CENTRE, (len(v), 1))
+        points[:, i] = v
+        assert surrogate.profile(i, v) == pytest.approx([nll(*point) for point in points], abs=1e-3)
+    assert np.all(surrogate.error_bound < 1e-3)
+    assert surrogate.evaluations < 3*513
+
+def test_crossings_give_the_asymmetric_errors(surrogate):
+    for i in range(3):
+        lo, hi = surrogate.crossing(i)
+        # 0.5 z^2 + 0.01 z^3 = 0.5 at the crossings
+        roots = np.roots([0.01, 0.5, 0.0, -0.5])
+        roots = np.sort(roots[np.isreal(roots)].real)
+        assert lo == pytest.approx(CENTRE[i] + roots[1]*SIGMA[i], rel=1e-4)
+        assert hi == pytest.approx(CENTRE[i] + roots[2]*SIGMA[i], rel=1e-4)
+        assert surrogate.error(i) == pytest.approx(0.5*(hi - lo), rel=1e-12)
+    # A profile that never rises by the level has no error
+    assert np.isnan(NLLSurrogate(CENTRE, 100.0, [(0.49, 0.51)]*3).build(nll).error(0, level=5.0))
+
+def test_save_and_load(tmp_path, surrogate):
+    surrogate.save(str(tmp_path / 'surrogate.npz'))
+    loaded = NLLSurrogate.load(str(tmp_path / 'surrogate.npz'))
+    v = np.linspace(0.5, 1.5, 7)
+    assert np.array_equal(loaded.profile(1, v), surrogate.profile(1, v))
+    assert np.array_equal(loaded.error_bound, surrogate.error_bound)
+
+def bumped(x):
+    # A bump narrower than the spacing of the first midpoints, which the adaptive design alone never sees
+    return 100.0 + 50*(x - 0.5)**2 + 0.05*np.exp(-0.5*((x - 0.3)/0.002)**2)
+
+def test_failed_validation_refines_the_surrogate():
+    surrogate = NLLSurrogate([0.5], 100.0, [(0.0, 1.0)])
+    knots, values = surrogate.refine(bumped, 0, np.linspace(0.0, 1.0, 9), bumped(np.linspace(0.0, 1.0, 9)), range(8),
+                                     (), 1e-3, 1e-4, 513)
+    assert np.abs(surrogate.spline(knots, values)(0.3) - bumped(0.3)) > 0.01
+    surrogate.build(bumped, nvalidate=200)
+    v = np.linspace(0.0, 1.0, 2001)
+    assert surrogate.profile(0, v) == pytest.approx(bumped(v), abs=1e-3)
+    assert surrogate.error_bound[0] <= 1e-3
+    # Without enough points to resolve the bump the surrogate is refused rather than returned
+    with pytest.raises(SurrogateError):
+        NLLSurrogate([0.5], 100.0, [(0.0, 1.0)]).build(bumped, nvalidate=200, max_points=40)
+
+def test_unbuilt_and_infinite_profiles():
+    with pytest.raises(SurrogateError):
+        NLLSurrogate(CENTRE, 100.0, [(0.2, 0.8)]*3).profile(0, 0.5)
+    with pytest.raises(SurrogateError), np.errstate(divide='ignore'):
+        NLLSurrogate(CENTRE, 100.0, [(0.0, 0.8)]*3).build(lambda *x: -np.log(x[0]))
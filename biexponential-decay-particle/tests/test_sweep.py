@@ -0,0 +1,53 @@
+"""
+Tests of the sweep scheduler: node keys, cached artifacts, incremental grids and the process pool.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp.sweep import Sweep, SweepError, grid
+
+VARIANTS = [dict(model='time'), dict(model='angle', errors=True), dict(model='angle', binned=True, bins=20)]
+
+def test_grid_and_invalid_variants(tmp_path):
+    generators = grid(fraction=[0.2, 0.8], seed=[1, 2])
+    assert len(generators) == 4 and generators[0]['nevents'] == 10000
+    assert sorted((g['fraction'], g['seed']) for g in generators) == [(0.2, 1), (0.2, 2), (0.8, 1), (0.8, 2)]
+    with pytest.raises(SweepError):
+        Sweep(str(tmp_path)).add(generators, [dict(model='spline')])
+    with pytest.raises(SweepError):
+        Sweep(str(tmp_path)).add(generators, [dict(model='time', binned=True)])
+
+def test_cached_nodes_are_reused(tmp_path):
+    sweep = Sweep(str(tmp_path), processes=1).add(grid(nevents=[2000], fraction=[0.5]), VARIANTS)
+    # One sample, one histogram, three fits and one error node
+    assert sorted(node['kind'] for node in sweep.nodes.values()) == ['error', 'fit', 'fit', 'fit', 'generate', 'histogram']
+    assert sweep.run()
+    rows = sweep.results()
+    # The decay time only model at a fixed angle puts every event in one component, so only the angle fits are checked
+    assert rows[0]['fit'] is not None and rows[1]['fit']['valid'] and rows[2]['fit']['valid']
+    assert rows[1]['error']['errors'][1] == pytest.approx(rows[1]['fit']['errors'][1], rel=0.2)
+    rerun = Sweep(str(tmp_path), processes=1).add(grid(nevents=[2000], fraction=[0.5]), VARIANTS)
+    assert rerun.run() and rerun.computed == [] and len(rerun.reused) == 6
+    assert rerun.results() == rows
+    grown = Sweep(str(tmp_path), processes=1).add(grid(nevents=[2000], fraction=[0.5]), VARIANTS[:2])
+    grown.add(grid(nevents=[2000], fraction=[1.0], seed=[1]), VARIANTS[:2])
+    assert grown.run()
+    assert sorted(grown.nodes[key]['kind'] for key in grown.computed) == ['error', 'fit', 'fit', 'generate']
+    # The second component is empty at fraction 1, so its proper error is not scanned
+    assert grown.results()[3]['error']['skipped'] == 'a parameter is on its bound'
+
+def test_process_pool_gives_the_same_results(tmp_path):
+    generators = grid(nevents=[2000], fraction=[0.3, 0.7])
+    serial = Sweep(str(tmp_path / 'serial'), processes=1).add(generators, VARIANTS[:1])
+    pooled = Sweep(str(tmp_path / 'pooled'), processes=2).add(generators, VARIANTS[:1])
+    assert serial.run() and pooled.run()
+    assert pooled.results() == serial.results()
@@ -0,0 +1,94 @@
+"""
+Tests of the NLL evaluation configurations and the autotuner profile.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import json
+import math
+import multiprocessing
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL, TimeNLL
+from biexp.tuning import (DEFAULT_CONFIG, PROFILE_VERSION, TuningError, autotune, candidates, evaluationConfig,
+                          fitCheck, machine, readProfile)
+
+@pytest.fixture(autouse=True)
+def profile(tmp_path, monkeypatch):
+    # Never read or write the profile of the machine running the tests
+    filename = str(tmp_path / 'profile.json')
+    monkeypatch.setenv('BIEXP_PROFILE', filename)
+    monkeypatch.delenv('BIEXP_EVAL', raising=False)
+    return filename
+
+@pytest.fixture(scope='module')
+def events():
+    return MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(5)).next(5000)
+
+def test_candidates_agree_with_the_default(events):
+    t, theta = events
+    weights = np.random.default_rng(6).poisson(1.0, len(t))
+    for point in [(0.5, 1.0, 2.0), (0.2, 0.5, 3.0)]:
+        expected = TimeAngleNLL(t, theta, weights=weights, config=DEFAULT_CONFIG)(*point)
+        for config in candidates(max_threads=2) + [dict(backend='fused', chunk=1000, threads=2, dtype='float64')]:
+            value = TimeAngleNLL(t, theta, weights=weights, config=config)(*point)
+            assert value == pytest.approx(expected, rel=1e-4 if config['dtype'] == 'float32' else 1e-12)
+        config = dict(backend='fused', chunk=700, threads=1, dtype='float64')
+        assert TimeNLL(t, config=config)(*point, 1.0) == pytest.approx(TimeNLL(t, config=DEFAULT_CONFIG)(*point, 1.0), rel=1e-12)
+
+def test_configuration_priority(monkeypatch, profile):
+    assert evaluationConfig(1000) == DEFAULT_CONFIG
+    entry = autotune(2000, repeat=1, configs=[dict(DEFAULT_CONFIG), dict(backend='fused', chunk=None, threads=1, dtype='float64')])
+    assert readProfile(profile)['entries']['2000'] == json.loads(json.dumps(entry))
+    assert entry['config'] in [result['config'] for result in entry['results'] if result['accepted']]
+    assert evaluationConfig(1500) == entry['config']
+    monkeypatch.setenv('BIEXP_EVAL', json.dumps(dict(chunk=100)))
+    assert evaluationConfig(1500)['chunk'] == 100
+    assert evaluationConfig(1500, dict(chunk=200))['chunk'] == 200
+    monkeypatch.setenv('BIEXP_EVAL', 'default')
+    assert evaluationConfig(1500) == DEFAULT_CONFIG
+    with pytest.raises(TuningError):
+        evaluationConfig(1500, dict(backend='numexpr'))
+
+def test_profile_of_another_machine_or_version_is_ignored(profile):
+    for machine_, version in [(dict(host='elsewhere'), PROFILE_VERSION), (machine(), None)]:
+        with open(profile, 'w') as f:
+            json.dump(dict(machine=machine_, version=version, entries={'1000': dict(config=dict(chunk=5))}), f)
+        assert readProfile(profile) is None
+        assert evaluationConfig(1000) == DEFAULT_CONFIG
+
+def test_float32_is_opt_in_and_fits_are_checked(events):
+    assert all(config['dtype'] == 'float64' for config in candidates(max_threads=2))
+    assert any(config['dtype'] == 'float32' for config in candidates(max_threads=2, float32=True))
+    t, theta = events
+    fitter = Minuit.default()
+    m = fitter.minimise(TimeAngleNLL(t, theta, config=DEFAULT_CONFIG), [0.5, 1.0, 2.0])
+    reference = (fitter.values(m), fitter.errors(m))
+    fused = TimeAngleNLL(t, theta, config=dict(backend='fused', chunk=1000, threads=1, dtype='float64'))
+    parameter, error, passed = fitCheck(reference, fused, fitter)
+    assert passed and parameter < 1e-3 and error < 1e-3
+    # A fit moved by a tenth of a standard deviation fails the check
+    shifted = (reference[0] + 0.1*reference[1], reference[1])
+    assert not fitCheck(shifted, fused, fitter)[2]
+
+def evaluate(args):
+    nll, point = args
+    return nll(*point)
+
+def test_threaded_evaluation_survives_a_fork(events):
+    t, theta = events
+    nll = TimeAngleNLL(t, theta, config=dict(backend='fused', chunk=500, threads=2, dtype='float64'))
+    points = [(0.5, 1.0, 2.0), (0.2, 0.5, 3.0)]
+    expected = [nll(*point) for point in points]
+    # The workers inherit the thread pool used above, so they must start their own rather than wait on it forever
+    with multiprocessing.get_context('fork').Pool(2) as pool:
+        values = pool.map_async(evaluate, [(nll, point) for point in points]).get(timeout=60)
+    assert values == pytest.approx(expected, rel=1e-12)
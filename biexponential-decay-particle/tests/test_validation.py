@@ -0,0 +1,79 @@
+"""
+Tests of the accuracy versus speed validation harness: the baseline references, the model bin probabilities, the
+recorded checks and a small run.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+from biexp import Minuit, MyPDF, PDFError, TimeAngleNLL, TimeMinuit, TimeNLL
+from biexp.components import ComponentModel
+from biexp.validation import BaselinePDF, Validation, baselineNLL, baselineTimeNLL, binProbabilities
+
+def fitters():
+    return (TimeMinuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll'), Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll'))
+
+def test_bin_probabilities():
+    model = ComponentModel()
+    t_edges = np.linspace(0.0, 10.0, 11)
+    probabilities = binProbabilities(model, 0.3, [1.0, 2.0], t_edges, 0)
+    assert probabilities.sum() == pytest.approx(1.0, rel=1e-10)
+    # The decay time marginal of each component is a truncated exponential
+    expected = [0.3 * (math.exp(-lo) - math.exp(-hi)) / (1 - math.exp(-10.0)) +
+                0.7 * (math.exp(-lo/2) - math.exp(-hi/2)) / (1 - math.exp(-5.0)) for lo, hi in zip(t_edges[:-1], t_edges[1:])]
+    assert probabilities == pytest.approx(expected, rel=1e-8)
+    assert binProbabilities(model, 0.3, [1.0, 2.0], np.linspace(0.0, 2*math.pi, 9), 1).sum() == pytest.approx(1.0, rel=1e-10)
+
+def test_baseline_references():
+    t, theta = MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(2)).next(200)
+    for point in [(0.5, 1.0, 2.0), (0.3, 0.8, 2.5)]:
+        assert baselineNLL(t, theta)(*point) == pytest.approx(TimeAngleNLL(t, theta)(*point), rel=1e-8)
+        assert baselineTimeNLL(t)(*point, 0.0) == pytest.approx(TimeNLL(t)(*point, 0.0), rel=1e-8)
+    np.random.seed(3)
+    t, theta = np.array(BaselinePDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5).next(100))
+    assert len(t) == len(theta) == 100
+    assert np.all((t >= 0.0) & (t <= 10.0) & (theta >= 0.0) & (theta <= 2*math.pi))
+
+def test_baseline_errors_and_lazy_imports():
+    baseline = BaselinePDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5)
+    with pytest.raises(PDFError):
+        baseline.normalise(3)
+    with pytest.raises(PDFError):
+        baseline.evaluate(1.0, 1.0, 1.0, 1.0, '3')
+    # The autotuner imports the harness, so neither may load scipy before a reference is used
+    code = 'import sys; import biexp.tuning, biexp.validation; print("scipy" in sys.modules)'
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
+
+def test_failed_check_fails_the_harness():
+    harness = Validation()
+    assert harness.record('nll', 'sample', 'grid', 'NLL', 1.0, 1.005, 0.005, 0.01)
+    harness.skip('fit', 'sample', 'grid', 'tau2 not constrained')
+    assert harness.passed
+    harness.recordTest('sampler', 'sample', 'sharded', 't KS p-value', 1e-5)
+    assert not harness.passed
+
+def test_run(tmp_path, monkeypatch):
+    monkeypatch.setenv('BIEXP_PROFILE', str(tmp_path / 'profile.json'))
+    harness = Validation(error_events=1000, candidates=('grid', 'fused', 'profile'))
+    assert harness.run(fitters(), os.path.join(ROOT, '..'), sizes=(1000,), seed=1)
+    checks = set((result['check'], result['sample']) for result in harness.results)
+    assert ('nll', 'MuonDecayEvent.txt') in checks and ('fit', 'synthetic 1000') in checks
+    assert ('errors', 'synthetic 1000') in checks and ('sampler', 'synthetic 1000') in checks
+    # The bundled files above error_events are fitted without the proper error finder
+    assert ('errors', 'ExtraMuonDecayEvent.txt') not in checks
+    missing = Validation(candidates=('grid',))
+    missing.run(fitters(), str(tmp_path), sizes=())
+    assert [result['quantity'] for result in missing.results] == ['file not found']*3
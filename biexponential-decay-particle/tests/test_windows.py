@@ -0,0 +1,55 @@
+"""
+Tests of the sorted event index: window slices, window NLL models and the window scan.
+
+Authors: Azid Harun
+
+Date :  19/10/2026
+
+"""
+
+# Import required packages
+import math
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from biexp import Minuit, MyPDF, TimeAngleNLL, TimeNLL
+from biexp.windows import SortedEvents, WindowError
+
+@pytest.fixture(scope='module')
+def events():
+    return MyPDF(0.0, 10.0, 0.0, 2*math.pi, 1.0, 2.0, 0.5, rng=np.random.default_rng(7)).next(5000)
+
+def test_window_matches_a_filtered_copy(events):
+    t, theta = events
+    weights = np.random.default_rng(8).uniform(0.5, 1.5, len(t))
+    sorted_events = SortedEvents(t, theta, weights)
+    assert np.array_equal(sorted_events.t, t[sorted_events.order])
+    nll = sorted_events.window(0.5, 6.0)
+    inside = (t >= 0.5) & (t <= 6.0)
+    assert len(nll.t) == inside.sum() and np.shares_memory(nll.t, sorted_events.t)
+    reference = TimeAngleNLL(t[inside], theta[inside], 0.5, 6.0, weights=weights[inside], normalisation='dblquad')
+    for point in [(0.5, 1.0, 2.0), (0.3, 0.8, 2.5)]:
+        assert nll(*point) == pytest.approx(reference(*point), rel=1e-8)
+    time_only = SortedEvents(t).window(0.5, 6.0)
+    assert isinstance(time_only, TimeNLL)
+    assert time_only(0.5, 1.0, 2.0, 1.0) == pytest.approx(TimeNLL(t[inside], 0.5, 6.0, normalisation='dblquad')(0.5, 1.0, 2.0, 1.0), rel=1e-8)
+
+def test_invalid_and_empty_windows(events):
+    sorted_events = SortedEvents(events[0], events[1])
+    with pytest.raises(WindowError):
+        sorted_events.window(2.0, 1.0)
+    with pytest.raises(WindowError):
+        sorted_events.window(20.0, 30.0)
+
+def test_scan(events):
+    sorted_events = SortedEvents(*events)
+    fitter = Minuit(0.0, (0.0, 1), (0.0, 5.0), (0.0, 5.0), 'nll')
+    windows = [(0.0, 10.0), (0.2, 8.0)]
+    results = sorted_events.scan(fitter, windows)
+    assert [result['window'] for result in results] == windows
+    assert all(result['valid'] for result in results)
+    single = fitter.minimise(sorted_events.window(0.2, 8.0), [0.5, 1.0, 2.0])
+    assert results[1]['fval'] == pytest.approx(single.fval, abs=1e-3)
@@ -9,11 +9,15 @@ Date :  19/10/2018
 """
 
 # Import required packages
+import os
 import sys
 import pylab as pl
 import numpy as np
 from Minimiser import Minimiser
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'biexponential-decay-particle'))
+from biexp.memo import MemoizedObjective
+
 # Define Chi-Squared function
 def chi(param):
     m = param[0]
@@ -38,6 +42,9 @@ x = np.array(x_list)
 y = np.array(y_list)
 y_err = np.array(err_list)
 
+# The driver loop re-evaluates the minimum it has just found, so every (m, c) is evaluated once
+chi = MemoizedObjective(chi)
+
 # Define initial straight line parameters, m and c and their range
 m_c = np.array([0, 0])
 m_range = (-1.0, 0.0)
@@ -79,6 +86,7 @@ c_error = minim.errorFinder(1.0, chi_list, final_chi, m_c[1], c_arr)
 print('Minimum Chi-Squared : {}'.format(final_chi))
 print('Best estimated fit gradient, m +- err(m) : {} +- {}'.format(m_c[0], m_error))
 print('Best estimated y-intercept, y +- err(y) : {} +- {}'.format(m_c[1], c_error))
+print('Chi-squared cache hit rate : {0:0.1%}'.format(chi.stats()['hit_rate']))
 
 #=========================================PLOTTING DATA======================================
 
@@ -10,21 +10,28 @@ Date :  19/10/2018
 # Import required packages
 import numpy as np
 import math as m
+import os
 import pylab as pl
 import sys
 from scipy import *
 from Minimiser import Minimiser
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'biexponential-decay-particle'))
+from biexp.memo import MemoizedObjective
+
 # Define Negative Log Likelihood function
 def nll(tau):
-    pdf = 1/tau*exp(-t/tau)
-    return np.sum(-np.log(pdf))
+    pdf = 1/tau*np.exp(-t/tau)
+    return np.dot(counts, -np.log(pdf))
 
 # Create list to store data
 nll_list = []
 
-# Load data from input file
-t = np.loadtxt(sys.argv[1])
+# Load data from input file, identical decay times are evaluated once and weighted by their multiplicity
+t, counts = np.unique(np.loadtxt(sys.argv[1]), return_counts=True)
+
+# The driver loop re-evaluates the minimum it has just found, so every tau is evaluated once
+nll = MemoizedObjective(nll)
 
 # Define initial tau and its range
 tau = np.array([2.0])
@@ -48,7 +55,7 @@ while not minim.isFinished(diff):
 #================================CREATING DATA FOR PLOTTING==================================
 
 # Creating data around minimum NLL
-tau_arr = np.arange(0.5, 2*tau + 1.2, 2*tau/200)
+tau_arr = np.arange(0.5, 2*tau[0] + 1.2, 2*tau[0]/200)
 tau_arr = np.delete(tau_arr, 0)
 
 for tau_val in tau_arr:
@@ -62,8 +69,9 @@ tau_error = minim.errorFinder(0.5, nll_list, final_nll, tau, tau_arr)
 
 # Display the result 
 print('-------------------------------------------------------------------------------')
-print('Number of Muon Decay Event       :   {}'.format(len(t)))
+print('Number of Muon Decay Event       :   {}'.format(np.sum(counts)))
 print('Best Estimated Tau +- err(Tau)   :   {} +- {}'.format(tau[0], tau_error[0]))
+print('NLL cache hit rate               :   {0:0.1%}'.format(nll.stats()['hit_rate']))
 print('-------------------------------------------------------------------------------')
 
 #=========================================PLOTTING DATA======================================